@@ -0,0 +1,393 @@
+"""bench.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+
+Load generator for a Datastore endpoint (emulator or fake server). Drives a
+mix of lookups, queries and commits with a fixed concurrency (closed loop) or
+a fixed request rate (open loop) and reports throughput and latency
+percentiles.
+
+Examples:
+
+    python -m aiogcd.bench --fake --duration 10
+    python -m aiogcd.bench --endpoint http://localhost:8081 \\
+        --mix lookup=6,query=3,commit=1 --concurrency 32
+    python -m aiogcd.bench --fake --fake-latency 0.005 --rate 500
+    python -m aiogcd.bench --fake --grpc
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Any, Awaitable, Callable
+from .connector import GcdEmulatorConnector, GrpcTransport
+from .connector.entity import Entity
+from .connector.key import Key
+
+OPERATIONS = ('lookup', 'query', 'commit')
+
+DEFAULT_MIX = 'lookup=5,query=3,commit=2'
+
+PERCENTILES = (50, 90, 99)
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse a mix like 'lookup=5,query=3,commit=2' to weights."""
+    weights = {}
+    for part in mix.split(','):
+        name, sep, weight = part.strip().partition('=')
+        if name not in OPERATIONS:
+            raise ValueError(
+                'Unknown operation {!r}, expecting one of {}'
+                .format(name, ', '.join(OPERATIONS)))
+        weights[name] = float(weight) if sep else 1.0
+        if weights[name] < 0:
+            raise ValueError('Weights must be positive')
+    if not any(weights.values()):
+        raise ValueError('At least one weight must be larger than 0')
+    return weights
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Returns the nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    idx = max(0, min(len(values) - 1, int(len(values) * pct / 100.0 + 0.5)
+                     - 1))
+    return values[idx]
+
+
+class Stats:
+
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    def get_dict(self, duration: float) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        result: dict[str, Any] = {
+            'count': len(latencies),
+            'errors': self.errors,
+            'throughput': len(latencies) / duration if duration else 0.0,
+        }
+        for pct in PERCENTILES:
+            result['p{}'.format(pct)] = percentile(latencies, pct)
+        result['max'] = latencies[-1] if latencies else 0.0
+        return result
+
+
+class Bench:
+
+    def __init__(
+            self,
+            gcd: GcdEmulatorConnector,
+            kind: str = 'BenchEntity',
+            entities: int = 1000,
+            batch_size: int = 10,
+            query_limit: int = 100,
+            payload: int = 100,
+            seed: int | None = None):
+        """Initialize a benchmark.
+
+        :param gcd: connector for the target endpoint
+        :param kind: kind of the benchmark entities
+        :param entities: number of entities which are written before the
+                         benchmark starts
+        :param batch_size: keys per lookup and entities per commit
+        :param query_limit: limit for each query
+        :param payload: size of the string property of each entity
+        :param seed: random seed
+        """
+        self.gcd = gcd
+        self.kind = kind
+        self.entities = entities
+        self.batch_size = batch_size
+        self.query_limit = query_limit
+        self.payload = payload
+        self.stats = {name: Stats() for name in OPERATIONS}
+        self._random = random.Random(seed)
+
+    def _key(self, idx: int) -> Key:
+        return Key(
+            self.kind, idx + 1,
+            project_id=self.gcd.project_id,
+            namespace_id=self.gcd.namespace_id)
+
+    def _entity(self, idx: int) -> Entity:
+        return Entity({
+            'key': self._key(idx).get_dict(),
+            'properties': {
+                'idx': {'integerValue': str(idx)},
+                'group': {'integerValue': str(idx % 10)},
+                'payload': {
+                    'stringValue': 'x' * self.payload,
+                    'excludeFromIndexes': True,
+                },
+            },
+        })
+
+    async def setup(self):
+        """Write the benchmark entities."""
+        for start in range(0, self.entities, 500):
+            await self.gcd.upsert_entities([
+                self._entity(idx)
+                for idx in range(start, min(start + 500, self.entities))])
+
+    async def lookup(self):
+        await self.gcd.get_entities_by_keys([
+            self._key(self._random.randrange(self.entities))
+            for _ in range(self.batch_size)])
+
+    async def query(self):
+        await self.gcd.get_entities({'query': {
+            'kind': [{'name': self.kind}],
+            'filter': {'propertyFilter': {
+                'property': {'name': 'group'},
+                'op': 'EQUAL',
+                'value': {'integerValue': str(self._random.randrange(10))},
+            }},
+            'limit': self.query_limit,
+        }})
+
+    async def commit(self):
+        await self.gcd.upsert_entities([
+            self._entity(self._random.randrange(self.entities))
+            for _ in range(self.batch_size)])
+
+    def _choose(self, weights: dict[str, float]) -> str:
+        names = list(weights)
+        return self._random.choices(
+            names, weights=[weights[name] for name in names])[0]
+
+    async def _run_one(self, name: str, start: float | None = None):
+        func: Callable[[], Awaitable[None]] = getattr(self, name)
+        stats = self.stats[name]
+        if start is None:
+            start = time.perf_counter()
+        try:
+            await func()
+        except Exception:
+            stats.errors += 1
+        else:
+            stats.latencies.append(time.perf_counter() - start)
+
+    async def run(
+            self,
+            weights: dict[str, float],
+            duration: float,
+            concurrency: int = 16,
+            rate: float | None = None) -> float:
+        """Run the benchmark and return the elapsed time.
+
+        Without a rate, `concurrency` workers each start a new operation as
+        soon as the previous one is finished (closed loop). With a rate,
+        operations are started at the given rate with at most `concurrency`
+        operations in flight (open loop); latency is then measured from the
+        planned start so queueing delay is included.
+        """
+        start = time.perf_counter()
+        end = start + duration
+
+        if rate is None:
+            async def worker():
+                while time.perf_counter() < end:
+                    await self._run_one(self._choose(weights))
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return time.perf_counter() - start
+
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = set()
+
+        async def run_one(name, planned):
+            async with semaphore:
+                await self._run_one(name, planned)
+
+        interval = 1.0 / rate
+        planned = start
+        while planned < end:
+            now = time.perf_counter()
+            if planned > now:
+                await asyncio.sleep(planned - now)
+            task = asyncio.ensure_future(
+                run_one(self._choose(weights), planned))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            planned += interval
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        result = {
+            name: stats.get_dict(elapsed)
+            for name, stats in self.stats.items()
+            if stats.latencies or stats.errors}
+        total = Stats()
+        for stats in self.stats.values():
+            total.latencies.extend(stats.latencies)
+            total.errors += stats.errors
+        result['total'] = total.get_dict(elapsed)
+        return result
+
+
+def format_report(report: dict[str, Any], elapsed: float) -> str:
+    lines = [
+        'Elapsed: {:.2f}s'.format(elapsed),
+        '{:<8}{:>9}{:>8}{:>10}{}{:>10}'.format(
+            'op',
+            'count',
+            'errors',
+            'ops/s',
+            ''.join(
+                '{:>10}'.format('p{} ms'.format(pct))
+                for pct in PERCENTILES),
+            'max ms'),
+    ]
+    for name, item in report.items():
+        lines.append('{:<8}{:>9}{:>8}{:>10.1f}{}{:>10.2f}'.format(
+            name,
+            item['count'],
+            item['errors'],
+            item['throughput'],
+            ''.join(
+                '{:>10.2f}'.format(item['p{}'.format(pct)] * 1000)
+                for pct in PERCENTILES),
+            item['max'] * 1000))
+    return '\n'.join(lines)
+
+
+async def _main(args) -> dict[str, Any]:
+    weights = parse_mix(args.mix)
+    fake = None
+    endpoint = args.endpoint
+
+    if args.fake:
+        from .fakeserver import FakeDatastore
+        fake = FakeDatastore(
+            latency=args.fake_latency,
+            error_rate=args.fake_error_rate,
+            seed=args.seed)
+        endpoint = await fake.start_grpc() if args.grpc else \
+            await fake.start()
+
+    try:
+        if args.grpc:
+            gcd = GcdEmulatorConnector(
+                args.project,
+                namespace_id=args.namespace,
+                transport=GrpcTransport(endpoint, secure=False))
+        else:
+            gcd = GcdEmulatorConnector(
+                args.project,
+                namespace_id=args.namespace,
+                api_endpoint=endpoint,
+                compress_threshold=args.compress_threshold)
+        bench = Bench(
+            gcd,
+            kind=args.kind,
+            entities=args.entities,
+            batch_size=args.batch_size,
+            query_limit=args.query_limit,
+            payload=args.payload,
+            seed=args.seed)
+
+        if not args.no_setup:
+            await bench.setup()
+
+        elapsed = await bench.run(
+            weights,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            rate=args.rate)
+        await gcd.close()
+    finally:
+        if fake is not None:
+            await fake.stop()
+
+    report = bench.report(elapsed)
+    if args.json:
+        print(json.dumps({'elapsed': elapsed, 'operations': report}))
+    else:
+        print(format_report(report, elapsed))
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m aiogcd.bench',
+        description='Load generator for a Datastore endpoint.')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
+        '--endpoint',
+        help='endpoint, for example http://localhost:8081 (by default '
+             'DATASTORE_EMULATOR_HOST is used)')
+    target.add_argument(
+        '--fake', action='store_true',
+        help='start an in-process fake server as target')
+    parser.add_argument(
+        '--grpc', action='store_true',
+        help='use the gRPC transport, --endpoint must then be host:port')
+    parser.add_argument(
+        '--compress-threshold', type=int, default=None,
+        help='gzip compress request bodies of at least this number of bytes')
+    parser.add_argument('--project', default='bench')
+    parser.add_argument('--namespace', default=None)
+    parser.add_argument('--kind', default='BenchEntity')
+    parser.add_argument(
+        '--mix', default=DEFAULT_MIX,
+        help='operation weights (default: %(default)s)')
+    parser.add_argument(
+        '--concurrency', type=int, default=16,
+        help='number of operations in flight (default: %(default)s)')
+    parser.add_argument(
+        '--rate', type=float, default=None,
+        help='operations per second, by default as fast as possible')
+    parser.add_argument(
+        '--duration', type=float, default=10.0,
+        help='seconds (default: %(default)s)')
+    parser.add_argument(
+        '--entities', type=int, default=1000,
+        help='number of entities to write before the benchmark')
+    parser.add_argument(
+        '--batch-size', type=int, default=10,
+        help='keys per lookup and entities per commit')
+    parser.add_argument('--query-limit', type=int, default=100)
+    parser.add_argument(
+        '--payload', type=int, default=100,
+        help='size of the string property of each entity')
+    parser.add_argument(
+        '--no-setup', action='store_true',
+        help='do not write the entities before the benchmark')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--fake-latency', type=float, default=0.0)
+    parser.add_argument('--fake-error-rate', type=float, default=0.0)
+    parser.add_argument(
+        '--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    if args.grpc and not args.fake and args.endpoint is None:
+        parser.error('--grpc requires --endpoint or --fake')
+    if args.grpc and args.compress_threshold is not None:
+        parser.error('--compress-threshold cannot be used with --grpc')
+    if args.entities < 1:
+        parser.error('--entities must be at least 1')
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.rate is not None and args.rate <= 0:
+        parser.error('--rate must be larger than 0')
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report = asyncio.run(_main(args))
+    return 1 if report['total']['count'] == 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,5 +4,15 @@ Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
 from .connector import GcdConnector, GcdServiceAccountConnector  # noqa: F401
+from .connector import GcdEmulatorConnector  # noqa: F401
 from .client_token import Token  # noqa: F401
 from .service_account_token import ServiceAccountToken  # noqa: F401
+from .scan import ScanRunner  # noqa: F401
+from .scan import CheckpointStore, FileCheckpointStore  # noqa: F401
+from .hooks import ConnectorHook, OperationEvent, RequestEvent  # noqa: F401
+from .metrics import Metrics  # noqa: F401
+from .slowlog import SlowQueryLog  # noqa: F401
+from .profiling import Profile, profile  # noqa: F401
+from .transport import Transport, RestTransport  # noqa: F401
+from .transport import RecordingTransport, ReplayTransport  # noqa: F401
+from .grpctransport import GrpcTransport  # noqa: F401
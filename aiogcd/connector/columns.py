@@ -0,0 +1,200 @@
+"""columns.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import array
+from typing import Any, Iterable
+from .key import Key
+from .utils import value_from_dict
+
+# Value types which are stored in a typed array. Each value type maps to the
+# array type code and the function to convert the JSON value.
+_ARRAY_TYPES = {
+    'integerValue': ('q', int),
+    'doubleValue': ('d', float),
+    'booleanValue': ('b', bool),
+}
+
+_NUMPY_TYPES = {
+    'q': 'int64',
+    'd': 'float64',
+    'b': 'bool',
+}
+
+
+def _import_numpy() -> Any:
+    """Returns the numpy module, numpy is an optional dependency and is only
+    imported when required."""
+    try:
+        import numpy  # pyright: ignore[reportMissingImports]
+    except ImportError:
+        raise ImportError('Columns.to_numpy() requires numpy') from None
+    return numpy
+
+
+class Column:
+
+    def __init__(self, name: str, nulls: int = 0):
+        """Initialize a column.
+
+        The column type is set by the first value which is not null. Integer,
+        double and boolean values are stored in a typed array, other values
+        (or a mix of value types) are stored in a list.
+
+        :param name: property name
+        :param nulls: number of null values to start the column with
+        """
+        self.name = name
+        self.values: array.array | list[Any] = [None] * nulls
+        self.mask = bytearray(b'\x01' * nulls)
+        self._value_type: str | None = None
+        self._convert = None
+
+    def __len__(self):
+        return len(self.mask)
+
+    @property
+    def typecode(self) -> str | None:
+        """Returns the array type code or None if the values are stored in a
+        list."""
+        return None if isinstance(self.values, list) else self.values.typecode
+
+    def append(self, val: dict[str, Any]):
+        if 'nullValue' in val:
+            self.append_null()
+            return
+
+        convert = self._convert
+        if convert is not None:
+            value = val.get(self._value_type)  # type: ignore
+            if value is not None:
+                self.values.append(convert(value))
+                self.mask.append(0)
+                return
+            self._as_list()
+
+        elif self._value_type is None:
+            self._set_type(val)
+            if self._convert is not None:
+                self.append(val)
+                return
+
+        self.values.append(value_from_dict(val))
+        self.mask.append(0)
+
+    def append_null(self):
+        self.values.append(None if self._convert is None else 0)
+        self.mask.append(1)
+
+    def _set_type(self, val: dict[str, Any]):
+        for value_type in val:
+            if value_type in _ARRAY_TYPES:
+                typecode, self._convert = _ARRAY_TYPES[value_type]
+                self._value_type = value_type
+                self.values = array.array(typecode, (
+                    0 if v is None else v for v in self.values))
+                return
+        self._value_type = 'mixed'
+
+    def _as_list(self):
+        """Used when a value does not match the array type."""
+        self.values = [
+            None if null else value
+            for value, null in zip(self.values, self.mask)]
+        self._value_type = 'mixed'
+        self._convert = None
+
+    def to_numpy(self):
+        """Returns a numpy array for the column. Integer, double and boolean
+        columns are returned as a masked array, other columns as an array with
+        dtype object."""
+        numpy = _import_numpy()
+        typecode = self.typecode
+        if typecode is None:
+            arr = numpy.empty(len(self.values), dtype=object)
+            arr[:] = self.values
+            return arr
+
+        return numpy.ma.masked_array(
+            numpy.array(self.values, dtype=_NUMPY_TYPES[typecode]),
+            mask=numpy.frombuffer(self.mask, dtype=numpy.bool_))
+
+
+class Columns:
+
+    def __init__(self, properties: Iterable[str] | None = None):
+        """Initialize a column oriented container for query results.
+
+        :param properties: only include the given properties (by default
+                           all properties are included)
+        """
+        self._key_dicts: list[dict] = []
+        self._columns: dict[str, Column] = {}
+        self._properties = None if properties is None else set(properties)
+
+        if self._properties is not None:
+            for name in self._properties:
+                self._columns[name] = Column(name)
+
+    def __len__(self):
+        return len(self._key_dicts)
+
+    def __getitem__(self, name: str) -> array.array | list[Any]:
+        return self._columns[name].values
+
+    def __contains__(self, name: str):
+        return name in self._columns
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._columns.keys())
+
+    @property
+    def keys(self) -> list[Key]:
+        """Returns a list with Key objects, one for each row."""
+        return [Key(key) for key in self._key_dicts]
+
+    def column(self, name: str) -> Column:
+        return self._columns[name]
+
+    def mask(self, name: str) -> bytearray:
+        """Returns the null mask for a given property. Each row is 1 if the
+        value is null or missing, 0 otherwise."""
+        return self._columns[name].mask
+
+    def extend(self, entity_results: Iterable[dict]):
+        """Add entity results as returned by a runQuery request."""
+        columns = self._columns
+        properties = self._properties
+        key_dicts = self._key_dicts
+
+        for result in entity_results:
+            entity = result['entity']
+            n = len(key_dicts)
+            key_dicts.append(entity['key'])
+
+            for name, val in entity.get('properties', {}).items():
+                column = columns.get(name)
+                if column is None:
+                    if properties is not None:
+                        continue
+                    column = columns[name] = Column(name, nulls=n)
+                column.append(val)
+
+            n += 1
+            for column in columns.values():
+                if len(column) < n:
+                    column.append_null()
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Returns a dictionary with a numpy array for each property.
+
+        Integer, double and boolean properties are returned as a masked array
+        where missing and null values are masked.
+        """
+        _import_numpy()
+
+        return {
+            name: column.to_numpy()
+            for name, column in self._columns.items()}
@@ -5,13 +5,22 @@ Created on: May 19, 2017
             jomido <https://github.com/jomido>
 """
 import os
-import json
+import time
+import logging
 import aiohttp
-from typing import Iterable, Any
+from typing import AsyncIterator, Iterable, Any
 from .client_token import Token
 from .service_account_token import ServiceAccountToken
+from .columns import Columns
 from .entity import Entity
+from .hooks import ALLOCATE_IDS, COMMIT, LOOKUP, RUN_QUERY, TOKEN
+from .hooks import ConnectorHook, OperationEvent, RequestEvent
+from .hooks import get_counts, get_kind
 from .key import Key
+from .profiling import ENTITIES, timed
+from .transport import DATASTORE_URL  # noqa: F401
+from .transport import RestTransport, Transport
+from .utils import ReadTime
 from .utils import make_read_options
 
 DEFAULT_SCOPES = {
@@ -21,9 +30,6 @@ DEFAULT_SCOPES = {
 
 DEFAULT_API_ENDPOINT = 'https://datastore.googleapis.com'
 
-DATASTORE_URL = \
-    '{api_endpoint}/v1/projects/{project_id}:{method}'
-
 _MAX_LOOPS = 128
 
 
@@ -43,7 +49,11 @@ class GcdConnector:
             client_secret: str,
             token_file: str,
             scopes: Iterable[str] = DEFAULT_SCOPES,
-            namespace_id: str | None = None):
+            namespace_id: str | None = None,
+            api_endpoint: str | None = None,
+            trace_configs: Iterable[aiohttp.TraceConfig] | None = None,
+            transport: Transport | None = None,
+            compress_threshold: int | None = None):
 
         self.project_id = project_id
         self.namespace_id = namespace_id
@@ -53,26 +63,128 @@ class GcdConnector:
             token_file,
             scopes)
 
-        api_endpoint = _get_api_endpoint()
-
-        self._run_query_url = DATASTORE_URL.format(
-            api_endpoint=api_endpoint,
-            project_id=self.project_id,
-            method='runQuery')
-
-        self._commit_url = DATASTORE_URL.format(
-            api_endpoint=api_endpoint,
-            project_id=self.project_id,
-            method='commit')
+        self._setup(
+            api_endpoint, trace_configs, transport, compress_threshold)
 
-        self._lookup_url = DATASTORE_URL.format(
-            api_endpoint=api_endpoint,
-            project_id=self.project_id,
-            method='lookup')
+    def _setup(
+            self,
+            api_endpoint: str | None,
+            trace_configs: Iterable[aiohttp.TraceConfig] | None,
+            transport: Transport | None = None,
+            compress_threshold: int | None = None):
+        """Set the transport and instrumentation. Without a transport the
+        REST transport is used. Without an api_endpoint the emulator host is
+        used if DATASTORE_EMULATOR_HOST is set, otherwise the default Google
+        endpoint. Request bodies of at least compress_threshold bytes are
+        gzip compressed by the REST transport."""
+        self._hooks: list[ConnectorHook] = []
+        self._access_token: str | None = None
+
+        if api_endpoint is None:
+            api_endpoint = _get_api_endpoint()
+
+        self.api_endpoint = api_endpoint.rstrip('/')
+
+        if transport is None:
+            transport = RestTransport(
+                self.api_endpoint,
+                trace_configs,
+                compress_threshold=compress_threshold)
+        elif trace_configs is not None or compress_threshold is not None:
+            raise ValueError(
+                'trace_configs and compress_threshold cannot be used '
+                'together with a transport')
+
+        self._transport = transport
 
     async def connect(self):
         await self._token.connect()
 
+    async def close(self):
+        """Close the transport, for example to finish a recording."""
+        await self._transport.close()
+
+    def add_hook(self, hook: ConnectorHook):
+        """Add a hook which is called for each request and operation.
+
+        Example:
+
+            class PrintHook(ConnectorHook):
+
+                def on_request(self, event: RequestEvent):
+                    print(event.method, event.status, event.latency)
+
+            gcd.add_hook(PrintHook())
+
+        Requests are only measured when at least one hook is added.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: ConnectorHook):
+        self._hooks.remove(hook)
+
+    def _call_hooks(self, callback: str, event: Any):
+        """Call a hook method for each hook. An exception in a hook is logged
+        and does not break the request or the other hooks."""
+        for hook in self._hooks:
+            try:
+                getattr(hook, callback)(event)
+            except Exception:
+                logging.exception(
+                    'Error in {} of hook {!r}'.format(callback, hook))
+
+    def _start_operation(self, method: str, data) -> OperationEvent | None:
+        if not self._hooks:
+            return None
+        operation = OperationEvent(method, get_kind(method, data), data)
+        operation.duration = time.perf_counter()
+        return operation
+
+    def _finish_operation(self, operation: OperationEvent | None):
+        if operation is None:
+            return
+        operation.duration = time.perf_counter() - operation.duration
+        self._call_hooks('on_operation', operation)
+
+    async def _request(
+            self,
+            method: str,
+            data,
+            operation: OperationEvent | None = None) -> tuple[int, Any]:
+        """Send data to the datastore and return the response status and
+        the decoded content."""
+        if operation is None:
+            headers = await self._get_headers()
+            response = await self._transport.request(
+                method, self.project_id, data, headers)
+            return response.status, response.content
+
+        event = RequestEvent(
+            method, operation.kind, data, operation.requests + 1)
+        start = time.perf_counter()
+        try:
+            # a token refresh is reported as a separate event so the request
+            # latency starts after the headers are ready
+            headers = await self._get_headers()
+            start = time.perf_counter()
+            response = await self._transport.request(
+                method, self.project_id, data, headers)
+            event.latency = time.perf_counter() - start
+            event.status = response.status
+            event.request_bytes = response.request_bytes
+            event.response_bytes = response.response_bytes
+            event.entity_count, event.deferred = \
+                get_counts(method, response.content)
+        except Exception as e:
+            event.latency = time.perf_counter() - start
+            event.error = e
+            raise
+        finally:
+            operation.add(event)
+            self._call_hooks('on_request', event)
+
+        return response.status, response.content
+
     async def insert_entities(self, entities) -> tuple[bool, ...]:
         """Returns a tuple containing boolean values. Each boolean value is
         True in case of a successful mutation and False if not. The order of
@@ -125,6 +237,30 @@ class GcdConnector:
         """
         return (await self._commit_entities_or_keys([entity], 'upsert'))[0]
 
+    async def upsert_changed(self, entities: Iterable[Entity]) -> \
+            tuple[bool, ...]:
+        """Upsert only the entities which are changed since they were read
+        from, or written to the datastore. See Entity.has_changes().
+
+        Returns a tuple containing boolean values in the same order as the
+        supplied entities. Unchanged entities are not sent to the datastore
+        and are always True.
+
+        :param entities: tuple or list with Entity objects
+        :return: tuple containing boolean values
+        """
+        entities = list(entities)
+        flags = [entity.has_changes() for entity in entities]
+        changed = [
+            entity for entity, flag in zip(entities, flags) if flag]
+        if not changed:
+            return (True,) * len(flags)
+
+        results = iter(
+            await self._commit_entities_or_keys(changed, 'upsert'))
+
+        return tuple(next(results) if flag else True for flag in flags)
+
     async def update_entities(self, entities: Iterable[Entity]) -> \
             tuple[bool, ...]:
         """Returns a tuple containing boolean values. Each boolean value is
@@ -190,102 +326,160 @@ class GcdConnector:
             'mode': 'NON_TRANSACTIONAL',
             'mutations': mutations
         }
-        async with aiohttp.ClientSession() as session:
-
-            async with session.post(
-                    self._commit_url,
-                    data=json.dumps(data),
-                    headers=await self._get_headers()) as resp:
-
-                content = await resp.json()
-
-                if resp.status == 200:
-                    return tuple(content.get('mutationResults', tuple()))
-
-                raise ValueError(
-                        'Error while committing to the datastore: {} ({})'
-                        .format(
-                            content.get('error', 'unknown'),
-                            resp.status
-                        ))
-
-    async def run_query(self, data) -> list[dict]:
+        operation = self._start_operation(COMMIT, data)
+        try:
+            status, content = await self._request(
+                COMMIT, data, operation)
+        finally:
+            self._finish_operation(operation)
+
+        if status == 200:
+            return tuple(content.get('mutationResults', tuple()))
+
+        raise ValueError(
+                'Error while committing to the datastore: {} ({})'
+                .format(
+                    content.get('error', 'unknown'),
+                    status
+                ))
+
+    async def run_query(
+            self,
+            data,
+            eventual: bool = False,
+            read_time: ReadTime | None = None) -> list[dict]:
         """Return entities by given query data.
 
+        Each query method accepts the following read options:
+            eventual: use eventual consistency (default is strong)
+            read_time: read the entities as they were at the given time
+                       (RFC3339 string, datetime or TimestampValue)
+
         :param data: see the following link for the data format:
             https://cloud.google.com/datastore/docs/reference/rest/
                 v1/projects/runQuery
         :return: list containing Entity objects.
         """
-        results, _ = await self._run_query(data)
+        results, _ = await self._run_query(data, eventual, read_time)
         return results
 
-    async def _run_query(self, data) -> tuple[list[dict], str | None]:
+    async def _run_query(
+            self,
+            data,
+            eventual: bool = False,
+            read_time: ReadTime | None = None
+            ) -> tuple[list[dict], str | None]:
         results = []
         cursor = None
+        async for entity_results, cursor in self._iter_query_pages(
+                data, eventual=eventual, read_time=read_time):
+            results.extend(entity_results)
+        return results, cursor
 
-        # set namespace_id if required
-        if self.namespace_id:
-            if 'partitionId' not in data:
-                data['partitionId'] = {'namespaceId': self.namespace_id}
-            elif 'namespaceId' not in data['partitionId']:
-                data['partitionId']['namespaceId'] = self.namespace_id
-
-        while True:
-            async with aiohttp.ClientSession() as session:
-
-                if cursor is not None:
-                    data['query']['startCursor'] = cursor
-
-                async with session.post(
-                        self._run_query_url,
-                        data=json.dumps(data),
-                        headers=await self._get_headers()) as resp:
-
-                    content = await resp.json()
-
-                    if resp.status == 200:
-
-                        entity_results = \
-                            content['batch'].get('entityResults', [])
-
-                        results.extend(entity_results)
+    async def _iter_query_pages(
+            self,
+            data,
+            batch_size: int | None = None,
+            eventual: bool = False,
+            read_time: ReadTime | None = None
+            ) -> AsyncIterator[tuple[list[dict], str | None]]:
+        """Yields the entity results and end cursor for each batch which is
+        received from the datastore.
+
+        When a batch_size is given, each request is limited to batch_size
+        results and the next batch is requested using the end cursor until
+        the query (or the query limit) is exhausted.
+
+        The given data is not changed, the limit, offset and cursor for each
+        page and the read options are set on a copy.
+        """
+        cursor = None
+        query = dict(data['query'])
+        data = dict(data, query=query)
+        remaining = query.get('limit') if batch_size else None
 
-                        more_results = content['batch']['moreResults']
-                        cursor = content['batch']['endCursor']
+        if eventual or read_time is not None:
+            data['readOptions'] = make_read_options(
+                eventual=eventual, read_time=read_time)
 
-                        if more_results in (
-                                'NO_MORE_RESULTS',
-                                'MORE_RESULTS_AFTER_LIMIT',
-                                'MORE_RESULTS_AFTER_CURSOR'):
-                            break
+        # set namespace_id if required
+        if self.namespace_id and \
+                'namespaceId' not in data.get('partitionId', ()):
+            data['partitionId'] = dict(
+                data.get('partitionId', ()), namespaceId=self.namespace_id)
+
+        operation = self._start_operation(RUN_QUERY, data)
+        try:
+            while True:
+                if batch_size:
+                    query['limit'] = batch_size if remaining is None \
+                        else min(batch_size, remaining)
 
-                        if more_results == 'NOT_FINISHED':
-                            if data['query'].get('limit'):
-                                data['query']['limit'] -= len(entity_results)
-                            data['query'].pop('offset', None)
-                            continue
+                if cursor is not None:
+                    query['startCursor'] = cursor
 
-                        raise ValueError(
-                            'Unexpected value for "moreResults": {}'
-                            .format(more_results))
+                status, content = await self._request(
+                    RUN_QUERY, data, operation)
 
+                if status != 200:
                     raise ValueError(
                         'Error while query the datastore: {} ({})'
                         .format(
                             content.get('error', 'unknown'),
-                            resp.status
+                            status
                         )
                     )
 
-        return results, cursor
+                entity_results = content['batch'].get('entityResults', [])
+                more_results = content['batch']['moreResults']
+                cursor = content['batch']['endCursor']
+
+                yield entity_results, cursor
+
+                if batch_size:
+                    if remaining is not None:
+                        remaining -= len(entity_results)
+                        if remaining <= 0:
+                            break
 
-    async def _get_entities_cursor(self, data) -> \
-            tuple[list[Entity], str | None]:
-        results, cursor = await self._run_query(data)
-        return [Entity(result['entity']) for result in results], cursor
+                    if more_results in (
+                            'NOT_FINISHED',
+                            'MORE_RESULTS_AFTER_LIMIT'):
+                        query.pop('offset', None)
+                        continue
 
-    async def get_entities(self, data) -> list[Entity]:
+                if more_results in (
+                        'NO_MORE_RESULTS',
+                        'MORE_RESULTS_AFTER_LIMIT',
+                        'MORE_RESULTS_AFTER_CURSOR'):
+                    break
+
+                if more_results == 'NOT_FINISHED':
+                    if query.get('limit'):
+                        query['limit'] -= len(entity_results)
+                    query.pop('offset', None)
+                    continue
+
+                raise ValueError(
+                    'Unexpected value for "moreResults": {}'
+                    .format(more_results))
+        finally:
+            self._finish_operation(operation)
+
+    async def _get_entities_cursor(
+            self,
+            data,
+            eventual: bool = False,
+            read_time: ReadTime | None = None
+            ) -> tuple[list[Entity], str | None]:
+        results, cursor = await self._run_query(data, eventual, read_time)
+        return timed(ENTITIES, self._make_entities, results), cursor
+
+    async def get_entities(
+            self,
+            data,
+            eventual: bool = False,
+            read_time: ReadTime | None = None) -> list[Entity]:
         """Return entities by given query data.
 
         :param data: see the following link for the data format:
@@ -293,15 +487,52 @@ class GcdConnector:
                 v1/projects/runQuery
         :return: list containing Entity objects.
         """
-        results, _ = await self._run_query(data)
-        return [Entity(result['entity']) for result in results]
+        results, _ = await self._run_query(data, eventual, read_time)
+        return timed(ENTITIES, self._make_entities, results)
 
-    async def get_keys(self, data) -> list[Key]:
+    @staticmethod
+    def _make_entities(results: list[dict]) -> list[Entity]:
+        from_entity_res = Entity._from_entity_res
+        return [from_entity_res(result['entity']) for result in results]
+
+    async def get_columns(
+            self,
+            data,
+            properties: Iterable[str] | None = None,
+            eventual: bool = False,
+            read_time: ReadTime | None = None) -> Columns:
+        """Return query results in a column oriented container.
+
+        Each page which is received from the datastore is decoded directly
+        into the columns, no Entity or Key objects are created.
+
+        :param data: see the following link for the data format:
+            https://cloud.google.com/datastore/docs/reference/rest/
+                v1/projects/runQuery
+        :param properties: only include the given properties (by default
+                           all properties are included)
+        :return: Columns object.
+        """
+        columns = Columns(properties)
+        async for entity_results, _ in self._iter_query_pages(
+                data, eventual=eventual, read_time=read_time):
+            columns.extend(entity_results)
+        return columns
+
+    async def get_keys(
+            self,
+            data,
+            eventual: bool = False,
+            read_time: ReadTime | None = None) -> list[Key]:
         data['query']['projection'] = [{'property': {'name': '__key__'}}]
-        results, _ = await self._run_query(data)
+        results, _ = await self._run_query(data, eventual, read_time)
         return [Key(result['entity']['key']) for result in results]
 
-    async def get_entity(self, data) -> Entity | None:
+    async def get_entity(
+            self,
+            data,
+            eventual: bool = False,
+            read_time: ReadTime | None = None) -> Entity | None:
         """Return an entity object by given query data.
 
         :param data: see the following link for the data format:
@@ -310,12 +541,16 @@ class GcdConnector:
         :return: Entity object or None in case no entity was found.
         """
         data['query']['limit'] = 1
-        result = await self.get_entities(data)
+        result = await self.get_entities(data, eventual, read_time)
         return result[0] if result else None
 
-    async def get_key(self, data) -> Key | None:
+    async def get_key(
+            self,
+            data,
+            eventual: bool = False,
+            read_time: ReadTime | None = None) -> Key | None:
         data['query']['limit'] = 1
-        result = await self.get_keys(data)
+        result = await self.get_keys(data, eventual, read_time)
         return result[0] if result else None
 
     async def get_entities_by_kind(
@@ -323,7 +558,9 @@ class GcdConnector:
             kind: str,
             offset: int | None = None,
             limit: int | None = None,
-            cursor: str | None = None
+            cursor: str | None = None,
+            eventual: bool = False,
+            read_time: ReadTime | None = None
             ) -> list[Entity] | tuple[list[Entity], str | None]:
         """Returns entities by kind.
 
@@ -338,15 +575,17 @@ class GcdConnector:
             query['offset'] = offset
 
         if limit is None:
-            return await self.get_entities(data)
+            return await self.get_entities(data, eventual, read_time)
         else:
             query['limit'] = limit
-            return await self._get_entities_cursor(data)
+            return await self._get_entities_cursor(data, eventual, read_time)
 
     async def get_entities_by_keys(self, keys: Iterable[Key],
                                    missing: list[Any] | None = None,
                                    deferred: list[Key] | None = None,
-                                   eventual: bool = False) -> list[Entity]:
+                                   eventual: bool = False,
+                                   read_time: ReadTime | None = None
+                                   ) -> list[Entity]:
         """Returns entity objects for the given keys or an empty list in case
         no entity is found. The order of entities might not be equal to the
         order of provided keys.
@@ -354,13 +593,27 @@ class GcdConnector:
         :param keys: list of Key objects
         :return: list of Entity objects.
         """
-        read_options = make_read_options(eventual=eventual)
+        found = await self._lookup(
+            keys, missing, deferred, eventual, read_time)
+        return timed(
+            ENTITIES, list, map(Entity._from_entity_res, found))
+
+    async def _lookup(self, keys: Iterable[Key],
+                      missing: list[Any] | None = None,
+                      deferred: list[Key] | None = None,
+                      eventual: bool = False,
+                      read_time: ReadTime | None = None) -> list[dict]:
+        """Returns the entity results as found by a lookup for the given
+        keys. Deferred keys are looked up again unless a `deferred` list is
+        given."""
+        read_options = make_read_options(
+            eventual=eventual, read_time=read_time)
 
         def data():
-            return json.dumps({
+            return {
                 'readOptions': read_options,
                 'keys': [k.get_dict() for k in keys],
-            })
+            }
 
         if missing is not None and missing != []:
             raise ValueError('missing must be None or an empty list')
@@ -370,37 +623,53 @@ class GcdConnector:
 
         attempts = 0
         entities = []
-        while keys and attempts < _MAX_LOOPS:
-            attempts += 1
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                        self._lookup_url,
-                        data=data(),
-                        headers=await self._get_headers()) as resp:
+        operation = None
+        try:
+            while keys and attempts < _MAX_LOOPS:
+                attempts += 1
+                request_data = data()
+                if operation is None:
+                    operation = self._start_operation(LOOKUP, request_data)
+
+                status, content = await self._request(
+                    LOOKUP, request_data, operation)
+
+                if status != 200:
+                    raise ValueError(
+                        'Error while looking up keys in the datastore: {} '
+                        '({})'.format(
+                            content.get('error', 'unknown'),
+                            status
+                        )
+                    )
 
-                    content = await resp.json()
-                    entities.extend(Entity(result['entity']) for result in
-                                    content.get('found', []))
+                entities.extend(
+                    result['entity']
+                    for result in content.get('found', []))
 
-                    if missing is not None:
-                        missing.extend(result['entity'] for result in
-                                       content.get('missing', []))
+                if missing is not None:
+                    missing.extend(result['entity'] for result in
+                                   content.get('missing', []))
 
-                    deferred_keys = [Key(result) for result in
-                                     content.get('deferred', [])]
+                deferred_keys = [Key(result) for result in
+                                 content.get('deferred', [])]
 
-                    if deferred is not None:
-                        deferred.extend(deferred_keys)
-                        break
+                if deferred is not None:
+                    deferred.extend(deferred_keys)
+                    break
 
-                    keys = deferred_keys
+                keys = deferred_keys
+        finally:
+            self._finish_operation(operation)
 
         return entities
 
     async def get_entity_by_key(self, key: Key,
                                 missing: list[Any] | None = None,
                                 deferred: list[Key] | None = None,
-                                eventual: bool = False) -> Entity | None:
+                                eventual: bool = False,
+                                read_time: ReadTime | None = None
+                                ) -> Entity | None:
         """Returns an entity object for the given key or None in case no
         entity is found.
 
@@ -408,17 +677,60 @@ class GcdConnector:
         :return: Entity object or None.
         """
         entity = await self.get_entities_by_keys([key], missing, deferred,
-                                                 eventual)
+                                                 eventual, read_time)
         if entity:
             return entity[0]
 
+    async def allocate_ids(self, keys: Iterable[Key]) -> list[Key]:
+        """Returns complete keys for the given incomplete keys. The last path
+        element of each key must not have an id or name.
+
+        :param keys: list of incomplete Key objects
+        :return: list of Key objects with allocated ids (in the same order)
+        """
+        data = {'keys': [key.get_dict() for key in keys]}
+        operation = self._start_operation(ALLOCATE_IDS, data)
+        try:
+            status, content = await self._request(
+                ALLOCATE_IDS, data, operation)
+        finally:
+            self._finish_operation(operation)
+
+        if status == 200:
+            return [Key(key) for key in content.get('keys', [])]
+
+        raise ValueError(
+                'Error while allocating ids: {} ({})'
+                .format(
+                    content.get('error', 'unknown'),
+                    status
+                ))
+
     async def _get_headers(self) -> dict[str, str]:
-        token = await self._token.get()
+        if not self._hooks:
+            token = self._access_token = await self._token.get()
+        else:
+            start = time.perf_counter()
+            token = await self._token.get()
+            if token != self._access_token:
+                self._access_token = token
+                self._token_refreshed(time.perf_counter() - start)
         return {
             'Authorization': 'Bearer {}'.format(token),
             'Content-Type': 'application/json'
         }
 
+    def _token_refreshed(self, latency: float):
+        """Report a new access token to the hooks."""
+        event = RequestEvent(TOKEN, None, None, 1)
+        event.status = 200
+        event.latency = latency
+        operation = OperationEvent(TOKEN, None, None)
+        operation.duration = latency
+        operation.add(event)
+        self._call_hooks('on_request', event)
+        self._call_hooks('on_operation', operation)
+
     @staticmethod
     def _check_mutation_result(entity_or_key, mutation_result) -> bool:
         if 'key' in mutation_result:
@@ -426,7 +738,13 @@ class GcdConnector:
             # Set only when the mutation allocated a key.
             entity_or_key.key = Key(mutation_result['key'])
 
-        return not mutation_result.get('conflictDetected', False)
+        if mutation_result.get('conflictDetected', False):
+            return False
+
+        if isinstance(entity_or_key, Entity):
+            entity_or_key.mark_unchanged()
+
+        return True
 
     async def _commit_entities_or_keys(self, entities_or_keys, method) -> \
             tuple[bool, ...]:
@@ -449,7 +767,11 @@ class GcdServiceAccountConnector(GcdConnector):
             service_file: str,
             session: aiohttp.ClientSession | None = None,
             scopes: Iterable[str] | None = None,
-            namespace_id: str | None = None):
+            namespace_id: str | None = None,
+            api_endpoint: str | None = None,
+            trace_configs: Iterable[aiohttp.TraceConfig] | None = None,
+            transport: Transport | None = None,
+            compress_threshold: int | None = None):
 
         scopes = scopes or list(DEFAULT_SCOPES)
         self.project_id = project_id
@@ -458,19 +780,40 @@ class GcdServiceAccountConnector(GcdConnector):
         self._token = ServiceAccountToken(project_id, service_file, scopes,
                                           session)
 
-        api_endpoint = _get_api_endpoint()
+        self._setup(
+            api_endpoint, trace_configs, transport, compress_threshold)
 
-        self._run_query_url = DATASTORE_URL.format(
-            api_endpoint=api_endpoint,
-            project_id=self.project_id,
-            method='runQuery')
 
-        self._commit_url = DATASTORE_URL.format(
-            api_endpoint=api_endpoint,
-            project_id=self.project_id,
-            method='commit')
+class GcdEmulatorConnector(GcdConnector):
+    def __init__(
+            self,
+            project_id: str,
+            namespace_id: str | None = None,
+            api_endpoint: str | None = None,
+            trace_configs: Iterable[aiohttp.TraceConfig] | None = None,
+            transport: Transport | None = None,
+            compress_threshold: int | None = None):
+        """Connector for the Datastore emulator or the in-process fake server
+        (see aiogcd.fakeserver). No credentials are used.
+
+        :param project_id: project id
+        :param namespace_id: default namespace
+        :param api_endpoint: for example 'http://localhost:8081', by default
+                             DATASTORE_EMULATOR_HOST is used
+        """
+        if api_endpoint is None and transport is None and \
+                os.getenv('DATASTORE_EMULATOR_HOST') is None:
+            raise ValueError(
+                'api_endpoint or transport is required when '
+                'DATASTORE_EMULATOR_HOST is not set')
 
-        self._lookup_url = DATASTORE_URL.format(
-            api_endpoint=api_endpoint,
-            project_id=self.project_id,
-            method='lookup')
+        self.project_id = project_id
+        self.namespace_id = namespace_id
+        self._setup(
+            api_endpoint, trace_configs, transport, compress_threshold)
+
+    async def connect(self):
+        pass
+
+    async def _get_headers(self) -> dict[str, str]:
+        return {'Content-Type': 'application/json'}
@@ -6,12 +6,19 @@ Created on: May 19, 2017
 import json
 from .key import Key
 from .timestampvalue import TimestampValue
+from .utils import exclude_from_indexes
 from .utils import value_from_dict
 from .utils import value_to_dict
 
 
 class Entity:
 
+    # Set to False when the entity is read from, or written to the datastore.
+    _changed = True
+
+    # Properties which are excluded from indexes when writing the entity.
+    _unindexed: frozenset[str] = frozenset()
+
     def __init__(self, entity_res: dict):
         """Initialize an Entity object.
 
@@ -46,8 +53,19 @@ class Entity:
     def __str__(self):
         return json.dumps(self.serializable_dict())
 
+    @classmethod
+    def _from_entity_res(cls, entity_res: dict):
+        """Create an unchanged entity from an entity result as returned by the
+        datastore."""
+        entity = cls(entity_res)
+        entity.__dict__['_changed'] = False
+        return entity
+
     def __setattr__(self, key, value):
-        self.__dict__[key] = value
+        data = self.__dict__
+        data[key] = value
+        if key in data.get('_properties', ()):
+            data['_changed'] = True
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -67,18 +85,24 @@ class Entity:
         # sub-classed and then getattr() could access a computed property
         # instead of the variable we really want.
 
+        properties = {
+            prop: value_to_dict(self.__dict__[prop])
+            for prop in self._properties
+        }
+
+        for prop in self._unindexed & self._properties:
+            exclude_from_indexes(properties[prop])
+
         return {
             'key': self.key.get_dict(),
-            'properties': {
-                prop: value_to_dict(self.__dict__[prop])
-                for prop in self._properties
-            }
+            'properties': properties
         }
 
-    def serializable_dict(self, key_as=None):
+    def serializable_dict(self, key_as=None, include_none=True):
         data = {
             prop: _serialize_value(self.__dict__[prop])
             for prop in self._properties
+            if include_none or self.__dict__[prop] is not None
         }
         if isinstance(key_as, str):
             data[key_as] = self.key.ks
@@ -91,13 +115,33 @@ class Entity:
         property directly. This method must be used for new properties.
         """
         self.__dict__[prop] = value
+        self.__dict__['_changed'] = True
         self._properties.add(prop)
 
     def del_property(self, prop):
         """Use this method to delete an existing property."""
         del self.__dict__[prop]
+        self.__dict__['_changed'] = True
         self._properties.remove(prop)
 
+    def has_changes(self) -> bool:
+        """Returns True if the entity is changed since it was read from, or
+        written to the datastore. New entities are always marked as changed.
+
+        Changes are tracked when setting or deleting properties. Changes made
+        inside a property value, for example appending to a list, are only
+        tracked for array properties on a GcdModel.
+        """
+        return self._changed
+
+    def mark_unchanged(self):
+        """Mark the entity as unchanged. This is done automatically after the
+        entity is read from, or successfully written to the datastore."""
+        self.__dict__['_changed'] = False
+
+    def _mark_changed(self):
+        self.__dict__['_changed'] = True
+
 
 def _serialize_value(val):
     if isinstance(val, TimestampValue):
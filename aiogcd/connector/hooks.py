@@ -0,0 +1,156 @@
+"""hooks.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+from typing import Any
+
+# Operation names, equal to the Datastore API methods.
+RUN_QUERY = 'runQuery'
+LOOKUP = 'lookup'
+COMMIT = 'commit'
+ALLOCATE_IDS = 'allocateIds'
+TOKEN = 'token'
+
+
+class RequestEvent:
+    """Information about a single HTTP request to the datastore."""
+
+    __slots__ = (
+        'method',
+        'kind',
+        'status',
+        'latency',
+        'request_bytes',
+        'response_bytes',
+        'entity_count',
+        'deferred',
+        'attempt',
+        'data',
+        'error',
+    )
+
+    def __init__(self, method: str, kind: str | None, data: Any,
+                 attempt: int):
+        self.method = method
+        self.kind = kind
+        self.status = 0
+        self.latency = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.entity_count = 0
+        self.deferred = 0
+        self.attempt = attempt
+        self.data = data
+        self.error: BaseException | None = None
+
+    def __repr__(self):
+        return (
+            '<RequestEvent {} kind={!r} status={} latency={:.6f} '
+            'entities={} attempt={}>'.format(
+                self.method, self.kind, self.status, self.latency,
+                self.entity_count, self.attempt))
+
+
+class OperationEvent:
+    """Information about a connector operation which may use more than one
+    request, for example a query with multiple pages or a lookup with
+    deferred keys."""
+
+    __slots__ = (
+        'method',
+        'kind',
+        'status',
+        'duration',
+        'latency',
+        'requests',
+        'request_bytes',
+        'response_bytes',
+        'entity_count',
+        'deferred',
+        'data',
+        'error',
+    )
+
+    def __init__(self, method: str, kind: str | None, data: Any):
+        self.method = method
+        self.kind = kind
+        self.status = 0
+        # time between the start and the end of the operation, for a query
+        # which is used as iterator this includes the time of the consumer
+        self.duration = 0.0
+        # sum of the request latencies
+        self.latency = 0.0
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.entity_count = 0
+        self.deferred = 0
+        self.data = data
+        self.error: BaseException | None = None
+
+    def __repr__(self):
+        return (
+            '<OperationEvent {} kind={!r} status={} duration={:.6f} '
+            'requests={} entities={}>'.format(
+                self.method, self.kind, self.status, self.duration,
+                self.requests, self.entity_count))
+
+    def add(self, event: RequestEvent):
+        self.status = event.status
+        self.latency += event.latency
+        self.requests += 1
+        self.request_bytes += event.request_bytes
+        self.response_bytes += event.response_bytes
+        self.entity_count += event.entity_count
+        self.deferred += event.deferred
+        self.error = event.error
+
+
+class ConnectorHook:
+    """Base class for connector hooks, see GcdConnector.add_hook(). Hooks are
+    called synchronously so they should be cheap. An exception raised by a
+    hook is logged and does not break the request."""
+
+    def on_request(self, event: RequestEvent):
+        """Called after each HTTP request (or a token refresh)."""
+        pass
+
+    def on_operation(self, event: OperationEvent):
+        """Called when an operation is finished, also when the operation has
+        failed or a query iterator is closed before the end."""
+        pass
+
+
+def get_kind(method: str, data: Any) -> str | None:
+    """Returns the entity kind for the request data, if any."""
+    try:
+        if method == RUN_QUERY:
+            return data['query']['kind'][0]['name']
+        if method == LOOKUP or method == ALLOCATE_IDS:
+            return data['keys'][0]['path'][-1]['kind']
+        if method == COMMIT:
+            mutation = data['mutations'][0]
+            value, = mutation.values()
+            key = value.get('key', value)
+            return key['path'][-1]['kind']
+    except (KeyError, IndexError, TypeError, ValueError):
+        pass
+    return None
+
+
+def get_counts(method: str, content: Any) -> tuple[int, int]:
+    """Returns the number of entities (or keys) in the response and the
+    number of deferred keys."""
+    if not isinstance(content, dict):
+        return 0, 0
+    if method == RUN_QUERY:
+        return len(content.get('batch', {}).get('entityResults', ())), 0
+    if method == LOOKUP:
+        return \
+            len(content.get('found', ())), len(content.get('deferred', ()))
+    if method == COMMIT:
+        return len(content.get('mutationResults', ())), 0
+    if method == ALLOCATE_IDS:
+        return len(content.get('keys', ())), 0
+    return 0, 0
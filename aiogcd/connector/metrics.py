@@ -0,0 +1,171 @@
+"""metrics.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import bisect
+from typing import Any, Iterable
+from .hooks import ConnectorHook, OperationEvent
+
+# Default histogram buckets in seconds.
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value \
+        .replace('\\', '\\\\') \
+        .replace('"', '\\"') \
+        .replace('\n', '\\n')
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+class _Series:
+
+    __slots__ = (
+        'buckets',
+        'count',
+        'sum',
+        'requests',
+        'entities',
+        'request_bytes',
+        'response_bytes',
+    )
+
+    def __init__(self, size: int):
+        # the last bucket is +Inf
+        self.buckets = [0] * (size + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.requests = 0
+        self.entities = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class Metrics(ConnectorHook):
+
+    def __init__(
+            self,
+            buckets: Iterable[float] = DEFAULT_BUCKETS,
+            by_kind: bool = True,
+            prefix: str = 'aiogcd'):
+        """Latency histograms and counters per operation, kind and outcome.
+
+        Example:
+
+            metrics = Metrics()
+            gcd.add_hook(metrics)
+            ...
+            print(metrics.render())  # Prometheus text format
+
+        The latency of an operation is the sum of the latencies of its
+        requests, so for a query the time which is spent by the consumer
+        between pages is not included.
+
+        :param buckets: upper bounds of the histogram buckets in seconds
+        :param by_kind: split the metrics by entity kind
+        :param prefix: prefix for the Prometheus metric names
+        """
+        self._bounds = tuple(sorted(buckets))
+        self._by_kind = by_kind
+        self._prefix = prefix
+        self._series: dict[tuple[str, str, str], _Series] = {}
+
+    def on_operation(self, event: OperationEvent):
+        outcome = 'ok' \
+            if event.status == 200 and event.error is None else 'error'
+        labels = (
+            event.method,
+            (event.kind or '') if self._by_kind else '',
+            outcome)
+
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _Series(len(self._bounds))
+
+        series.buckets[bisect.bisect_left(self._bounds, event.latency)] += 1
+        series.count += 1
+        series.sum += event.latency
+        series.requests += event.requests
+        series.entities += event.entity_count
+        series.request_bytes += event.request_bytes
+        series.response_bytes += event.response_bytes
+
+    def reset(self):
+        self._series.clear()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Returns the metrics as a list with a dictionary for each
+        combination of method, kind and outcome. Bucket counts are
+        cumulative, like in the Prometheus format."""
+        result = []
+        for (method, kind, outcome), series in sorted(self._series.items()):
+            total = 0
+            buckets = {}
+            for bound, count in zip(
+                    self._bounds + (float('inf'),), series.buckets):
+                total += count
+                buckets[bound] = total
+            result.append({
+                'method': method,
+                'kind': kind,
+                'outcome': outcome,
+                'count': series.count,
+                'sum': series.sum,
+                'buckets': buckets,
+                'requests': series.requests,
+                'entities': series.entities,
+                'request_bytes': series.request_bytes,
+                'response_bytes': series.response_bytes,
+            })
+        return result
+
+    def render(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        prefix = self._prefix
+        snapshot = self.snapshot()
+        lines = []
+
+        name = '{}_operation_latency_seconds'.format(prefix)
+        lines.append(
+            '# HELP {} Datastore operation latency in seconds.'.format(name))
+        lines.append('# TYPE {} histogram'.format(name))
+        for item in snapshot:
+            labels = 'method="{}",kind="{}",outcome="{}"'.format(
+                _escape(item['method']),
+                _escape(item['kind']),
+                _escape(item['outcome']))
+            for bound, count in item['buckets'].items():
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                    name,
+                    labels,
+                    '+Inf' if bound == float('inf') else _format_float(bound),
+                    count))
+            lines.append('{}_sum{{{}}} {}'.format(
+                name, labels, _format_float(item['sum'])))
+            lines.append('{}_count{{{}}} {}'.format(
+                name, labels, item['count']))
+
+        for field, help_text in (
+                ('requests', 'Number of HTTP requests.'),
+                ('entities', 'Number of returned or written entities.'),
+                ('request_bytes', 'Number of bytes sent.'),
+                ('response_bytes', 'Number of bytes received.')):
+            name = '{}_{}_total'.format(prefix, field)
+            lines.append('# HELP {} {}'.format(name, help_text))
+            lines.append('# TYPE {} counter'.format(name))
+            for item in snapshot:
+                lines.append(
+                    '{}{{method="{}",kind="{}",outcome="{}"}} {}'.format(
+                        name,
+                        _escape(item['method']),
+                        _escape(item['kind']),
+                        _escape(item['outcome']),
+                        item[field]))
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,106 @@
+"""profiling.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import time
+import contextlib
+import contextvars
+from typing import Any, Callable, Iterator
+
+# Phases which are measured.
+NETWORK = 'network'
+READ = 'read'
+PARSE = 'parse'
+ENTITIES = 'entities'
+MODELS = 'models'
+
+_PHASES = (NETWORK, READ, PARSE, ENTITIES, MODELS)
+
+_current: contextvars.ContextVar['Profile | None'] = \
+    contextvars.ContextVar('aiogcd_profile', default=None)
+
+
+class Profile:
+
+    __slots__ = (
+        'network',
+        'read',
+        'parse',
+        'entities',
+        'models',
+        'requests',
+        'response_bytes',
+    )
+
+    def __init__(self):
+        """Time in seconds which is spent in each phase:
+
+            network:  waiting for the response status and headers
+            read:     reading the response body
+            parse:    decoding the JSON response
+            entities: creating Entity (and Key) objects
+            models:   creating GcdModel instances
+        """
+        self.network: float = 0.0
+        self.read: float = 0.0
+        self.parse: float = 0.0
+        self.entities: float = 0.0
+        self.models: float = 0.0
+        self.requests: int = 0
+        self.response_bytes: int = 0
+
+    def __repr__(self):
+        return '<Profile {} requests={} response_bytes={}>'.format(
+            ' '.join(
+                '{}={:.6f}'.format(phase, getattr(self, phase))
+                for phase in _PHASES),
+            self.requests,
+            self.response_bytes)
+
+    @property
+    def total(self) -> float:
+        return sum(getattr(self, phase) for phase in _PHASES)
+
+    def get_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[Profile]:
+    """Measure the phases of all datastore calls within the context.
+
+    Example:
+
+        with profile() as p:
+            users = await User.filter().get_entities(gcd)
+
+        print(p.network, p.read, p.parse, p.entities, p.models)
+
+    Concurrent requests within the context (for example by get_many) add to
+    the same profile, so the sum of the phases can exceed the wall time.
+    """
+    result = Profile()
+    token = _current.set(result)
+    try:
+        yield result
+    finally:
+        _current.reset(token)
+
+
+def get_profile() -> Profile | None:
+    """Returns the active profile or None."""
+    return _current.get()
+
+
+def timed(phase: str, func: Callable[..., Any], *args: Any) -> Any:
+    """Call func(*args) and add the time to the given phase of the active
+    profile. Without an active profile only func(*args) is called."""
+    current = _current.get()
+    if current is None:
+        return func(*args)
+    start = time.perf_counter()
+    result = func(*args)
+    setattr(current, phase,
+            getattr(current, phase) + time.perf_counter() - start)
+    return result
@@ -0,0 +1,231 @@
+"""scan.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import os
+import json
+import time
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable
+from .entity import Entity
+from .timestampvalue import TimestampValue
+from .utils import ReadTime
+
+# Default number of results in one page.
+DEFAULT_BATCH_SIZE = 500
+
+
+class CheckpointStore:
+    """Base class for a checkpoint store. A store keeps the state of a scan
+    by name, the state is a dictionary which can be serialized to JSON.
+
+    Implement load(), save() and clear() to use a custom store, for example
+    to keep the checkpoints in a database.
+    """
+
+    async def load(self, name: str) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    async def save(self, name: str, state: dict[str, Any]):
+        raise NotImplementedError
+
+    async def clear(self, name: str):
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+
+    def __init__(self, path: str):
+        """Store checkpoints in a local JSON file. The file is replaced on each
+        save so a crash while writing never leaves a corrupt checkpoint. File
+        access runs in a thread so the event loop is not blocked.
+
+        :param path: checkpoint file, for example: 'export.checkpoint.json'
+        """
+        if not path.endswith('.json'):
+            raise ValueError(
+                'Invalid checkpoint file: {}, expecting a .json file.'
+                .format(path))
+        self._path = path
+
+    def _read(self) -> dict[str, Any]:
+        if not os.path.isfile(self._path):
+            return {}
+        with open(self._path, 'r') as f:
+            return json.load(f)
+
+    def _write(self, checkpoints: dict[str, Any]):
+        tmp = '{}.tmp'.format(self._path)
+        with open(tmp, 'w') as f:
+            json.dump(checkpoints, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path)
+
+    def _save(self, name: str, state: dict[str, Any]):
+        checkpoints = self._read()
+        checkpoints[name] = state
+        self._write(checkpoints)
+
+    def _clear(self, name: str):
+        checkpoints = self._read()
+        if checkpoints.pop(name, None) is not None:
+            self._write(checkpoints)
+
+    async def load(self, name: str) -> dict[str, Any] | None:
+        checkpoints = await asyncio.to_thread(self._read)
+        return checkpoints.get(name)
+
+    async def save(self, name: str, state: dict[str, Any]):
+        await asyncio.to_thread(self._save, name, state)
+
+    async def clear(self, name: str):
+        await asyncio.to_thread(self._clear, name)
+
+
+class ScanRunner:
+
+    def __init__(
+            self,
+            gcd: Any,
+            query: dict,
+            callback: Callable[[list[Any]], Awaitable[None] | None],
+            store: CheckpointStore,
+            name: str,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            checkpoint_interval: float = 0.0,
+            eventual: bool = False,
+            read_time: ReadTime | None = None):
+        """Run a (long) query page by page and checkpoint the end cursor after
+        each processed page. When the scan is started again with the same
+        store and name, it resumes after the last checkpoint.
+
+        The callback is called with a list of entities for each page, the
+        checkpoint is saved only after the callback is finished. This gives
+        at-least-once semantics; pages which are processed after the last
+        checkpoint are processed again when a scan is resumed.
+
+        Example:
+
+            async def export(users):
+                ...
+
+            runner = ScanRunner(
+                gcd,
+                User.filter(),
+                export,
+                FileCheckpointStore('export.checkpoint.json'),
+                'export-users')
+
+            await runner.run()
+
+        :param gcd: GcdConnector instance.
+        :param query: query data or a Filter. For a Filter the callback
+                      receives model instances, otherwise Entity objects.
+        :param callback: function or coroutine function which is called
+                         with the list of entities for each page
+        :param store: CheckpointStore instance
+        :param name: unique name for the scan within the store
+        :param batch_size: max number of entities in one page
+        :param checkpoint_interval: minimal number of seconds between two
+                                    checkpoints, by default a checkpoint is
+                                    saved after each page
+        :param eventual: use eventual consistency (default is strong)
+        :param read_time: read the entities as they were at the given time,
+                          the read time is saved with the checkpoint and a
+                          resumed scan reads the same snapshot (a different
+                          read time for a resumed scan raises ValueError)
+        """
+        model = getattr(query, '_model', None)
+        self._from_entity_res = Entity._from_entity_res \
+            if model is None else model._from_entity_res
+        self._gcd = gcd
+        self._query = query
+        self._callback = callback
+        self._store = store
+        self._name = name
+        self._batch_size = batch_size
+        self._checkpoint_interval = checkpoint_interval
+        self._eventual = eventual
+        if read_time is not None and \
+                not isinstance(read_time, TimestampValue):
+            read_time = TimestampValue(read_time)
+        self._read_time = None if read_time is None else str(read_time)
+        self.cursor: str | None = None
+        self.pages = 0
+        self.entities = 0
+
+    def _get_state(self) -> dict[str, Any]:
+        return {
+            'cursor': self.cursor,
+            'pages': self.pages,
+            'entities': self.entities,
+            'read_time': self._read_time,
+            'timestamp': int(time.time()),
+        }
+
+    async def _checkpoint(self):
+        await self._store.save(self._name, self._get_state())
+
+    async def run(self) -> int:
+        """Run the scan, resuming from the last checkpoint if one exists.
+        The checkpoint is cleared when the scan is finished.
+
+        :return: total number of processed entities (including the entities
+                 which are processed before the scan was resumed)
+        """
+        data = dict(self._query)
+        query = data['query'] = dict(self._query['query'])
+
+        state = await self._store.load(self._name)
+        if state is not None:
+            self.cursor = state['cursor']
+            self.pages = state['pages']
+            self.entities = state['entities']
+            read_time = state.get('read_time')
+            if read_time is not None:
+                if self._read_time is not None and \
+                        TimestampValue(read_time) != \
+                        TimestampValue(self._read_time):
+                    raise ValueError(
+                        'Scan {!r} is resumed with read time {} but the '
+                        'checkpoint uses read time {}'
+                        .format(self._name, self._read_time, read_time))
+                self._read_time = read_time
+            if self.cursor is not None:
+                query['startCursor'] = self.cursor
+                query.pop('offset', None)
+                if query.get('limit'):
+                    query['limit'] -= self.entities
+                    if query['limit'] <= 0:
+                        await self._store.clear(self._name)
+                        return self.entities
+
+        last = time.monotonic()
+        async for entity_results, cursor in self._gcd._iter_query_pages(
+                data,
+                self._batch_size,
+                self._eventual,
+                self._read_time):
+            from_entity_res = self._from_entity_res
+            entities = [
+                from_entity_res(result['entity'])
+                for result in entity_results]
+
+            result = self._callback(entities)
+            if inspect.isawaitable(result):
+                await result
+
+            self.cursor = cursor
+            self.pages += 1
+            self.entities += len(entities)
+
+            now = time.monotonic()
+            if now - last >= self._checkpoint_interval:
+                await self._checkpoint()
+                last = now
+
+        await self._store.clear(self._name)
+        return self.entities
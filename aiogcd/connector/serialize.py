@@ -0,0 +1,118 @@
+"""serialize.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import json
+import inspect
+from typing import Any, AsyncIterable, Iterable, Iterator
+
+# Default size in bytes for each written chunk.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_encode = json.JSONEncoder().encode
+
+
+class JsonArrayEncoder:
+
+    def __init__(
+            self,
+            key_as: str | None = None,
+            include_none: bool | None = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Encode entities (or models) to a JSON array in chunks of bytes.
+        Each entity is serialized using serializable_dict().
+
+        :param key_as: If key_as is set to a string value, then the key string
+                       will be added to each object. (default is None)
+        :param include_none: If set, include or exclude None values. By
+                             default an Entity includes None values while a
+                             GcdModel does not.
+        :param chunk_size: minimal size of each chunk in bytes (except for
+                           the last chunk)
+        """
+        self._kwargs: dict[str, Any] = {'key_as': key_as}
+        if include_none is not None:
+            self._kwargs['include_none'] = include_none
+        self._chunk_size = chunk_size
+        self._parts = [b'[']
+        self._size = 1
+        self._sep = b''
+
+    def add(self, entity) -> bytes | None:
+        """Add an entity. Returns a chunk when at least chunk_size bytes are
+        pending, None otherwise."""
+        data = _encode(
+            entity.serializable_dict(**self._kwargs)).encode('utf-8')
+        self._parts.append(self._sep)
+        self._parts.append(data)
+        self._size += len(self._sep) + len(data)
+        self._sep = b', '
+        if self._size >= self._chunk_size:
+            return self._flush()
+        return None
+
+    def finish(self) -> bytes:
+        """Returns the last chunk which closes the JSON array."""
+        self._parts.append(b']')
+        return self._flush()
+
+    def _flush(self) -> bytes:
+        chunk = b''.join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        return chunk
+
+
+def iter_json(entities: Iterable[Any], **options) -> Iterator[bytes]:
+    """Yields a JSON array with the given entities in chunks of bytes.
+    See JsonArrayEncoder for the options."""
+    encoder = JsonArrayEncoder(**options)
+    for entity in entities:
+        chunk = encoder.add(entity)
+        if chunk is not None:
+            yield chunk
+    yield encoder.finish()
+
+
+def dump_json(entities: Iterable[Any], fp, **options):
+    """Write a JSON array with the given entities to a binary file object.
+    See JsonArrayEncoder for the options."""
+    for chunk in iter_json(entities, **options):
+        fp.write(chunk)
+
+
+async def write_json(
+        writer,
+        entities: Iterable[Any] | AsyncIterable[Any],
+        **options):
+    """Write a JSON array with the given entities to an async writer, for
+    example an aiohttp StreamResponse or an asyncio StreamWriter.
+
+    The entities may also be an async iterable, for example:
+
+        await write_json(response, User.filter().iter(gcd), key_as='key')
+
+    See JsonArrayEncoder for the options.
+    """
+    encoder = JsonArrayEncoder(**options)
+
+    async def write(chunk):
+        result = writer.write(chunk)
+        if inspect.isawaitable(result):
+            await result
+        elif hasattr(writer, 'drain'):
+            await writer.drain()
+
+    if isinstance(entities, AsyncIterable):
+        async for entity in entities:
+            chunk = encoder.add(entity)
+            if chunk is not None:
+                await write(chunk)
+    else:
+        for entity in entities:
+            chunk = encoder.add(entity)
+            if chunk is not None:
+                await write(chunk)
+
+    await write(encoder.finish())
@@ -0,0 +1,199 @@
+"""slowlog.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import time
+import logging
+import collections
+from typing import Any
+from .hooks import ConnectorHook, OperationEvent, RUN_QUERY, TOKEN
+
+
+def _filter_shape(query_filter: dict) -> str:
+    if 'compositeFilter' in query_filter:
+        composite = query_filter['compositeFilter']
+        parts = [_filter_shape(f) for f in composite.get('filters', ())]
+        op = ' {} '.format(composite.get('op', 'AND'))
+        return '({})'.format(op.join(parts)) if len(parts) > 1 else \
+            ''.join(parts)
+    prop_filter = query_filter.get('propertyFilter', {})
+    return '{} {}'.format(
+        prop_filter.get('property', {}).get('name'),
+        prop_filter.get('op'))
+
+
+def query_shape(data: Any) -> str:
+    """Returns the normalized shape of runQuery data: the kind, the filter
+    property names and operators, the order and the projection. Values,
+    cursors, offsets and limits are not included so equal queries with
+    different values have the same shape.
+
+    Example: 'User filter=(age GREATER_THAN AND name EQUAL) order=age DESC'
+    """
+    try:
+        query = data['query']
+    except (KeyError, TypeError):
+        return 'gqlQuery' if isinstance(data, dict) and \
+            'gqlQuery' in data else '?'
+
+    kinds = query.get('kind')
+    parts = [kinds[0]['name'] if kinds else '*']
+
+    namespace = data.get('partitionId', {}).get('namespaceId')
+    if namespace:
+        parts.append('namespace={}'.format(namespace))
+
+    if 'filter' in query:
+        parts.append('filter={}'.format(_filter_shape(query['filter'])))
+
+    if query.get('order'):
+        parts.append('order={}'.format(', '.join(
+            '{} {}'.format(
+                order['property']['name'],
+                'DESC' if order.get('direction') == 'DESCENDING' else 'ASC')
+            for order in query['order'])))
+
+    if query.get('projection'):
+        parts.append('projection={}'.format(', '.join(
+            p['property']['name'] for p in query['projection'])))
+
+    return ' '.join(parts)
+
+
+def operation_shape(event: OperationEvent) -> str:
+    """Returns the normalized shape for an operation."""
+    if event.method == RUN_QUERY:
+        return query_shape(event.data)
+    return event.kind or '*'
+
+
+class SlowOperation:
+
+    __slots__ = (
+        'method',
+        'shape',
+        'latency',
+        'duration',
+        'requests',
+        'entities',
+        'response_bytes',
+        'reasons',
+        'timestamp',
+    )
+
+    def __init__(self, event: OperationEvent, reasons: list[str]):
+        self.method = event.method
+        self.shape = operation_shape(event)
+        self.latency = event.latency
+        self.duration = event.duration
+        self.requests = event.requests
+        self.entities = event.entity_count
+        self.response_bytes = event.response_bytes
+        self.reasons = reasons
+        self.timestamp = time.time()
+
+    def __str__(self):
+        return (
+            '{} {} ({}): latency={:.3f}s duration={:.3f}s requests={} '
+            'entities={} bytes={}'.format(
+                self.method,
+                self.shape,
+                ', '.join(self.reasons),
+                self.latency,
+                self.duration,
+                self.requests,
+                self.entities,
+                self.response_bytes))
+
+    def get_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SlowQueryLog(ConnectorHook):
+
+    def __init__(
+            self,
+            latency: float | None = 1.0,
+            requests: int | None = None,
+            entities: int | None = None,
+            maxlen: int = 1000,
+            logger: logging.Logger | None = None):
+        """Record operations which exceed one of the thresholds. A threshold
+        set to None is not used.
+
+        Example:
+
+            slow_log = SlowQueryLog(latency=0.5, requests=10, entities=5000)
+            gcd.add_hook(slow_log)
+            ...
+            for shape, stats in slow_log.summary():
+                print(shape, stats)
+
+        :param latency: total request latency of an operation in seconds
+        :param requests: number of requests, for a query this is the number
+                         of pages
+        :param entities: number of returned (or written) entities
+        :param maxlen: maximum number of recorded operations, the oldest
+                       records are removed first
+        :param logger: when given, each slow operation is logged as warning
+        """
+        self.latency = latency
+        self.requests = requests
+        self.entities = entities
+        self.logger = logger
+        self.entries: collections.deque[SlowOperation] = \
+            collections.deque(maxlen=maxlen)
+
+    def _reasons(self, event: OperationEvent) -> list[str]:
+        reasons = []
+        if self.latency is not None and event.latency >= self.latency:
+            reasons.append('latency')
+        if self.requests is not None and event.requests >= self.requests:
+            reasons.append('requests')
+        if self.entities is not None and \
+                event.entity_count >= self.entities:
+            reasons.append('entities')
+        return reasons
+
+    def on_operation(self, event: OperationEvent):
+        if event.method == TOKEN:
+            return
+
+        reasons = self._reasons(event)
+        if not reasons:
+            return
+
+        entry = SlowOperation(event, reasons)
+        self.entries.append(entry)
+        if self.logger is not None:
+            self.logger.warning('Slow datastore operation: %s', entry)
+
+    def clear(self):
+        self.entries.clear()
+
+    def summary(self) -> list[tuple[str, dict[str, Any]]]:
+        """Returns the recorded operations grouped by method and shape,
+        sorted by total latency (highest first)."""
+        groups: dict[str, dict[str, Any]] = {}
+        for entry in self.entries:
+            key = '{} {}'.format(entry.method, entry.shape)
+            stats = groups.get(key)
+            if stats is None:
+                stats = groups[key] = {
+                    'count': 0,
+                    'latency': 0.0,
+                    'max_latency': 0.0,
+                    'requests': 0,
+                    'entities': 0,
+                }
+            stats['count'] += 1
+            stats['latency'] += entry.latency
+            stats['max_latency'] = max(stats['max_latency'], entry.latency)
+            stats['requests'] += entry.requests
+            stats['entities'] += entry.entities
+
+        return sorted(
+            groups.items(),
+            key=lambda item: item[1]['latency'],
+            reverse=True)
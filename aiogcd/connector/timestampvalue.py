@@ -3,13 +3,138 @@
 Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
+import datetime
+import functools
 
+_UTC = datetime.timezone.utc
 
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    """Returns a timezone aware datetime for an RFC3339 timestamp as used by
+    the datastore, for example: 2017-05-19T12:34:56.123456789Z
+
+    Fractions smaller than a microsecond are truncated.
+    """
+    try:
+        if value[-1] in 'Zz':
+            tz = _UTC
+            end = len(value) - 1
+        else:
+            end = len(value) - 6
+            sign = value[end]
+            if sign not in '+-' or value[end + 3] != ':':
+                raise ValueError
+            offset = datetime.timedelta(
+                hours=int(value[end + 1:end + 3]),
+                minutes=int(value[end + 4:]))
+            tz = datetime.timezone(-offset if sign == '-' else offset)
+
+        if value[4] != '-' or value[7] != '-' or value[10] not in 'Tt' or \
+                value[13] != ':' or value[16] != ':':
+            raise ValueError
+
+        microsecond = 0
+        if end > 19:
+            if value[19] != '.' or end == 20:
+                raise ValueError
+            microsecond = int(value[20:end][:6].ljust(6, '0'))
+
+        return datetime.datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+            microsecond,
+            tz)
+    except (ValueError, IndexError):
+        raise ValueError(
+            'Invalid RFC3339 timestamp: {!r}'.format(value)) from None
+
+
+def format_timestamp(dt: datetime.datetime) -> str:
+    """Returns an RFC3339 timestamp in UTC for a datetime. A naive datetime is
+    assumed to be in UTC."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(_UTC)
+    if dt.microsecond:
+        return '{:%Y-%m-%dT%H:%M:%S.%f}Z'.format(dt)
+    return '{:%Y-%m-%dT%H:%M:%S}Z'.format(dt)
+
+
+@functools.total_ordering
 class TimestampValue:
 
-    def __init__(self, timestamp_value):
-        self._timestamp_value = timestamp_value
+    def __init__(self, timestamp_value: str | datetime.datetime):
+        """Initialize a timestamp value using an RFC3339 formatted string or
+        a datetime object. A naive datetime is assumed to be in UTC.
+
+        A string value is validated and raises ValueError if it is not a
+        valid RFC3339 timestamp.
+        """
+        self._timestamp_value: str | None
+        self._datetime: datetime.datetime | None
+        if isinstance(timestamp_value, datetime.datetime):
+            self._timestamp_value = None
+            self._datetime = timestamp_value \
+                if timestamp_value.tzinfo is not None \
+                else timestamp_value.replace(tzinfo=_UTC)
+        else:
+            self._timestamp_value = timestamp_value
+            self._datetime = parse_timestamp(timestamp_value)
+
+    @classmethod
+    def _from_datastore(cls, timestamp_value: str) -> 'TimestampValue':
+        """Create a timestamp value for a timestamp as returned by the
+        datastore. The string value is parsed only when the datetime is used,
+        for example when comparing timestamp values."""
+        value = cls.__new__(cls)
+        value._timestamp_value = timestamp_value
+        value._datetime = None
+        return value
 
     def __str__(self):
         """Returns the formatted timestamp value."""
-        return self._timestamp_value
+        value = self._timestamp_value
+        if value is None:
+            # either the string value or the datetime is set
+            assert self._datetime is not None
+            value = self._timestamp_value = format_timestamp(self._datetime)
+        return value
+
+    def __repr__(self):
+        return 'TimestampValue({!r})'.format(str(self))
+
+    @property
+    def datetime(self) -> datetime.datetime:
+        """Returns the timestamp as a timezone aware datetime object."""
+        value = self._datetime
+        if value is None:
+            assert self._timestamp_value is not None
+            value = self._datetime = parse_timestamp(self._timestamp_value)
+        return value
+
+    @staticmethod
+    def _other(other):
+        if isinstance(other, TimestampValue):
+            return other.datetime
+        if isinstance(other, datetime.datetime):
+            return other if other.tzinfo is not None \
+                else other.replace(tzinfo=_UTC)
+        return None
+
+    def __eq__(self, other):
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        return self.datetime == other
+
+    def __lt__(self, other):
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        return self.datetime < other
+
+    def __hash__(self):
+        return hash(self.datetime)
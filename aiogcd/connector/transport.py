@@ -0,0 +1,315 @@
+"""transport.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import json
+import time
+import gzip
+import asyncio
+import collections
+import aiohttp
+from typing import Any, Iterable, TextIO
+from .profiling import get_profile
+
+DATASTORE_URL = \
+    '{api_endpoint}/v1/projects/{project_id}:{method}'
+
+
+class Response:
+
+    __slots__ = ('status', 'content', 'request_bytes', 'response_bytes')
+
+    def __init__(
+            self,
+            status: int,
+            content: Any,
+            request_bytes: int = 0,
+            response_bytes: int = 0):
+        """Response of a transport.
+
+        :param status: HTTP status code (200 when successful)
+        :param content: decoded response in the Datastore REST (JSON) format
+        :param request_bytes: number of bytes sent
+        :param response_bytes: number of bytes received
+        """
+        self.status = status
+        self.content = content
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+
+
+class Transport:
+    """Base class for a transport. A transport sends a request for a
+    Datastore method (runQuery, lookup, commit, allocateIds) and returns the
+    response. Requests and responses use the Datastore REST (JSON) format,
+    so the connector does not depend on the wire format.
+    """
+
+    async def request(
+            self,
+            method: str,
+            project_id: str,
+            data: dict,
+            headers: dict[str, str]) -> Response:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class RestTransport(Transport):
+
+    def __init__(
+            self,
+            api_endpoint: str,
+            trace_configs: Iterable[aiohttp.TraceConfig] | None = None,
+            compress_threshold: int | None = None,
+            compress_level: int = 6,
+            accept_encoding: str | None = 'gzip'):
+        """Default transport using the Datastore REST API.
+
+        :param api_endpoint: for example 'https://datastore.googleapis.com'
+        :param trace_configs: aiohttp.TraceConfig objects for the client
+                              session
+        :param compress_threshold: request bodies of at least this number of
+                                   bytes are gzip compressed (sent with
+                                   Content-Encoding: gzip), None disables
+                                   request compression
+        :param compress_level: gzip compression level (1-9)
+        :param accept_encoding: value for the Accept-Encoding header, the
+                                response is decompressed by aiohttp. When
+                                None the aiohttp default is used.
+        """
+        if compress_threshold is not None and compress_threshold < 0:
+            raise ValueError('compress_threshold must be at least 0')
+        if not 1 <= compress_level <= 9:
+            raise ValueError('compress_level must be between 1 and 9')
+        self.api_endpoint = api_endpoint.rstrip('/')
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.accept_encoding = accept_encoding
+        self._trace_configs = \
+            None if trace_configs is None else list(trace_configs)
+        self._urls: dict[tuple[str, str], str] = {}
+
+    def _get_url(self, method: str, project_id: str) -> str:
+        url = self._urls.get((method, project_id))
+        if url is None:
+            url = self._urls[(method, project_id)] = DATASTORE_URL.format(
+                api_endpoint=self.api_endpoint,
+                project_id=project_id,
+                method=method)
+        return url
+
+    def _encode(
+            self,
+            data: dict,
+            headers: dict[str, str]) -> tuple[bytes, dict[str, str]]:
+        """Returns the request body and headers, the given headers are not
+        changed."""
+        body = json.dumps(data).encode('utf-8')
+        if self.accept_encoding is not None:
+            headers = dict(headers, **{
+                'Accept-Encoding': self.accept_encoding})
+        if self.compress_threshold is not None and \
+                len(body) >= self.compress_threshold:
+            body = gzip.compress(body, compresslevel=self.compress_level)
+            headers = dict(headers, **{'Content-Encoding': 'gzip'})
+        return body, headers
+
+    async def request(
+            self,
+            method: str,
+            project_id: str,
+            data: dict,
+            headers: dict[str, str]) -> Response:
+        url = self._get_url(method, project_id)
+        body, headers = self._encode(data, headers)
+
+        # the number of received bytes is taken from Content-Length since
+        # this is the (compressed) size on the wire, raw is decompressed
+        current = get_profile()
+        if current is None:
+            async with aiohttp.ClientSession(
+                    trace_configs=self._trace_configs) as session:
+                async with session.post(
+                        url, data=body, headers=headers) as resp:
+                    status = resp.status
+                    raw = await resp.read()
+                    size = resp.content_length or len(raw)
+            return Response(status, json.loads(raw), len(body), size)
+
+        start = time.perf_counter()
+        async with aiohttp.ClientSession(
+                trace_configs=self._trace_configs) as session:
+            async with session.post(
+                    url, data=body, headers=headers) as resp:
+                status = resp.status
+                received = time.perf_counter()
+                raw = await resp.read()
+                size = resp.content_length or len(raw)
+        read = time.perf_counter()
+        content = json.loads(raw)
+
+        current.network += received - start
+        current.read += read - received
+        current.parse += time.perf_counter() - read
+        current.requests += 1
+        current.response_bytes += size
+        return Response(status, content, len(body), size)
+
+
+class RecordingTransport(Transport):
+
+    def __init__(self, transport: Transport, path: str):
+        """Record all requests and responses of a transport to a gzip
+        compressed file with a JSON record on each line. Headers (and thus
+        access tokens) are not recorded.
+
+        Example:
+
+            transport = RecordingTransport(
+                RestTransport('https://datastore.googleapis.com'),
+                'recording.jsonl.gz')
+            gcd = GcdServiceAccountConnector(
+                'my-project', 'service.json', transport=transport)
+            ...
+            await gcd.close()
+
+        :param transport: transport which is used for the requests
+        :param path: file to which the records are appended
+        """
+        self._transport = transport
+        self._path = path
+        self._fp: TextIO | None = None
+        self._start = time.time()
+
+    async def request(
+            self,
+            method: str,
+            project_id: str,
+            data: dict,
+            headers: dict[str, str]) -> Response:
+        # the request is encoded now since the connector changes the data
+        # of a query for the next page
+        request = json.dumps(data, sort_keys=True)
+        start = time.perf_counter()
+        response = await self._transport.request(
+            method, project_id, data, headers)
+        latency = time.perf_counter() - start
+
+        if self._fp is None:
+            self._fp = gzip.open(self._path, 'at', encoding='utf-8')
+        self._fp.write('{{"method": {}, "project_id": {}, "offset": {}, '
+                       '"latency": {}, "status": {}, "request_bytes": {}, '
+                       '"response_bytes": {}, "request": {}, '
+                       '"response": {}}}\n'.format(
+                           json.dumps(method),
+                           json.dumps(project_id),
+                           json.dumps(time.time() - self._start),
+                           json.dumps(latency),
+                           response.status,
+                           response.request_bytes,
+                           response.response_bytes,
+                           request,
+                           json.dumps(response.content)))
+        return response
+
+    async def close(self):
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        await self._transport.close()
+
+
+def read_records(path: str) -> list[dict[str, Any]]:
+    """Returns the records of a file which is written by a
+    RecordingTransport."""
+    with gzip.open(path, 'rt', encoding='utf-8') as fp:
+        return [json.loads(line) for line in fp if line.strip()]
+
+
+class ReplayTransport(Transport):
+
+    def __init__(
+            self,
+            path: str,
+            match: str = 'request',
+            timing: bool = False,
+            speed: float = 1.0):
+        """Replay the responses which are recorded by a RecordingTransport.
+        No network is used.
+
+        Example:
+
+            gcd = GcdEmulatorConnector(
+                'my-project',
+                transport=ReplayTransport('recording.jsonl.gz'))
+
+        :param path: recorded file
+        :param match: 'request' returns the response which is recorded for
+                      an equal method and request data (equal requests are
+                      replayed in the recorded order), 'order' returns the
+                      responses in the recorded order
+        :param timing: wait for the recorded latency before each response
+        :param speed: divide the recorded latency by this factor
+        """
+        if match not in ('request', 'order'):
+            raise ValueError(
+                'Expecting match to be \'request\' or \'order\' but got {!r}'
+                .format(match))
+        self._match = match
+        self._timing = timing
+        self._speed = speed
+        self._records: collections.deque[dict] = collections.deque()
+        self._by_request: dict[tuple[str, str], collections.deque[dict]] = \
+            collections.defaultdict(collections.deque)
+
+        for record in read_records(path):
+            if match == 'order':
+                self._records.append(record)
+            else:
+                key = (
+                    record['method'],
+                    json.dumps(record['request'], sort_keys=True))
+                self._by_request[key].append(record)
+
+    @property
+    def remaining(self) -> int:
+        """Number of recorded responses which are not replayed."""
+        if self._match == 'order':
+            return len(self._records)
+        return sum(len(records) for records in self._by_request.values())
+
+    def _next(self, method: str, data: dict) -> dict:
+        if self._match == 'order':
+            if not self._records or self._records[0]['method'] != method:
+                raise ValueError(
+                    'Expecting a {} request to be the next recorded request'
+                    .format(method))
+            return self._records.popleft()
+
+        records = self._by_request.get(
+            (method, json.dumps(data, sort_keys=True)))
+        if not records:
+            raise ValueError(
+                'No recorded response for this {} request'.format(method))
+        return records.popleft()
+
+    async def request(
+            self,
+            method: str,
+            project_id: str,
+            data: dict,
+            headers: dict[str, str]) -> Response:
+        record = self._next(method, data)
+        if self._timing:
+            await asyncio.sleep(record['latency'] / self._speed)
+        # the content is copied so the recorded response is never changed
+        content = json.loads(json.dumps(record['response']))
+        return Response(
+            record['status'],
+            content,
+            record.get('request_bytes', 0),
+            record.get('response_bytes', 0))
@@ -4,60 +4,169 @@ Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
 import base64
-from typing import Any
+import datetime
+from typing import Any, Callable
 from .key import Key
 from .timestampvalue import TimestampValue
+from .timestampvalue import format_timestamp
+
+# Type for a read time, see make_read_options()
+ReadTime = str | datetime.datetime | TimestampValue
 
 # Max string length in bytes. (strings are converted to blob values when larger
 # than _MAX_STRING_LENGTH)
 _MAX_STRING_LENGTH = 1500
 
 
+def _encode_blob(val: bytes) -> dict[str, Any]:
+    return {
+        'excludeFromIndexes': True,
+        'blobValue': base64.b64encode(val)
+        .replace(b'+', b'-')
+        .replace(b'/', b'_')
+        .rstrip(b'=')
+        .decode('utf-8')}
+
+
+def _encode_str(val: str) -> dict[str, Any]:
+    encoded = val.encode('utf-8')
+    if len(encoded) > _MAX_STRING_LENGTH:
+        return _encode_blob(encoded)
+    return {'stringValue': val}
+
+
+def _encode_array(val: list) -> dict[str, Any]:
+    return {'arrayValue': {'values': [value_to_dict(v) for v in val]}}
+
+
+def _encode_dict(val: dict) -> dict[str, Any]:
+    return {
+        'entityValue': {
+            'properties': {k: value_to_dict(v) for k, v in val.items()}}}
+
+
+def _decode_blob(blob: str | bytes) -> str | bytes:
+    if isinstance(blob, bytes):
+        return blob
+
+    eblob = blob.encode('utf-8')
+    pad = b'=' * (4 - len(eblob) % 4)
+    data = base64.b64decode(
+        (eblob + pad).replace(b'-', b'+').replace(b'_', b'/'))
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data  # fallback, just return as bytes
+
+
+def _decode_array(val: dict[str, Any]) -> list:
+    return [value_from_dict(v) for v in val.get('values', [])]
+
+
+def _decode_entity(val: dict[str, Any]) -> dict[str, Any]:
+    return {
+        k: value_from_dict(v)
+        for k, v in val.get('properties', {}).items()}
+
+
+# Encoders are looked up by the exact type of a value. Sub-classes of a
+# registered type are resolved once using the MRO and are cached afterwards.
+_ENCODERS: dict[type, Callable[[Any], dict[str, Any]]] = {
+    type(None): lambda _: {'nullValue': None},
+    bool: lambda val: {'booleanValue': val},
+    int: lambda val: {'integerValue': str(val)},
+    float: lambda val: {'doubleValue': val},
+    str: _encode_str,
+    Key: lambda val: {'keyValue': val.get_dict()},
+    list: _encode_array,
+    TimestampValue: lambda val: {'timestampValue': str(val)},
+    datetime.datetime: lambda val: {'timestampValue': format_timestamp(val)},
+    dict: _encode_dict,
+    bytes: _encode_blob,
+}
+
+# Scalar value types which are decoded by value_from_dict() before the
+# decoders are used, the decoders for these types cannot be replaced.
+_SCALARS = frozenset((
+    'nullValue',
+    'booleanValue',
+    'integerValue',
+    'doubleValue',
+    'stringValue',
+))
+
+# Decoders are looked up by the value type key, for example 'keyValue'.
+# Each decoder receives the value belonging to that key.
+_DECODERS: dict[str, Callable[[Any], Any]] = {
+    'keyValue': Key,
+    'arrayValue': _decode_array,
+    'timestampValue': TimestampValue._from_datastore,
+    'blobValue': _decode_blob,
+    'entityValue': _decode_entity,
+}
+
+# Registered types, used to restore the cache when a new encoder is added.
+_REGISTERED = dict(_ENCODERS)
+
+
+def register_encoder(
+        tp: type,
+        encoder: Callable[[Any], dict[str, Any]]) -> None:
+    """Register an encoder for values of type `tp`.
+
+    The encoder receives a value and must return a Datastore value
+    dictionary, for example:
+
+        register_encoder(Decimal, lambda val: {'stringValue': str(val)})
+
+    Sub-classes of `tp` use the same encoder unless they are registered
+    themselves.
+    """
+    _REGISTERED[tp] = encoder
+    _ENCODERS.clear()
+    _ENCODERS.update(_REGISTERED)
+
+
+def register_decoder(
+        value_type: str,
+        decoder: Callable[[Any], Any]) -> None:
+    """Register a decoder for a Datastore value type.
+
+    The decoder receives the value for the given value type key, for example:
+
+        register_decoder('timestampValue', parse_timestamp)
+
+    Note that this replaces the default decoder for the value type. The
+    decoders for null, boolean, integer, double and string values cannot be
+    replaced.
+    """
+    if value_type in _SCALARS:
+        raise ValueError(
+            'Cannot register a decoder for {!r}'.format(value_type))
+    _DECODERS[value_type] = decoder
+
+
+def _find_encoder(tp: type) -> Callable[[Any], dict[str, Any]]:
+    for base in tp.__mro__[1:]:
+        encoder = _REGISTERED.get(base)
+        if encoder is not None:
+            _ENCODERS[tp] = encoder
+            return encoder
+    raise TypeError('Unsupported type: {}'.format(tp))
+
+
 def value_to_dict(val: Any) -> dict[str, Any]:
-    if val is None:
-        return {'nullValue': None}
-    if isinstance(val, bool):
-        return {'booleanValue': val}
-    if isinstance(val, int):
-        return {'integerValue': str(val)}
-    if isinstance(val, float):
-        return {'doubleValue': val}
-    if isinstance(val, str):
-        encoded = val.encode('utf-8')
-        if len(encoded) > _MAX_STRING_LENGTH:
-            return {
-                'excludeFromIndexes': True,
-                'blobValue': base64.b64encode(encoded)
-                .replace(b'+', b'-')
-                .replace(b'/', b'_')
-                .rstrip(b'=')
-                .decode('utf-8')}
-        return {'stringValue': val}
-    if isinstance(val, Key):
-        return {'keyValue': val.get_dict()}  # type: ignore
-    if isinstance(val, list):
-        return {'arrayValue': {'values': [value_to_dict(v) for v in val]}}
-    if isinstance(val, TimestampValue):
-        return {'timestampValue': str(val)}
-    if isinstance(val, dict):
-        return {
-            'entityValue': {
-                'properties': {k: value_to_dict(v) for k, v in val.items()}}}
-    if isinstance(val, bytes):
-        return {
-            'excludeFromIndexes': True,
-            'blobValue': base64.b64encode(val)
-            .replace(b'+', b'-')
-            .replace(b'/', b'_')
-            .rstrip(b'=')
-            .decode('utf-8')}
-
-    raise TypeError('Unsupported type: {}'.format(type(val)))
+    encoder = _ENCODERS.get(val.__class__)
+    if encoder is None:
+        encoder = _find_encoder(val.__class__)
+    return encoder(val)
 
 
 def value_from_dict(val: dict[str, Any]) -> Any:
+    # scalar values are checked first and are decoded without a table
+    # lookup or an extra function call
     if 'nullValue' in val:
-        return None  # val['nullValue'] is None
+        return None
     if 'booleanValue' in val:
         return val['booleanValue']
     if 'integerValue' in val:
@@ -66,40 +175,43 @@ def value_from_dict(val: dict[str, Any]) -> Any:
         return val['doubleValue']
     if 'stringValue' in val:
         return val['stringValue']
-    if 'keyValue' in val:
-        return Key(val['keyValue'])
-    if 'arrayValue' in val:
-        return [
-            value_from_dict(v)
-            for v in val['arrayValue'].get('values', [])]
-    if 'timestampValue' in val:
-        return TimestampValue(val['timestampValue'])
-    if 'blobValue' in val:
-        blob = val['blobValue']
-        if isinstance(blob, bytes):
-            return blob
-
-        eblob = blob.encode('utf-8')
-        pad = b'=' * (4 - len(eblob) % 4)
-        data = base64.b64decode(
-            (eblob + pad).replace(b'-', b'+').replace(b'_', b'/'))
-        try:
-            return data.decode('utf-8')
-        except UnicodeDecodeError:
-            return data  # fallback, just return as bytes
-
-    if 'entityValue' in val:
-        return {
-            k: value_from_dict(v)
-            for k, v in val['entityValue'].get('properties', {}).items()}
+
+    for value_type in val:
+        decoder = _DECODERS.get(value_type)
+        if decoder is not None:
+            return decoder(val[value_type])
 
     raise TypeError('Unexpected or unsupported value: {}'.format(val))
 
 
-def make_read_options(transaction=None, eventual=True):
+def exclude_from_indexes(val: dict[str, Any]) -> dict[str, Any]:
+    """Mark a datastore value as excluded from indexes. An array value itself
+    cannot be excluded, so instead each value in the array is marked."""
+    array_value = val.get('arrayValue')
+    if array_value is None:
+        val['excludeFromIndexes'] = True
+    else:
+        for v in array_value.get('values', ()):
+            v['excludeFromIndexes'] = True
+    return val
+
+
+def make_read_options(transaction=None, eventual=True,
+                      read_time: ReadTime | None = None):
     """Reference:
         https://cloud.google.com/datastore/docs/reference/rest/v1/ReadOptions
+
+    When a read_time is given, entities are read as they were at that time.
+    Such reads are always consistent so eventual is ignored.
     """
+    if read_time is not None:
+        if transaction is not None:
+            raise ValueError(
+                'read_time cannot be combined with a transaction')
+        if not isinstance(read_time, TimestampValue):
+            read_time = TimestampValue(read_time)
+        return {'readTime': str(read_time)}
+
     read_options = {
         'readConsistency': 'EVENTUAL' if eventual else 'STRONG',
     }
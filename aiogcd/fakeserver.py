@@ -0,0 +1,680 @@
+"""fakeserver.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+
+In-process fake Datastore server for tests and benchmarks. The server speaks
+the same REST (JSON) API as Google Cloud Datastore and keeps all entities in
+memory. Latency, page sizes, errors and throttling can be configured.
+
+Example:
+
+    async with FakeDatastore(latency=0.005, page_size=100) as fake:
+        gcd = fake.connector('my-project')
+        await gcd.upsert_entities(entities)
+        ...
+
+The server can also run standalone, for example to be used with
+DATASTORE_EMULATOR_HOST:
+
+    python -m aiogcd.fakeserver --port 8081
+
+With grpcio and google-cloud-datastore installed the server can also serve
+the gRPC API (see start_grpc() and --grpc-port).
+"""
+import base64
+import json
+import time
+import random
+import asyncio
+import argparse
+import itertools
+import collections
+from typing import Any, Callable
+from aiohttp import web
+from .connector import GcdEmulatorConnector
+from .connector.grpctransport import GrpcTransport, METHODS, SERVICE
+from .connector.grpctransport import get_message_types, require_grpc
+from .connector.grpctransport import to_dict, to_message
+from .connector.entity import Entity
+from .connector.timestampvalue import parse_timestamp
+
+# Datastore limits.
+MAX_LOOKUP_KEYS = 1000
+MAX_MUTATIONS = 500
+
+# Responses of at least this number of bytes are compressed.
+COMPRESS_MIN_SIZE = 1024
+
+# Default maximum number of entities in one query batch or lookup response.
+DEFAULT_PAGE_SIZE = 300
+
+_CURSOR_PREFIX = b'fake:'
+
+_OPS = {
+    'EQUAL': lambda a, b: a == b,
+    'NOT_EQUAL': lambda a, b: a != b,
+    'LESS_THAN': lambda a, b: a < b,
+    'LESS_THAN_OR_EQUAL': lambda a, b: a <= b,
+    'GREATER_THAN': lambda a, b: a > b,
+    'GREATER_THAN_OR_EQUAL': lambda a, b: a >= b,
+}
+
+
+class FakeDatastoreError(Exception):
+
+    def __init__(self, code: int, status: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+
+    def get_dict(self) -> dict[str, Any]:
+        return {'error': {
+            'code': self.code,
+            'message': str(self),
+            'status': self.status,
+        }}
+
+
+def _invalid(message: str) -> FakeDatastoreError:
+    return FakeDatastoreError(400, 'INVALID_ARGUMENT', message)
+
+
+def _path_element(pair: dict) -> tuple:
+    """Returns a sortable path element, ids are sorted before names."""
+    if 'id' in pair:
+        return pair['kind'], 0, int(pair['id'])
+    if 'name' in pair:
+        return pair['kind'], 1, pair['name']
+    return pair['kind'], 2, None
+
+
+def _path(key: dict) -> tuple:
+    return tuple(_path_element(pair) for pair in key['path'])
+
+
+def _sort_value(value: dict) -> tuple:
+    """Returns a comparable tuple (type rank, value) for a value using the
+    Datastore order of value types."""
+    if 'nullValue' in value:
+        return 0, 0
+    if 'integerValue' in value:
+        return 1, int(value['integerValue'])
+    if 'timestampValue' in value:
+        return 1, parse_timestamp(value['timestampValue']).timestamp()
+    if 'booleanValue' in value:
+        return 2, value['booleanValue']
+    if 'blobValue' in value:
+        return 3, value['blobValue']
+    if 'stringValue' in value:
+        return 4, value['stringValue']
+    if 'doubleValue' in value:
+        return 5, float(value['doubleValue'])
+    if 'geoPointValue' in value:
+        point = value['geoPointValue']
+        return 6, (point.get('latitude', 0.0), point.get('longitude', 0.0))
+    if 'keyValue' in value:
+        key = value['keyValue']
+        return 7, (key['partitionId'].get('namespaceId', ''), _path(key))
+    return 8, json.dumps(value, sort_keys=True)
+
+
+def _encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(
+        _CURSOR_PREFIX + str(position).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode())
+        if not raw.startswith(_CURSOR_PREFIX):
+            raise ValueError
+        return int(raw[len(_CURSOR_PREFIX):])
+    except ValueError:
+        raise _invalid('Invalid cursor: {!r}'.format(cursor)) from None
+
+
+class FakeDatastore:
+
+    def __init__(
+            self,
+            page_size: int = DEFAULT_PAGE_SIZE,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            deferred_rate: float = 0.0,
+            max_rps: float | None = None,
+            seed: int | None = None):
+        """Initialize a fake Datastore server.
+
+        :param page_size: maximum number of entities in one query batch. A
+                          lookup defers the keys above this number.
+        :param latency: seconds to wait before each response
+        :param jitter: extra random latency between 0 and jitter seconds
+        :param error_rate: fraction of requests which fail with 503
+                           UNAVAILABLE (between 0.0 and 1.0)
+        :param deferred_rate: fraction of lookup keys which are deferred
+        :param max_rps: maximum requests per second, additional requests
+                        fail with 429 RESOURCE_EXHAUSTED
+        :param seed: random seed for repeatable jitter, errors and deferred
+                     keys
+        """
+        if page_size < 1:
+            raise ValueError('page_size must be at least 1')
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.deferred_rate = deferred_rate
+        self.max_rps = max_rps
+        self.requests: collections.Counter = collections.Counter()
+        self.errors: collections.Counter = collections.Counter()
+        self.endpoint: str | None = None
+        self.grpc_target: str | None = None
+
+        self._random = random.Random(seed)
+        self._entities: dict[tuple, dict] = {}
+        self._versions: dict[tuple, int] = {}
+        self._version = itertools.count(1)
+        self._ids = itertools.count(1)
+        self._tokens = max_rps or 0.0
+        self._refilled = time.monotonic()
+        self._runner: web.AppRunner | None = None
+        self._grpc_server: Any = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def __len__(self):
+        return len(self._entities)
+
+    def make_app(self) -> web.Application:
+        """Returns the aiohttp application, useful when the fake should be
+        part of another application."""
+        app = web.Application()
+        app.router.add_post('/v1/projects/{target}', self._handle)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start the server and return the endpoint. When port is 0 a free
+        port is used."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.endpoint = 'http://{}:{}'.format(host, port)
+        return self.endpoint
+
+    async def start_grpc(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start a gRPC server which uses the Datastore v1 protocol buffers
+        and return the target (host:port). The gRPC server shares the
+        entities with the REST server. Requires grpcio and
+        google-cloud-datastore."""
+        grpc = require_grpc()
+        handlers = {}
+        for method in METHODS:
+            name, request_type, response_type = get_message_types(method)
+            handlers[name] = grpc.unary_unary_rpc_method_handler(
+                self._grpc_handler(method, request_type, response_type))
+
+        server = grpc.aio.server()
+        server.add_generic_rpc_handlers((
+            grpc.method_handlers_generic_handler(SERVICE, handlers),))
+        port = server.add_insecure_port('{}:{}'.format(host, port))
+        await server.start()
+        self._grpc_server = server
+        self.grpc_target = '{}:{}'.format(host, port)
+        return self.grpc_target
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self.endpoint = None
+        if self._grpc_server is not None:
+            await self._grpc_server.stop(None)
+            self._grpc_server = None
+            self.grpc_target = None
+
+    def connector(
+            self,
+            project_id: str,
+            namespace_id: str | None = None) -> GcdEmulatorConnector:
+        """Returns a connector for this server, the server must be
+        started."""
+        if self.endpoint is None:
+            raise ValueError('The fake server is not started')
+        return GcdEmulatorConnector(
+            project_id,
+            namespace_id=namespace_id,
+            api_endpoint=self.endpoint)
+
+    def grpc_connector(
+            self,
+            project_id: str,
+            namespace_id: str | None = None) -> GcdEmulatorConnector:
+        """Returns a connector using the gRPC transport for this server, the
+        gRPC server must be started."""
+        if self.grpc_target is None:
+            raise ValueError('The fake gRPC server is not started')
+        return GcdEmulatorConnector(
+            project_id,
+            namespace_id=namespace_id,
+            transport=GrpcTransport(self.grpc_target, secure=False))
+
+    def put(self, *entities: Entity | dict):
+        """Store entities (Entity objects or entity dictionaries) without
+        using a request."""
+        for entity in entities:
+            if isinstance(entity, Entity):
+                entity = entity.get_dict()
+            self._store(entity)
+
+    def clear(self):
+        self._entities.clear()
+        self._versions.clear()
+
+    @staticmethod
+    def _id(key: dict) -> tuple:
+        partition = key['partitionId']
+        return (
+            partition['projectId'],
+            partition.get('namespaceId', ''),
+            _path(key))
+
+    def _store(self, entity: dict) -> int:
+        entity_id = self._id(entity['key'])
+        version = next(self._version)
+        self._entities[entity_id] = {
+            'key': entity['key'],
+            'properties': entity.get('properties', {})}
+        self._versions[entity_id] = version
+        return version
+
+    def _complete(self, key: dict) -> bool:
+        """Allocate an id for an incomplete key. Returns True if an id is
+        allocated."""
+        last = key['path'][-1]
+        if 'id' in last or 'name' in last:
+            return False
+        while True:
+            last['id'] = str(next(self._ids))
+            if self._id(key) not in self._entities:
+                return True
+
+    def _check_throttle(self):
+        if self.max_rps is None:
+            return
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.max_rps),
+            self._tokens + (now - self._refilled) * self.max_rps)
+        self._refilled = now
+        if self._tokens < 1.0:
+            raise FakeDatastoreError(
+                429, 'RESOURCE_EXHAUSTED', 'Too many requests')
+        self._tokens -= 1.0
+
+    async def _call(
+            self,
+            project_id: str,
+            method: str,
+            load: Callable[[], dict]) -> dict:
+        """Handle a request for both the REST and the gRPC server. The
+        function `load` returns the request data in the REST (JSON)
+        format."""
+        handler = getattr(self, '_{}'.format(method), None) \
+            if method in ('runQuery', 'lookup', 'commit', 'allocateIds') \
+            else None
+
+        self.requests[method] += 1
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0.0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        try:
+            if handler is None:
+                raise FakeDatastoreError(
+                    404, 'NOT_FOUND',
+                    'Method not found: {}'.format(method))
+            self._check_throttle()
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise FakeDatastoreError(
+                    503, 'UNAVAILABLE', 'Injected error')
+            return handler(project_id, load())
+        except FakeDatastoreError as e:
+            self.errors[e.status] += 1
+            raise
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        project_id, _, method = request.match_info['target'].partition(':')
+        body = await request.read()
+
+        def load():
+            try:
+                return json.loads(body)
+            except ValueError:
+                raise _invalid('Invalid JSON payload') from None
+
+        try:
+            content = await self._call(project_id, method, load)
+        except FakeDatastoreError as e:
+            return web.json_response(e.get_dict(), status=e.code)
+
+        # like Google Cloud Datastore, larger responses are compressed when
+        # the client accepts it (aiohttp decompresses gzip request bodies)
+        body = json.dumps(content).encode()
+        response = web.Response(body=body, content_type='application/json')
+        if len(body) >= COMPRESS_MIN_SIZE:
+            response.enable_compression()
+        return response
+
+    def _grpc_handler(
+            self,
+            method: str,
+            request_type: type,
+            response_type: type) -> Callable:
+        grpc = require_grpc()
+
+        async def handler(request: bytes, context) -> bytes:
+            message = request_type.FromString(request)
+            try:
+                content = await self._call(
+                    message.project_id, method, lambda: to_dict(message))
+            except FakeDatastoreError as e:
+                await context.abort(grpc.StatusCode[e.status], str(e))
+                raise  # context.abort() always raises
+            return to_message(content, response_type).SerializeToString()
+        return handler
+
+    def _runQuery(self, project_id: str, data: dict) -> dict:
+        query = data.get('query')
+        if query is None:
+            raise _invalid('Only query (not gqlQuery) is supported')
+
+        namespace = data.get('partitionId', {}).get('namespaceId', '')
+        kinds = query.get('kind', [])
+        if len(kinds) > 1:
+            raise _invalid('Only one kind is supported')
+        kind = kinds[0]['name'] if kinds else None
+
+        results = [
+            (entity_id, entity)
+            for entity_id, entity in self._entities.items()
+            if entity_id[0] == project_id and
+            entity_id[1] == namespace and
+            (kind is None or entity_id[2][-1][0] == kind)]
+
+        query_filter = query.get('filter')
+        if query_filter is not None:
+            results = [
+                result for result in results
+                if self._match(result[1], query_filter)]
+
+        results.sort(key=lambda result: result[0][2])
+        for order in reversed(query.get('order', [])):
+            name = order['property']['name']
+            reverse = order.get('direction') == 'DESCENDING'
+            pick = max if reverse else min
+            results = [
+                result for result in results
+                if self._values(result[1], name)]
+            results.sort(
+                key=lambda result: pick(
+                    _sort_value(v) for v in self._values(result[1], name)),
+                reverse=reverse)
+
+        position = 0
+        if 'startCursor' in query:
+            position = _decode_cursor(query['startCursor'])
+
+        offset = int(query.get('offset', 0))
+        skipped = min(offset, max(len(results) - position, 0))
+        position += skipped
+
+        size = self.page_size
+        limit = query.get('limit')
+        if limit is not None:
+            size = min(size, int(limit))
+        end = min(position + size, len(results))
+
+        projection = [
+            p['property']['name'] for p in query.get('projection', [])]
+        if projection == ['__key__']:
+            result_type = 'KEY_ONLY'
+        elif projection:
+            result_type = 'PROJECTION'
+        else:
+            result_type = 'FULL'
+
+        entity_results = []
+        for idx in range(position, end):
+            entity_id, entity = results[idx]
+            if result_type == 'KEY_ONLY':
+                entity = {'key': entity['key']}
+            elif result_type == 'PROJECTION':
+                properties = entity['properties']
+                entity = {'key': entity['key'], 'properties': {
+                    name: properties[name]
+                    for name in projection if name in properties}}
+            entity_results.append({
+                'entity': entity,
+                'version': str(self._versions[entity_id]),
+                'cursor': _encode_cursor(idx + 1),
+            })
+
+        if end >= len(results):
+            more_results = 'NO_MORE_RESULTS'
+        elif limit is not None and end - position == int(limit):
+            more_results = 'MORE_RESULTS_AFTER_LIMIT'
+        else:
+            more_results = 'NOT_FINISHED'
+
+        batch = {
+            'entityResultType': result_type,
+            'entityResults': entity_results,
+            'endCursor': _encode_cursor(end),
+            'moreResults': more_results,
+        }
+        if skipped:
+            batch['skippedResults'] = skipped
+        return {'batch': batch, 'query': query}
+
+    @staticmethod
+    def _values(entity: dict, name: str) -> list[dict]:
+        """Returns the indexed values of a property, an empty list if the
+        property is not found or excluded from indexes."""
+        if name == '__key__':
+            return [{'keyValue': entity['key']}]
+        value = entity['properties'].get(name)
+        if value is None or value.get('excludeFromIndexes'):
+            return []
+        if 'arrayValue' in value:
+            return [
+                v for v in value['arrayValue'].get('values', [])
+                if not v.get('excludeFromIndexes')]
+        return [value]
+
+    def _match(self, entity: dict, query_filter: dict) -> bool:
+        if 'compositeFilter' in query_filter:
+            composite = query_filter['compositeFilter']
+            matches = (
+                self._match(entity, f) for f in composite['filters'])
+            if composite.get('op', 'AND') == 'OR':
+                return any(matches)
+            return all(matches)
+
+        prop_filter = query_filter['propertyFilter']
+        name = prop_filter['property']['name']
+        op = prop_filter['op']
+        values = self._values(entity, name)
+        if not values:
+            return False
+
+        if op == 'HAS_ANCESTOR':
+            ancestor = _path(prop_filter['value']['keyValue'])
+            path = _path(entity['key'])
+            return path[:len(ancestor)] == ancestor
+
+        if op in ('IN', 'NOT_IN'):
+            options = {
+                _sort_value(v) for v in
+                prop_filter['value']['arrayValue'].get('values', [])}
+            found = any(_sort_value(v) in options for v in values)
+            return found if op == 'IN' else not found
+
+        compare = _OPS.get(op)
+        if compare is None:
+            raise _invalid('Unsupported operator: {}'.format(op))
+
+        rank, other = _sort_value(prop_filter['value'])
+        for value in values:
+            value_rank, value = _sort_value(value)
+            if op == 'EQUAL' or op == 'NOT_EQUAL':
+                if compare((value_rank, value), (rank, other)):
+                    return True
+            elif value_rank == rank and compare(value, other):
+                return True
+        return False
+
+    def _lookup(self, project_id: str, data: dict) -> dict:
+        keys = data.get('keys', [])
+        if len(keys) > MAX_LOOKUP_KEYS:
+            raise _invalid(
+                'Too many keys, the maximum is {}'.format(MAX_LOOKUP_KEYS))
+
+        found, missing, deferred = [], [], []
+        for idx, key in enumerate(keys):
+            if idx >= self.page_size or (
+                    idx and self.deferred_rate and
+                    self._random.random() < self.deferred_rate):
+                deferred.append(key)
+                continue
+
+            entity_id = self._id(key)
+            entity = self._entities.get(entity_id)
+            if entity is None:
+                missing.append({'entity': {'key': key}, 'version': '0'})
+            else:
+                found.append({
+                    'entity': entity,
+                    'version': str(self._versions[entity_id])})
+
+        content: dict[str, Any] = {}
+        if found:
+            content['found'] = found
+        if missing:
+            content['missing'] = missing
+        if deferred:
+            content['deferred'] = deferred
+        return content
+
+    def _commit(self, project_id: str, data: dict) -> dict:
+        mutations = data.get('mutations', [])
+        if len(mutations) > MAX_MUTATIONS:
+            raise _invalid(
+                'Too many mutations, the maximum is {}'
+                .format(MAX_MUTATIONS))
+
+        # validate all mutations before anything is changed
+        for mutation in mutations:
+            if len(mutation) != 1:
+                raise _invalid('Expecting one operation per mutation')
+            (op, value), = mutation.items()
+            if op == 'delete':
+                continue
+            if op not in ('insert', 'update', 'upsert'):
+                raise _invalid('Unsupported mutation: {}'.format(op))
+            last = value['key']['path'][-1]
+            complete = 'id' in last or 'name' in last
+            exists = complete and self._id(value['key']) in self._entities
+            if op == 'insert' and exists:
+                raise FakeDatastoreError(
+                    409, 'ALREADY_EXISTS', 'Entity already exists')
+            if op == 'update' and not exists:
+                raise FakeDatastoreError(
+                    404, 'NOT_FOUND', 'No entity to update')
+
+        mutation_results = []
+        for mutation in mutations:
+            (op, value), = mutation.items()
+            if op == 'delete':
+                entity_id = self._id(value)
+                self._entities.pop(entity_id, None)
+                self._versions.pop(entity_id, None)
+                mutation_results.append({'version': str(next(self._version))})
+                continue
+
+            value = dict(value, key=json.loads(json.dumps(value['key'])))
+            allocated = self._complete(value['key'])
+            result = {'version': str(self._store(value))}
+            if allocated:
+                result['key'] = value['key']
+            mutation_results.append(result)
+
+        return {
+            'mutationResults': mutation_results,
+            'indexUpdates': len(mutations),
+        }
+
+    def _allocateIds(self, project_id: str, data: dict) -> dict:
+        keys = [json.loads(json.dumps(key)) for key in data.get('keys', [])]
+        for key in keys:
+            if not self._complete(key):
+                raise _invalid('Key is already complete')
+        return {'keys': keys}
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog='python -m aiogcd.fakeserver',
+        description='Run an in-memory fake Datastore server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument(
+        '--grpc-port', type=int, default=None,
+        help='also serve the gRPC API on this port')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--deferred-rate', type=float, default=0.0)
+    parser.add_argument('--max-rps', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    fake = FakeDatastore(
+        page_size=args.page_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        deferred_rate=args.deferred_rate,
+        max_rps=args.max_rps,
+        seed=args.seed)
+
+    async def run():
+        print('Fake Datastore running on {}'.format(
+            await fake.start(args.host, args.port)))
+        if args.grpc_port is not None:
+            print('Fake Datastore gRPC running on {}'.format(
+                await fake.start_grpc(args.host, args.grpc_port)))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await fake.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
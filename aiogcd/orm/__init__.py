@@ -1,4 +1,6 @@
 from .model import GcdModel  # noqa: F401
+from .filter import Param  # noqa: F401
+from .prefetch import prefetch_related  # noqa: F401
 
 TRUE = True
 FALSE = False
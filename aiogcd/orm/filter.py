@@ -3,9 +3,84 @@
 Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Iterable, Optional
 from ..connector.key import Key
 from ..connector import GcdConnector
+from ..connector.columns import Columns
+from ..connector.profiling import MODELS, timed
+from ..connector.utils import ReadTime
+from ..connector.utils import value_to_dict
+from .prefetch import prefetch_related
+
+
+class Param:
+
+    def __init__(self, name: str):
+        """Placeholder for a value in a prepared filter.
+
+        Example:
+
+            query = User.prepare(User.name == Param('name'))
+            users = await query.bind(name='Alice').get_entities(gcd)
+
+        :param name: name which is used to bind the value
+        """
+        self.name = name
+
+    def __repr__(self):
+        return 'Param({!r})'.format(self.name)
+
+
+def _make_filter(filters: list[dict[str, Any]]) -> dict[str, Any]:
+    if len(filters) == 1:
+        return {
+            'propertyFilter': filters[0]
+        }
+    return {
+        'compositeFilter': {
+            'op': 'AND',
+            'filters': [{'propertyFilter': f} for f in filters]
+        }
+    }
+
+
+def _query_dict(model, filters: list[dict[str, Any]],
+                has_ancestor: Optional[Key],
+                key: Optional[Key]) -> dict[str, Any]:
+    if has_ancestor is not None:
+        assert isinstance(has_ancestor, Key), \
+            'Keyword argument \'has_ancestor\' should be of type ' \
+            '\'Key\' but found type {!r}' \
+            .format(has_ancestor.__class__.__name__)
+
+        filters.append({
+            'property': {'name': '__key__'},
+            'value': {'keyValue': has_ancestor.get_dict()},
+            'op': 'HAS_ANCESTOR'})
+
+    if key is not None:
+        assert isinstance(key, Key), \
+            'Keyword argument \'key\' should be of type \'Key\' ' \
+            'but found type {!r}' \
+            .format(key.__class__.__name__)
+        filters.append({
+            'property': {'name': '__key__'},
+            'value': {'keyValue': key.get_dict()},
+            'op': 'EQUAL'})
+
+    filter_dict: dict[str, Any] = {
+        'query': {'kind': [{'name': model.get_kind()}]}
+    }
+
+    if model.__namespace__:
+        filter_dict['partitionId'] = {
+            'namespaceId': model.__namespace__
+        }
+
+    if filters:
+        filter_dict['query']['filter'] = _make_filter(filters)
+
+    return filter_dict
 
 
 class Filter(dict):
@@ -14,53 +89,33 @@ class Filter(dict):
                  has_ancestor: Optional[Key] = None,
                  key: Optional[Key] = None):
 
+        for f in filters:
+            if isinstance(f.get('value'), Param):
+                raise TypeError(
+                    'Filter on property {!r} has an unbound parameter {!r}, '
+                    'use {}.prepare() for a filter with parameters.'
+                    .format(
+                        f['property']['name'],
+                        f['value'].name,
+                        model.__name__))
+
         self._model = model
         self._cursor = None
-        filters = list(filters)
-
-        if has_ancestor is not None:
-            assert isinstance(has_ancestor, Key), \
-                'Keyword argument \'has_ancestor\' should be of type ' \
-                '\'Key\' but found type {!r}' \
-                .format(has_ancestor.__class__.__name__)
-
-            filters.append({
-                'property': {'name': '__key__'},
-                'value': {'keyValue': has_ancestor.get_dict()},
-                'op': 'HAS_ANCESTOR'})
-
-        if key is not None:
-            assert isinstance(key, Key), \
-                'Keyword argument \'key\' should be of type \'Key\' ' \
-                'but found type {!r}' \
-                .format(key.__class__.__name__)
-            filters.append({
-                'property': {'name': '__key__'},
-                'value': {'keyValue': key.get_dict()},
-                'op': 'EQUAL'})
-
-        filter_dict: dict[str, Any] = {
-            'query': {'kind': [{'name': self._model.get_kind()}]}
-        }
-
-        if self._model.__namespace__:
-            filter_dict['partitionId'] = {
-                'namespaceId': self._model.__namespace__
-            }
+        self._prefetch: tuple = ()
+        self._prefetch_model: Any = None
+        super().__init__(
+            **_query_dict(model, list(filters), has_ancestor, key))
 
-        if len(filters) == 1:
-            filter_dict['query']['filter'] = {
-                'propertyFilter': filters[0]
-            }
-        elif len(filters) > 1:
-            filter_dict['query']['filter'] = {
-                'compositeFilter': {
-                    'op': 'AND',
-                    'filters': [{'propertyFilter': f} for f in filters]
-                }
-            }
-
-        super().__init__(**filter_dict)
+    @classmethod
+    def _from_dict(cls, model, filter_dict: dict[str, Any]):
+        """Create a filter from a ready to use query dictionary."""
+        result = cls.__new__(cls)
+        result._model = model
+        result._cursor = None
+        result._prefetch = ()
+        result._prefetch_model = None
+        dict.update(result, filter_dict)
+        return result
 
     def _set_start_cursor(self, start_cursor):
         if start_cursor:
@@ -107,59 +162,185 @@ class Filter(dict):
         ]
         return self
 
+    def prefetch(self, *props: Any, model: Any = None):
+        """Resolve the keys of the given KeyValue or ArrayValue properties for
+        all models in a result page using batched lookups.
+
+        Example:
+
+            posts = await Post.filter().prefetch(Post.owner).get_entities(gcd)
+            owner = posts[0].get_related(Post.owner)
+
+        See prefetch_related() for more information.
+        """
+        self._prefetch = props
+        self._prefetch_model = model
+        return self
+
     def limit(self, limit: int, start_cursor: Optional[str] = None):
         self._set_limit(limit)
         self._set_start_cursor(start_cursor)
         return self
 
-    async def get_entity(self, gcd: GcdConnector) -> Any:
+    async def get_entity(
+            self, gcd: GcdConnector,
+            eventual: bool = False,
+            read_time: Optional[ReadTime] = None) -> Any:
         """Return a GcdModel instance from the supplied filter.
 
         :param gcd: GcdConnector instance.
+        :param eventual: use eventual consistency (default is strong)
+        :param read_time: read the entity as it was at the given time
         :return: GcdModel object or None in case no entity was found.
         """
-        entity = await gcd.get_entity(self)
-        return None if entity is None else self._model(entity)
+        self['query']['limit'] = 1
+        results, _ = await gcd._run_query(self, eventual, read_time)
+        if not results:
+            return None
+
+        model = timed(
+            MODELS, self._model._from_entity_res, results[0]['entity'])
+        if self._prefetch:
+            await prefetch_related(
+                gcd, [model], *self._prefetch,
+                model=self._prefetch_model,
+                eventual=eventual, read_time=read_time)
+        return model
 
     async def get_entities(
             self, gcd: GcdConnector, offset: Optional[int] = None,
-            limit: Optional[int] = None) -> list[Any]:
+            limit: Optional[int] = None,
+            eventual: bool = False,
+            read_time: Optional[ReadTime] = None) -> list[Any]:
         """Returns a list containing GcdModel instances from the supplied
         filter.
 
         :param gcd: GcdConnector instance.
         :param offset: integer to specify how many rows to skip
         :param limit: integer to specify max number of rows to return
+        :param eventual: use eventual consistency (default is strong)
+        :param read_time: read the entities as they were at the given time
         :return: list containing GcdModel objects.
         """
         self._set_offset(offset)
         self._set_limit(limit)
-        entities, cursor = await gcd._get_entities_cursor(self)
+        results, cursor = await gcd._run_query(self, eventual, read_time)
         self._cursor = cursor
         # TODO return type should be list[Type[GcdModel]]
-        return [self._model(ent) for ent in entities]
+        models = timed(MODELS, self._make_models, results)
+        if self._prefetch:
+            await prefetch_related(
+                gcd, models, *self._prefetch,
+                model=self._prefetch_model,
+                eventual=eventual, read_time=read_time)
+        return models
+
+    async def iter(
+            self, gcd: GcdConnector,
+            batch_size: Optional[int] = None,
+            start_cursor: Optional[str] = None,
+            eventual: bool = False,
+            read_time: Optional[ReadTime] = None) -> AsyncIterator[Any]:
+        """Iterate over GcdModel instances from the supplied filter. Results
+        are requested page by page, so only one page is kept in memory.
+
+        Example:
+
+            async for user in User.filter().iter(gcd, batch_size=500):
+                ...
+
+        While iterating, the filter cursor points after the last model which
+        is returned and can be used as start_cursor to resume a query. When
+        the datastore does not return a cursor for each result, the cursor
+        is only updated after each page and resuming might return some
+        models again.
+
+        :param gcd: GcdConnector instance.
+        :param batch_size: integer to specify the max number of results in
+                           one page (by default the datastore decides)
+        :param start_cursor: cursor to resume from
+        :param eventual: use eventual consistency (default is strong)
+        :param read_time: read the entities as they were at the given time,
+                          this gives a consistent snapshot over all pages
+        """
+        data: dict[str, Any] = self
+        if start_cursor:
+            if not isinstance(start_cursor, str):
+                raise TypeError(
+                    'start_cursor is expected to be str, {} passed'.format(
+                        type(start_cursor)))
+            # the start cursor is only used for this iteration
+            data = dict(self, query=dict(
+                self['query'], startCursor=start_cursor))
+
+        async for entity_results, cursor in gcd._iter_query_pages(
+                data, batch_size, eventual, read_time):
+            models = timed(MODELS, self._make_models, entity_results)
+            if self._prefetch:
+                await prefetch_related(
+                    gcd, models, *self._prefetch,
+                    model=self._prefetch_model,
+                    eventual=eventual, read_time=read_time)
+
+            for model, result in zip(models, entity_results):
+                # the cursor is updated before the model is returned so it
+                # is correct when the loop is stopped using break
+                if 'cursor' in result:
+                    self._cursor = result['cursor']
+                yield model
+            self._cursor = cursor
+
+    def _make_models(self, results: list[dict]) -> list[Any]:
+        from_entity_res = self._model._from_entity_res
+        return [from_entity_res(result['entity']) for result in results]
+
+    async def get_columns(
+            self, gcd: GcdConnector,
+            properties: Optional[Iterable[str]] = None,
+            eventual: bool = False,
+            read_time: Optional[ReadTime] = None) -> Columns:
+        """Returns the query results in a column oriented container. No model
+        instances are created.
 
-    async def get_key(self, gcd: GcdConnector):
+        :param gcd: GcdConnector instance.
+        :param properties: only include the given properties (by default
+                           all properties are included)
+        :param eventual: use eventual consistency (default is strong)
+        :param read_time: read the entities as they were at the given time
+        :return: Columns object.
+        """
+        return await gcd.get_columns(self, properties, eventual, read_time)
+
+    async def get_key(
+            self, gcd: GcdConnector,
+            eventual: bool = False,
+            read_time: Optional[ReadTime] = None):
         """Return a Gcd key from the supplied filter.
 
         :param gcd: GcdConnector instance.
+        :param eventual: use eventual consistency (default is strong)
+        :param read_time: read the key as it was at the given time
         :return: GcdModel key or None in case no entity was found.
         """
-        return await gcd.get_key(self)
+        return await gcd.get_key(self, eventual, read_time)
 
     async def get_keys(
             self, gcd: GcdConnector, offset: Optional[int] = None,
-            limit: Optional[int] = None) -> list[Key]:
+            limit: Optional[int] = None,
+            eventual: bool = False,
+            read_time: Optional[ReadTime] = None) -> list[Key]:
         """Returns a list containing Gcd keys from the supplied filter.
 
         :param gcd: GcdConnector instance.
         :param offset: integer to specify how many keys to skip
         :param limit: integer to specify max number of keys to return
+        :param eventual: use eventual consistency (default is strong)
+        :param read_time: read the keys as they were at the given time
         :return: list containing Gcd key objects.
         """
         self._set_offset(offset)
         self._set_limit(limit)
-        return await gcd.get_keys(self)
+        return await gcd.get_keys(self, eventual, read_time)
 
     def set_offset_limit(self, offset: int, limit: int):
         """Set offset and limit for Filter query.
@@ -170,3 +351,86 @@ class Filter(dict):
         self._set_offset(offset)
         self._set_limit(limit)
         return True
+
+
+class PreparedFilter:
+
+    def __init__(self, model, *filters,
+                 has_ancestor: Optional[Key] = None,
+                 key: Optional[Key] = None):
+        """Initialize a prepared filter. The query is compiled once and values
+        for Param() placeholders are bound for each execution. Each call to
+        bind() returns a new Filter which shares the compiled query parts.
+
+        Example:
+
+            query = User.prepare(
+                User.name == Param('name'),
+                User.age > Param('age')).order_by(User.age.ascending)
+
+            users = await query.bind(name='Bob', age=3).get_entities(gcd)
+        """
+        self._model = model
+        self._template = Filter._from_dict(
+            model, _query_dict(model, list(filters), has_ancestor, key))
+
+        query_filter = self._template['query'].get('filter')
+        if query_filter is None:
+            self._filters = []
+        elif 'propertyFilter' in query_filter:
+            self._filters = [query_filter['propertyFilter']]
+        else:
+            self._filters = [
+                f['propertyFilter']
+                for f in query_filter['compositeFilter']['filters']]
+
+        props = model.model_props
+        self._params = [
+            (idx, f['value'].name, props.get(f['property']['name']))
+            for idx, f in enumerate(self._filters)
+            if isinstance(f['value'], Param)]
+        self._names = frozenset(name for _, name, _ in self._params)
+
+    @property
+    def params(self) -> frozenset[str]:
+        return self._names
+
+    def order_by(self, *order: Any):
+        self._template.order_by(*order)
+        return self
+
+    def limit(self, limit: int):
+        self._template._set_limit(limit)
+        return self
+
+    def prefetch(self, *props: Any, model: Any = None):
+        self._template.prefetch(*props, model=model)
+        return self
+
+    def bind(self, **params: Any) -> Filter:
+        """Returns a new Filter with the given values for the parameters."""
+        if params.keys() != self._names:
+            raise TypeError(
+                'Expecting parameters {} but received {}.'
+                .format(sorted(self._names), sorted(params)))
+
+        template = self._template
+        filter_dict = dict(template)
+        query = filter_dict['query'] = dict(template['query'])
+
+        if 'partitionId' in filter_dict:
+            filter_dict['partitionId'] = dict(filter_dict['partitionId'])
+
+        if self._params:
+            filters = list(self._filters)
+            for idx, name, prop in self._params:
+                value = params[name]
+                if prop is not None:
+                    prop.check_compare(value)
+                filters[idx] = dict(filters[idx], value=value_to_dict(value))
+            query['filter'] = _make_filter(filters)
+
+        result = Filter._from_dict(self._model, filter_dict)
+        result._prefetch = template._prefetch
+        result._prefetch_model = template._prefetch_model
+        return result
@@ -3,13 +3,35 @@
 Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
-from typing import Any, Optional
+import itertools
+from typing import Any, Callable, Iterable, Optional, cast
 from ..connector.entity import Entity
 from ..orm.properties.value import Value
 from ..connector import GcdConnector
 from ..connector.key import Key
+from ..connector.profiling import MODELS, timed
 from .filter import Filter
+from .filter import PreparedFilter
+from .prefetch import register_model
+from .utils import run_chunks
 from ..connector.timestampvalue import TimestampValue
+from ..connector.utils import ReadTime
+from ..connector.utils import exclude_from_indexes
+from ..connector.utils import value_from_dict
+from ..connector.utils import value_to_dict
+
+# Datastore limits for a single lookup and commit request.
+_MAX_LOOKUP_KEYS = 1000
+_MAX_MUTATIONS = 500
+
+# Default number of concurrent requests for batch operations.
+_CONCURRENCY = 4
+
+
+def _unindexed(encode):
+    def encode_unindexed(value):
+        return exclude_from_indexes(encode(value))
+    return encode_unindexed
 
 
 class _PropertyClass(dict):
@@ -39,8 +61,31 @@ class _ModelClass(type):
         return _PropertyClass()
 
     def __new__(mcs, name, *args, **kwargs):
-        result = super().__new__(mcs, name, *args, **kwargs)
+        result = cast(
+            'type[GcdModel]', super().__new__(mcs, name, *args, **kwargs))
         result.__class__.__name__ = name
+
+        # Pre-compile the decoder and encoder functions for each property so
+        # values do not need a generic type lookup when reading or writing.
+        result._decoders = {
+            prop_name: prop.decode
+            for prop_name, prop in result.model_props.items()}
+        result._encoders = {
+            prop_name: prop.encode
+            for prop_name, prop in result.model_props.items()}
+
+        result._unindexed = frozenset(
+            prop_name for prop_name, prop in result.model_props.items()
+            if not (result.__indexed__ if prop.indexed is None
+                    else prop.indexed))
+
+        for prop_name in result._unindexed:
+            result._encoders[prop_name] = _unindexed(
+                result._encoders[prop_name])
+
+        if any(isinstance(base, _ModelClass) for base in args[0]):
+            # GcdModel itself is not registered
+            register_model(result)
         return result
 
 
@@ -56,6 +101,13 @@ class GcdModel(Entity, metaclass=_ModelClass):
 """
     __kind__ = None
     __namespace__ = None
+    __indexed__ = True
+
+    # Set by the meta class for each model.
+    model_props: dict[str, Value]
+    _decoders: dict[str, Callable[[dict[str, Any]], Any]]
+    _encoders: dict[str, Callable[[Any], dict[str, Any]]]
+    _unindexed: frozenset[str]
 
     def __init__(self, entity=None, key=None, **template):
         """Initialize a GcdModel.
@@ -71,7 +123,7 @@ class GcdModel(Entity, metaclass=_ModelClass):
 
         if entity is not None:
             assert key is None and len(template) == 0, self.BASE_MODEL_INIT
-            self.__dict__.update(entity.__dict__)
+            vars(self).update(entity.__dict__)
             props -= set(self.__dict__.keys())
 
         else:
@@ -84,6 +136,36 @@ class GcdModel(Entity, metaclass=_ModelClass):
                     props.remove(name)
                     setattr(self, name, value)
 
+        self._check_kind()
+        self._set_missing(props)
+
+    @classmethod
+    def _from_entity_res(cls, entity_res: dict):
+        """Create a model instance directly from an entity result as returned
+        by the datastore. (a shortcut for cls(Entity(entity_res)))
+
+        :param entity_res: entity dictionary, see Entity.__init__()
+        """
+        model = cls.__new__(cls)
+        data = vars(model)
+        data['key'] = Key(entity_res['key'])
+        model._check_kind()
+
+        properties = entity_res.get('properties', {})
+        data['_properties'] = set(properties)
+        data['_changed'] = False
+        decoders = cls._decoders
+
+        for prop, val in properties.items():
+            decode = decoders.get(prop)
+            data[prop] = value_from_dict(val) if decode is None \
+                else decode(val)
+
+        model._set_missing(decoders.keys() - properties.keys())
+
+        return model
+
+    def _check_kind(self):
         if self.__kind__ != self.key.kind:
             raise TypeError(
                 'Expecting kind {expect!r} for model {model} but got {got!r}. '
@@ -94,34 +176,64 @@ class GcdModel(Entity, metaclass=_ModelClass):
                     model=self.__class__.__name__,
                     got=self.key.kind))
 
-        for prop in props:
-            prop = self.model_props[prop]
+    def _set_missing(self, props):
+        """Set default values for the given properties."""
+        for name in props:
+            prop = self.model_props[name]
             if prop.default is not None:
                 setattr(
                     self,
-                    prop.name,
+                    name,
                     prop.default() if callable(prop.default) else prop.default)
             elif prop.required:
                 raise TypeError(
-                    'Missing required property: {}'.format(prop.name))
+                    'Missing required property: {}'.format(name))
             else:
-                super().__setattr__(prop.name, None)
+                super().__setattr__(name, None)
 
     def __new__(mcs, *args, **kwargs):  # type: ignore
         if getattr(mcs, '__kind__') is None:
             mcs.__kind__ = mcs.__name__
         return super().__new__(mcs)
 
-    def __getattribute__(self, key):
-        if key != 'model_props' and key in self.model_props:
-            return self.model_props[key].get_value(self)
-        return super().__getattribute__(key)
-
-    def __setattr__(self, key, value):
-        if key in self.model_props:
-            self.model_props[key].set_value(self, value)
+    def __setattr__(self, name: str, value: Any):
+        """Model properties are set using the property descriptor, which
+        checks the value and tracks the change. Other attributes, for example
+        new properties when ALLOW_NEW_PROPERTIES is True, are set (and
+        tracked) by Entity."""
+        if name in self.model_props:
+            object.__setattr__(self, name, value)
         else:
-            super().__setattr__(key, value)
+            super().__setattr__(name, value)
+
+    def get_dict(self):
+        """Returns dictionary object which can be used to insert, upsert or
+        update the model in the google cloud datastore."""
+        data = self.__dict__
+        encoders = self._encoders
+        return {
+            'key': self.key.get_dict(),
+            'properties': {
+                prop: encoders.get(prop, value_to_dict)(data[prop])
+                for prop in self._properties
+            }
+        }
+
+    def get_related(self, prop):
+        """Returns the resolved model(s) for a KeyValue or ArrayValue property
+        which is prefetched using Filter.prefetch() or prefetch_related().
+
+        For a KeyValue property the model is returned, or None if the key was
+        not found. For an ArrayValue property a list is returned.
+
+        :param prop: property or property name
+        """
+        name = prop if isinstance(prop, str) else prop.name
+        try:
+            return self.__dict__['__related__{}'.format(name)]
+        except KeyError:
+            raise ValueError(
+                'Property {!r} is not prefetched'.format(name)) from None
 
     def set_property(self, prop, value):
         if prop in self.model_props:
@@ -149,6 +261,18 @@ class GcdModel(Entity, metaclass=_ModelClass):
             has_ancestor=has_ancestor,
             key=key)
 
+    @classmethod
+    def prepare(cls, *filters: dict[str, Any],
+                has_ancestor: Optional[Key] = None,
+                key: Optional[Key] = None):
+        """Returns a PreparedFilter. Use Param() placeholders for values which
+        are bound for each execution using PreparedFilter.bind()."""
+        return PreparedFilter(
+            cls,
+            *filters,
+            has_ancestor=has_ancestor,
+            key=key)
+
     @classmethod
     def get_kind(cls):
         if cls.__kind__ is None:
@@ -158,8 +282,112 @@ class GcdModel(Entity, metaclass=_ModelClass):
     @classmethod
     async def get_entities(cls, gcd: GcdConnector,
                            offset: Optional[int] = None,
-                           limit: Optional[int] = None):
-        return await Filter(cls).get_entities(gcd, offset, limit)
+                           limit: Optional[int] = None,
+                           eventual: bool = False,
+                           read_time: Optional[ReadTime] = None):
+        return await Filter(cls).get_entities(
+            gcd, offset, limit, eventual, read_time)
+
+    @classmethod
+    def _check_keys(cls, keys: Iterable[Key]):
+        kind = cls.get_kind()
+        for key in keys:
+            if not isinstance(key, Key):
+                raise TypeError(
+                    'Expecting a value of type \'Key\' but received type '
+                    '{!r}.'.format(key.__class__.__name__))
+            if key.kind != kind:
+                raise TypeError(
+                    'Expecting kind {!r} for model {} but got key {!r} with '
+                    'kind {!r}.'
+                    .format(kind, cls.__name__, key, key.kind))
+
+    @classmethod
+    async def get_many(cls, gcd: GcdConnector, keys: Iterable[Key],
+                       eventual: bool = False,
+                       chunk_size: int = _MAX_LOOKUP_KEYS,
+                       concurrency: int = _CONCURRENCY,
+                       read_time: Optional[ReadTime] = None) -> list[Any]:
+        """Returns model instances for the given keys. The returned list has
+        the same order as the given keys and contains None for each key which
+        is not found.
+
+        :param gcd: GcdConnector instance.
+        :param keys: Key objects, all with the kind of this model.
+        :param eventual: use eventual consistency (default is strong)
+        :param chunk_size: maximum number of keys in one lookup request
+        :param concurrency: maximum number of concurrent lookup requests
+        :param read_time: read the entities as they were at the given time
+        :return: list containing GcdModel objects (or None).
+        """
+        keys = list(keys)
+        cls._check_keys(keys)
+
+        async def lookup(chunk):
+            return await gcd._lookup(
+                chunk, eventual=eventual, read_time=read_time)
+
+        def make_models(chunks):
+            found = {}
+            for results in chunks:
+                for entity_res in results:
+                    model = cls._from_entity_res(entity_res)
+                    found[model.key.ks] = model
+            return [found.get(key.ks) for key in keys]
+
+        return timed(
+            MODELS,
+            make_models,
+            await run_chunks(lookup, keys, chunk_size, concurrency))
+
+    @classmethod
+    async def put_many(cls, gcd: GcdConnector, models: Iterable[Any],
+                       chunk_size: int = _MAX_MUTATIONS,
+                       concurrency: int = _CONCURRENCY) -> tuple[bool, ...]:
+        """Upsert the given model instances. Keys without a name or id are
+        updated with the key which is allocated by the datastore.
+
+        Returns a tuple containing boolean values in the same order as the
+        given models. See GcdConnector.upsert_entities().
+
+        :param gcd: GcdConnector instance.
+        :param models: instances of this model.
+        :param chunk_size: maximum number of mutations in one commit
+        :param concurrency: maximum number of concurrent commits
+        :return: tuple containing boolean values
+        """
+        models = list(models)
+        for model in models:
+            if not isinstance(model, cls):
+                raise TypeError(
+                    'Expecting an instance of {} but received type {!r}.'
+                    .format(cls.__name__, model.__class__.__name__))
+
+        results = await run_chunks(
+            gcd.upsert_entities, models, chunk_size, concurrency)
+        return tuple(itertools.chain.from_iterable(results))
+
+    @classmethod
+    async def delete_many(cls, gcd: GcdConnector, keys: Iterable[Key],
+                          chunk_size: int = _MAX_MUTATIONS,
+                          concurrency: int = _CONCURRENCY) -> \
+            tuple[bool, ...]:
+        """Delete the entities for the given keys.
+
+        Returns a tuple containing boolean values in the same order as the
+        given keys. See GcdConnector.delete_keys().
+
+        :param gcd: GcdConnector instance.
+        :param keys: Key objects, all with the kind of this model.
+        :param chunk_size: maximum number of mutations in one commit
+        :param concurrency: maximum number of concurrent commits
+        :return: tuple containing boolean values
+        """
+        keys = list(keys)
+        cls._check_keys(keys)
+        results = await run_chunks(
+            gcd.delete_keys, keys, chunk_size, concurrency)
+        return tuple(itertools.chain.from_iterable(results))
 
     def serializable_dict(self, key_as: Optional[str] = None,
                           include_none: bool = False):
@@ -170,11 +398,11 @@ class GcdModel(Entity, metaclass=_ModelClass):
         :param include_none: If include_none is set to True, None values will
                              be included in the dict. (default is False)
         """
-        data = {
-            prop.name: self._serialize_value(prop.get_value(self))
-            for prop in self.model_props.values()
-            if include_none or prop.get_value(self) is not None
-        }
+        data = {}
+        for prop in self.model_props.values():
+            value = prop.get_value(self)
+            if include_none or value is not None:
+                data[prop.name] = self._serialize_value(value)
 
         if isinstance(key_as, str):
             data[key_as] = self.key.ks
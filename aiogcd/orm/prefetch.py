@@ -0,0 +1,120 @@
+"""prefetch.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+from typing import Any, Iterable
+from ..connector import GcdConnector
+from ..connector.entity import Entity
+from ..connector.key import Key
+from ..connector.utils import ReadTime
+from .utils import run_chunks
+
+# Maximum number of keys in one lookup request.
+_MAX_LOOKUP_KEYS = 1000
+
+# Model classes by kind, used to create the resolved models.
+_models: dict[str, Any] = {}
+
+
+def register_model(model: Any):
+    """Register a model class which is used for resolving keys of the model
+    kind. This is done automatically for each GcdModel class. When more than
+    one model exists for a kind, the last registered model is used unless
+    the model is given to prefetch_related()."""
+    kind = getattr(model, '__kind__', None) or model.__name__
+    _models[kind] = model
+
+
+def _get_keys(value) -> Iterable[Key]:
+    if isinstance(value, Key):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, Key):
+                yield item
+
+
+def _resolve(value, found):
+    if isinstance(value, Key):
+        return found.get(value.ks)
+    if isinstance(value, list):
+        return [
+            found.get(item.ks) if isinstance(item, Key) else item
+            for item in value]
+    return None
+
+
+async def prefetch_related(
+        gcd: GcdConnector,
+        models: Iterable[Any],
+        *props: Any,
+        model: Any = None,
+        eventual: bool = False,
+        read_time: ReadTime | None = None,
+        concurrency: int = 4):
+    """Resolve the keys of the given properties for all models at once.
+
+    The keys of all models are collected, duplicates are removed and the
+    entities are fetched using batched lookups. Resolved entities are created
+    as the given model for entities of the model kind, as the model registered
+    for their kind or as Entity if no model exists. The resolved entities can
+    be read using model.get_related(prop).
+
+    Example:
+
+        class Post(GcdModel):
+            owner = KeyValue()
+            tags = ArrayValue(accept=(Key,))
+
+        posts = await Post.filter().get_entities(gcd)
+        await prefetch_related(gcd, posts, Post.owner, Post.tags)
+
+        for post in posts:
+            owner = post.get_related(Post.owner)  # model or None
+            tags = post.get_related(Post.tags)  # list with models
+
+        # resolve the owners as User, also if another model for the same
+        # kind is defined
+        await prefetch_related(gcd, posts, Post.owner, model=User)
+
+    :param gcd: GcdConnector instance.
+    :param models: GcdModel instances.
+    :param props: KeyValue or ArrayValue properties, or property names.
+    :param model: GcdModel class for the entities of the model kind
+    :param eventual: use eventual consistency (default is strong)
+    :param read_time: read the entities as they were at the given time
+    :param concurrency: maximum number of concurrent lookup requests
+    """
+    models = list(models)
+    names = [prop if isinstance(prop, str) else prop.name for prop in props]
+
+    keys = {}
+    for instance in models:
+        data = instance.__dict__
+        for name in names:
+            for key in _get_keys(data.get(name)):
+                keys[key.ks] = key
+
+    async def lookup(chunk):
+        return await gcd._lookup(
+            chunk, eventual=eventual, read_time=read_time)
+
+    kinds = _models
+    if model is not None:
+        kinds = dict(_models)
+        kinds[model.get_kind()] = model
+
+    found = {}
+    for results in await run_chunks(
+            lookup, list(keys.values()), _MAX_LOOKUP_KEYS, concurrency):
+        for entity_res in results:
+            kind = entity_res['key']['path'][-1]['kind']
+            entity = kinds.get(kind, Entity)._from_entity_res(entity_res)
+            found[entity.key.ks] = entity
+
+    for instance in models:
+        data = instance.__dict__
+        for name in names:
+            data['__related__{}'.format(name)] = \
+                _resolve(data.get(name), found)
@@ -14,3 +14,5 @@ from .anyvalue import AnyValue  # noqa: F401
 from .datetimevalue import DatetimeValue  # noqa: F401
 from .entityvalue import EntityValue  # noqa: F401
 from .bytesvalue import BytesValue  # noqa: F401
+from .compressedbytesvalue import CompressedBytesValue  # noqa: F401
+from .compressedjsonvalue import CompressedJsonValue  # noqa: F401
@@ -8,7 +8,8 @@ from .value import Value
 
 class AnyValue(Value):
 
-    def __init__(self, default=None, required=True, accept=None):
+    def __init__(self, default=None, required=True, accept=None,
+                 indexed=None):
         """Initialize a mapped property.
 
         When 'accept' is None any type is accepted. A tuple can be
@@ -17,9 +18,11 @@ class AnyValue(Value):
         :param default: default value, all types allowed
         :param required: boolean
         :param accept: None or tuple
+        :param indexed: boolean or None (see Value)
         """
         self._accept = accept
-        super().__init__(default=default, required=required)
+        super().__init__(
+            default=default, required=required, indexed=indexed)
 
     def check_value(self, value):
         if self._accept and not isinstance(value, self._accept):
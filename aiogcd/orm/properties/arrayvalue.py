@@ -9,7 +9,8 @@ from ..utils import ProtectedList
 
 class ArrayValue(Value):
 
-    def __init__(self, default=None, required=True, accept=None):
+    def __init__(self, default=None, required=True, accept=None,
+                 indexed=None):
         """Initialize an array property.
 
         When 'accept' is None any type in the list is accepted. A tuple can be
@@ -23,9 +24,11 @@ class ArrayValue(Value):
         :param default: list or None
         :param required: boolean
         :param accept: None or tuple
+        :param indexed: boolean or None (see Value)
         """
         self._accept = accept
-        super().__init__(default=default, required=required)
+        super().__init__(
+            default=default, required=required, indexed=indexed)
 
     def check_value(self, value):
         if not isinstance(value, (list, tuple)):
@@ -57,6 +60,30 @@ class ArrayValue(Value):
             raise TypeError('Invalid type {!r} for array property {!r}.'
                             .format(value.__class__.__name__, self.name))
 
+    def _on_change(self, model):
+        related = '__related__{}'.format(self.name)
+
+        def on_change():
+            # prefetched models are no longer valid for the changed keys
+            model.__dict__.pop(related, None)
+            model._mark_changed()
+        return on_change
+
     def set_value(self, model, value):
         self.check_value(value)
-        super().set_value(model, ProtectedList(value, protect=self._protect))
+        model.__dict__.pop('__related__{}'.format(self.name), None)
+        super().set_value(model, ProtectedList(
+            value,
+            protect=self._protect,
+            on_change=self._on_change(model)))
+
+    def get_value(self, model):
+        value = model.__dict__.get(self.name, None)
+        if value.__class__ is list:
+            # Lists which are read from the datastore are wrapped on first
+            # access so changes to the list are tracked.
+            value = model.__dict__[self.name] = ProtectedList(
+                value,
+                protect=self._protect,
+                on_change=self._on_change(model))
+        return value
@@ -3,6 +3,7 @@
 Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
+from ...connector.utils import value_from_dict
 from .value import Value
 
 
@@ -18,3 +19,12 @@ class BooleanValue(Value):
     def set_value(self, model, value):
         self.check_value(value)
         super().set_value(model, value)
+
+    def encode(self, value):
+        if value is None:
+            return {'nullValue': None}
+        return {'booleanValue': value}
+
+    def decode(self, val):
+        value = val.get('booleanValue')
+        return value_from_dict(val) if value is None else value
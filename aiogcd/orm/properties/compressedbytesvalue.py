@@ -0,0 +1,66 @@
+"""compressedbytesvalue.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import zlib
+from .bytesvalue import BytesValue
+
+
+def decompress(data: str | bytes) -> bytes:
+    """Decompress a stored value. Blob values which happen to be valid UTF-8
+    are read from the datastore as str and are encoded back to bytes.
+
+    Values which are not compressed (values below the threshold or values
+    written before the property was compressed) are returned as they are.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return data
+
+
+class CompressedBytesValue(BytesValue):
+
+    def __init__(self, default=None, required=True, level=-1, threshold=0):
+        """Initialize a compressed bytes property.
+
+        The value is compressed using zlib and stored as an unindexed blob.
+        The value is decompressed when read for the first time. Values which
+        are smaller than `threshold` bytes are stored uncompressed.
+
+        :param default: bytes or None
+        :param required: boolean
+        :param level: zlib compression level (-1 is the zlib default)
+        :param threshold: minimal size in bytes for a value to be compressed
+        """
+        self._level = level
+        self._threshold = threshold
+        super().__init__(
+            default=default, required=required, indexed=False)
+
+    def set_value(self, model, value):
+        self.check_value(value)
+        model.__dict__['__orig__{}'.format(self.name)] = value
+        if len(value) >= self._threshold:
+            value = zlib.compress(value, self._level)
+        super().set_value(model, value)
+
+    def get_value(self, model):
+        key = '__orig__{}'.format(self.name)
+
+        if key not in model.__dict__:
+            data = model.__dict__.get(self.name)
+            if data is None:
+                return None
+            try:
+                model.__dict__[key] = decompress(data)
+            except Exception as e:
+                raise Exception(
+                    'Error reading property {!r} '
+                    '(see above exception for more info).'
+                    .format(self.name)) from e
+
+        return model.__dict__[key]
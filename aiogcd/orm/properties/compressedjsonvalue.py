@@ -0,0 +1,64 @@
+"""compressedjsonvalue.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import json
+import zlib
+from .compressedbytesvalue import decompress
+from .jsonvalue import JsonValue
+from .value import Value
+
+
+class CompressedJsonValue(JsonValue):
+
+    def __init__(self, default=None, required=True, accept=None, level=-1,
+                 threshold=0):
+        """Initialize a compressed json property.
+
+        Works like JsonValue but the JSON data is compressed using zlib and
+        stored as an unindexed blob. The value is decompressed and parsed when
+        read for the first time. JSON data smaller than `threshold` bytes is
+        stored uncompressed, like JsonValue does.
+
+        :param default: default value or None
+        :param required: boolean
+        :param accept: None or tuple
+        :param level: zlib compression level (-1 is the zlib default)
+        :param threshold: minimal size in bytes for a value to be compressed
+        """
+        self._level = level
+        self._threshold = threshold
+        super().__init__(
+            default=default, required=required, accept=accept, indexed=False)
+
+    def set_value(self, model, value):
+        self.check_value(value)
+        try:
+            data = json.dumps(value)
+        except TypeError as e:
+            raise TypeError('Value for property {!r} could not be parsed: {}'
+                            .format(self.name, e))
+        model.__dict__['__orig__{}'.format(self.name)] = value
+        encoded = data.encode('utf-8')
+        Value.set_value(
+            self, model,
+            zlib.compress(encoded, self._level)
+            if len(encoded) >= self._threshold else data)
+
+    def get_value(self, model):
+        key = '__orig__{}'.format(self.name)
+
+        if key not in model.__dict__:
+            data = model.__dict__.get(self.name)
+            if data is None:
+                return None
+            try:
+                model.__dict__[key] = json.loads(decompress(data))
+            except Exception as e:
+                raise Exception(
+                    'Error reading property {!r} '
+                    '(see above exception for more info).'
+                    .format(self.name)) from e
+
+        return model.__dict__[key]
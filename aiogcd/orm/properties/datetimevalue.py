@@ -1,28 +1,48 @@
 from .value import Value
 from ...connector.timestampvalue import TimestampValue
+from ...connector.utils import value_from_dict
+import datetime
 import re
 
+# Not used for validation, a string is validated when it is converted to a
+# TimestampValue.
 RFC3339_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{1,9})?(?:(?:[\+\-]\d{2}:\d{2})|Z)$')  # nopep8
 
 
 class DatetimeValue(Value):
 
     def check_value(self, value):
+        # a TimestampValue is validated when it is created, except for values
+        # read from the datastore which are parsed when the datetime is used
         if not isinstance(value, TimestampValue):
             raise TypeError(
                 'Expecting an value of type \'TimestampValue\' for property '
                 '{!r} but received type {!r}.'
                 .format(self.name, value.__class__.__name__))
 
-        if not RFC3339_RE.search(str(value)):
-            raise TypeError(
-                'Expecting a value of type \'str\' in RFC3339 datetime format '
-                'for property {!r}.'
-                .format(self.name))
+    def check_compare(self, value):
+        if not isinstance(value, datetime.datetime):
+            self.check_value(value)
 
     def set_value(self, model, value):
-        if isinstance(value, str):
-            value = TimestampValue(value)
-
-        self.check_value(value)
+        if isinstance(value, (str, datetime.datetime)):
+            try:
+                value = TimestampValue(value)
+            except ValueError:
+                raise TypeError(
+                    'Expecting a value of type \'str\' in RFC3339 datetime '
+                    'format for property {!r}.'
+                    .format(self.name)) from None
+        else:
+            self.check_value(value)
         super().set_value(model, value)
+
+    def encode(self, value):
+        if value is None:
+            return {'nullValue': None}
+        return {'timestampValue': str(value)}
+
+    def decode(self, val):
+        value = val.get('timestampValue')
+        return value_from_dict(val) if value is None \
+            else TimestampValue._from_datastore(value)
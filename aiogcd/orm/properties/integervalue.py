@@ -3,6 +3,7 @@
 Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
+from ...connector.utils import value_from_dict
 from .value import Value
 
 
@@ -19,3 +20,12 @@ class IntegerValue(Value):
         self.check_value(value)
         # wrap value so booleans are converted to int type
         super().set_value(model, int(value))
+
+    def encode(self, value):
+        if value is None:
+            return {'nullValue': None}
+        return {'integerValue': str(value)}
+
+    def decode(self, val):
+        value = val.get('integerValue')
+        return value_from_dict(val) if value is None else int(value)
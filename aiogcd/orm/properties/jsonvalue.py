@@ -9,7 +9,8 @@ from .value import Value
 
 class JsonValue(Value):
 
-    def __init__(self, default=None, required=True, accept=None):
+    def __init__(self, default=None, required=True, accept=None,
+                 indexed=None):
         """Initialize an json property.
 
         When 'accept' is None any type is accepted as long as the value is
@@ -24,9 +25,11 @@ class JsonValue(Value):
         :param default: list or None
         :param required: boolean
         :param accept: None or tuple
+        :param indexed: boolean or None (see Value)
         """
         self._accept = accept
-        super().__init__(default=default, required=required)
+        super().__init__(
+            default=default, required=required, indexed=indexed)
 
     def check_value(self, value):
         if self._accept and not isinstance(value, self._accept):
@@ -4,6 +4,7 @@ Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
 from ...connector.key import Key
+from ...connector.utils import value_from_dict
 from .value import Value
 
 
@@ -18,5 +19,15 @@ class KeyValue(Value):
 
     def set_value(self, model, value):
         self.check_value(value)
-        # wrap value so booleans are converted to int type
+        # a prefetched model is no longer valid for the new key
+        model.__dict__.pop('__related__{}'.format(self.name), None)
         super().set_value(model, value)
+
+    def encode(self, value):
+        if value is None:
+            return {'nullValue': None}
+        return {'keyValue': value.get_dict()}
+
+    def decode(self, val):
+        value = val.get('keyValue')
+        return value_from_dict(val) if value is None else Key(value)
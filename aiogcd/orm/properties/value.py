@@ -4,16 +4,34 @@ Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
 from ...connector.entity import Entity
+from ...connector.utils import value_from_dict
 from ...connector.utils import value_to_dict
+from ..filter import Param
 
 
 class Value:
 
-    def __init__(self, default=None, required=True):
+    def __init__(self, default=None, required=True, indexed=None):
+        """Initialize a property.
+
+        :param default: default value or None
+        :param required: boolean
+        :param indexed: when False, the property is excluded from indexes.
+                        By default the model __indexed__ setting is used.
+        """
         self.default = default
         self.required = required
+        self.indexed = indexed
         self.name = None
 
+    def __get__(self, model, owner=None):
+        if model is None:
+            return self
+        return self.get_value(model)
+
+    def __set__(self, model, value):
+        self.set_value(model, value)
+
     @property
     def ascending(self):
         return self.name, 'ASCENDING'
@@ -34,7 +52,27 @@ class Value:
     def set_value(self, model, value):
         Entity.set_property(model, self.name, value)
 
+    def encode(self, value):
+        """Returns the datastore value for a value as it is stored on the
+        model. Used by the model encoder when creating mutations."""
+        return value_to_dict(value)
+
+    def decode(self, val):
+        """Returns the value, as it should be stored on the model, for a given
+        datastore value. Used by the model decoder when reading query or
+        lookup results."""
+        return value_from_dict(val)
+
     def _compare(self, other, op):
+        if isinstance(other, Param):
+            # the value is checked when bound to a prepared filter
+            return {
+                'property': {
+                    'name': self.name
+                },
+                'value': other,
+                'op': op
+            }
         self.check_compare(other)
         return {
             'property': {
@@ -3,7 +3,8 @@
 Created on: May 19, 2017
     Author: Jeroen van der Heijden <jeroen@cesbit.com>
 """
-from typing import Callable, Union
+import asyncio
+from typing import Any, Awaitable, Callable, Optional, Sequence, Union
 
 
 class ProtectedList(list):
@@ -11,16 +12,23 @@ class ProtectedList(list):
     def __init__(
             self,
             *args,
-            protect: Union[Callable[..., None], bool] = True):
+            protect: Union[Callable[..., None], bool] = True,
+            on_change: Optional[Callable[[], None]] = None):
         self._protect = protect
+        self._on_change = on_change
         super().__init__(*args)
 
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
+
     def __setitem__(self, key, value):
         if self._protect is True:
             raise TypeError('This list is protected.')
         elif callable(self._protect):
             self._protect(value)
         super().__setitem__(key, value)
+        self._changed()
 
     def append(self, p_object):
         if self._protect is True:
@@ -28,6 +36,7 @@ class ProtectedList(list):
         elif callable(self._protect):
             self._protect(p_object)
         super().append(p_object)
+        self._changed()
 
     def extend(self, iterable):
         if self._protect is True:
@@ -40,16 +49,20 @@ class ProtectedList(list):
             iterable = iter(values)
 
         super().extend(iterable)
+        self._changed()
 
     def pop(self, index: int = -1):  # type: ignore
         if self._protect is True:
             raise TypeError('This list is protected.')
-        return super().pop(index)
+        result = super().pop(index)
+        self._changed()
+        return result
 
     def clear(self):
         if self._protect is True:
             raise TypeError('This list is protected.')
-        return super().clear()
+        super().clear()
+        self._changed()
 
     def insert(self, index, p_object):
         if self._protect is True:
@@ -57,16 +70,25 @@ class ProtectedList(list):
         elif callable(self._protect):
             self._protect(p_object)
         super().insert(index, p_object)
+        self._changed()
 
     def remove(self, value):
         if self._protect is True:
             raise TypeError('This list is protected.')
-        return super().remove(value)
+        super().remove(value)
+        self._changed()
 
     def reverse(self):
         if self._protect is True:
             raise TypeError('This list is protected.')
-        return super().reverse()
+        super().reverse()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        if self._protect is True:
+            raise TypeError('This list is protected.')
+        super().sort(*args, **kwargs)
+        self._changed()
 
     def __add__(self, other):
         self.extend(other)
@@ -79,7 +101,32 @@ class ProtectedList(list):
     def __delitem__(self, key):
         if self._protect is True:
             raise TypeError('This list is protected.')
-        return super().__delitem__(key)
+        super().__delitem__(key)
+        self._changed()
+
+
+async def run_chunks(
+        func: Callable[[list], Awaitable[Any]],
+        items: Sequence,
+        chunk_size: int,
+        concurrency: int) -> list[Any]:
+    """Call `func` for each chunk of at most `chunk_size` items, with at most
+    `concurrency` calls running at the same time.
+
+    :return: list with the result for each chunk (in order)
+    """
+    if chunk_size < 1 or concurrency < 1:
+        raise ValueError('chunk_size and concurrency must be at least 1')
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(chunk):
+        async with semaphore:
+            return await func(chunk)
+
+    return await asyncio.gather(*(
+        run(list(items[i:i + chunk_size]))
+        for i in range(0, len(items), chunk_size)))
 
 
 if __name__ == '__main__':
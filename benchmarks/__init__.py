@@ -0,0 +1,11 @@
+"""__init__.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+
+Microbenchmarks for the hot paths of aiogcd. Run from the repository root:
+
+    python -m benchmarks                 # compare with the stored baseline
+    python -m benchmarks --save          # store the results as new baseline
+    python -m benchmarks -k key model    # only cases containing key or model
+"""
@@ -0,0 +1,127 @@
+"""__main__.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+from typing import Any, Callable
+from .cases import CASES
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# A case is reported as changed when it is this much slower or faster.
+DEFAULT_THRESHOLD = 0.10
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Returns the best time for a single call in nanoseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def run(names: list[str], repeat: int) -> dict[str, float]:
+    results = {}
+    for name in names:
+        results[name] = measure(CASES[name](), repeat)
+        print('{:<28}{:>14.1f} ns'.format(name, results[name]))
+    return results
+
+
+def compare(
+        results: dict[str, float],
+        baseline: dict[str, Any],
+        threshold: float) -> list[str]:
+    """Print a comparison report and return the names of regressed cases."""
+    base = baseline['results']
+    regressions = []
+    print()
+    print('Baseline: Python {} on {}'.format(
+        baseline.get('python'), baseline.get('machine')))
+    print('{:<28}{:>14}{:>14}{:>10}'.format(
+        'case', 'baseline ns', 'current ns', 'ratio'))
+    for name, value in results.items():
+        if name not in base:
+            print('{:<28}{:>14}{:>14.1f}{:>10}'.format(
+                name, '-', value, 'new'))
+            continue
+        ratio = value / base[name]
+        if ratio > 1.0 + threshold:
+            status = 'slower'
+            regressions.append(name)
+        elif ratio < 1.0 - threshold:
+            status = 'faster'
+        else:
+            status = ''
+        print('{:<28}{:>14.1f}{:>14.1f}{:>10.2f}  {}'.format(
+            name, base[name], value, ratio, status).rstrip())
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Run the aiogcd microbenchmarks.')
+    parser.add_argument(
+        '-k', nargs='*', default=[], metavar='NAME',
+        help='only run cases which contain one of the given names')
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='number of measurements per case, the best one is used')
+    parser.add_argument(
+        '--baseline', default=BASELINE,
+        help='baseline file (default: %(default)s)')
+    parser.add_argument(
+        '--save', action='store_true',
+        help='store the results in the baseline file')
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help='relative change which is reported (default: %(default)s)')
+    parser.add_argument(
+        '--fail', action='store_true',
+        help='exit with status 1 when a case is slower than the baseline')
+    args = parser.parse_args(argv)
+
+    names = [
+        name for name in CASES
+        if not args.k or any(k in name for k in args.k)]
+    if not names:
+        parser.error('no benchmark matches {}'.format(args.k))
+
+    results = run(names, args.repeat)
+
+    if args.save:
+        baseline = {'results': {}}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        baseline['python'] = platform.python_version()
+        baseline['machine'] = platform.machine()
+        baseline['results'].update(
+            (name, round(value, 1)) for name, value in results.items())
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('\nBaseline saved to {}'.format(args.baseline))
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print('\nNo baseline found, use --save to create one.')
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions and args.fail:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
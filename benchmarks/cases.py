@@ -0,0 +1,265 @@
+"""cases.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+
+Each benchmark case is a function which prepares the data and returns a
+callable without arguments. Only the returned callable is timed.
+"""
+import json
+import datetime
+from typing import Callable
+from aiogcd.connector.key import Key
+from aiogcd.connector.entity import Entity
+from aiogcd.connector import grpctransport
+from aiogcd.connector.utils import value_from_dict
+from aiogcd.connector.utils import value_to_dict
+from aiogcd.orm import GcdModel, Param
+from aiogcd.orm.properties import (
+    ArrayValue,
+    BooleanValue,
+    DatetimeValue,
+    DoubleValue,
+    IntegerValue,
+    JsonValue,
+    KeyValue,
+    StringValue,
+)
+
+PROJECT_ID = 'bench-project'
+
+# Number of entities in one runQuery page.
+PAGE_SIZE = 100
+
+CASES: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def case(func):
+    CASES[func.__name__] = func
+    return func
+
+
+def _has_grpc() -> bool:
+    try:
+        grpctransport.require_grpc()
+    except ImportError:
+        return False
+    return True
+
+
+def grpc_case(func):
+    """Register a case which requires the optional gRPC dependencies."""
+    return case(func) if _has_grpc() else func
+
+
+class User(GcdModel):
+    name = StringValue()
+    age = IntegerValue()
+    score = DoubleValue(default=0.0)
+    active = BooleanValue(default=True)
+    created = DatetimeValue(required=False)
+    tags = ArrayValue(default=[])
+    settings = JsonValue(default={})
+    manager = KeyValue(required=False)
+
+
+def _key_dict(i: int) -> dict:
+    return {
+        'partitionId': {'projectId': PROJECT_ID, 'namespaceId': 'bench'},
+        'path': [
+            {'kind': 'Company', 'name': 'company-{}'.format(i % 10)},
+            {'kind': 'User', 'id': str(1000000 + i)},
+        ],
+    }
+
+
+def _entity_res(i: int) -> dict:
+    return {
+        'key': _key_dict(i),
+        'properties': {
+            'name': {'stringValue': 'user-{}'.format(i)},
+            'age': {'integerValue': str(20 + i % 50)},
+            'score': {'doubleValue': i * 0.5},
+            'active': {'booleanValue': i % 2 == 0},
+            'created': {'timestampValue': '2026-10-19T12:34:56.123456Z'},
+            'tags': {'arrayValue': {'values': [
+                {'stringValue': 'a'},
+                {'stringValue': 'b'},
+                {'integerValue': str(i)},
+            ]}},
+            'settings': {
+                'stringValue': '{"theme": "dark", "langs": ["en", "nl"]}',
+                'excludeFromIndexes': True,
+            },
+            'manager': {'keyValue': _key_dict(i + 1)},
+        },
+    }
+
+
+def _page() -> list[dict]:
+    return [{'entity': _entity_res(i)} for i in range(PAGE_SIZE)]
+
+
+def _run_query_response() -> dict:
+    return {
+        'batch': {
+            'entityResultType': 'FULL',
+            'entityResults': _page(),
+            'endCursor': 'ZmFrZTox',
+            'moreResults': 'NOT_FINISHED',
+        },
+    }
+
+
+def _run_query_bytes() -> tuple[type, bytes]:
+    """Returns the response type and a serialized runQuery response."""
+    _, _, response_type = grpctransport.get_message_types('runQuery')
+    message = grpctransport.to_message(
+        _run_query_response(), response_type)
+    return response_type, message.SerializeToString()
+
+
+def _nested_value() -> dict:
+    return {
+        'name': 'example',
+        'count': 42,
+        'ratio': 0.75,
+        'enabled': True,
+        'missing': None,
+        'owner': Key(_key_dict(1)),
+        'created': datetime.datetime(2026, 10, 19, 12, 34, 56),
+        'data': b'\x00\x01\x02' * 10,
+        'items': [
+            {'id': i, 'label': 'item-{}'.format(i), 'tags': ['x', 'y']}
+            for i in range(10)
+        ],
+    }
+
+
+@case
+def key_encode():
+    key = Key(_key_dict(1))
+    return key.encode
+
+
+@case
+def key_ks():
+    key_dict = _key_dict(1)
+    return lambda: Key(key_dict).ks
+
+
+@case
+def key_decode():
+    ks = Key(_key_dict(1)).ks
+    return lambda: Key(ks=ks)
+
+
+@case
+def value_to_dict_nested():
+    value = _nested_value()
+    return lambda: value_to_dict(value)
+
+
+@case
+def value_from_dict_nested():
+    value = value_to_dict(_nested_value())
+    return lambda: value_from_dict(value)
+
+
+@case
+def value_from_dict_scalars():
+    values = [
+        {'nullValue': None},
+        {'booleanValue': True},
+        {'integerValue': '42'},
+        {'doubleValue': 0.75},
+        {'stringValue': 'example'},
+    ] * 20
+    return lambda: [value_from_dict(v) for v in values]
+
+
+@case
+def entity_from_page():
+    page = _page()
+    from_entity_res = Entity._from_entity_res
+    return lambda: [from_entity_res(res['entity']) for res in page]
+
+
+@case
+def entity_get_dict():
+    entity = Entity(_entity_res(1))
+    return entity.get_dict
+
+
+@case
+def model_from_page():
+    page = _page()
+    from_entity_res = User._from_entity_res
+    return lambda: [from_entity_res(res['entity']) for res in page]
+
+
+@case
+def model_init():
+    key = Key('User', 1, project_id=PROJECT_ID)
+    return lambda: User(key=key, name='Alice', age=30, tags=['a', 'b'])
+
+
+@case
+def model_getattr():
+    user = User._from_entity_res(_entity_res(1))
+
+    def run():
+        user.name
+        user.age
+        user.score
+        user.active
+        user.created
+        user.tags
+        user.settings
+        user.manager
+
+    return run
+
+
+@case
+def model_get_dict():
+    user = User._from_entity_res(_entity_res(1))
+    return user.get_dict
+
+
+@case
+def filter_construct():
+    def run():
+        return User.filter(
+            User.name == 'Alice',
+            User.age > 20).order_by(User.age.ascending)
+
+    return run
+
+
+@case
+def filter_prepared_bind():
+    query = User.prepare(
+        User.name == Param('name'),
+        User.age > Param('age')).order_by(User.age.ascending)
+    return lambda: query.bind(name='Alice', age=20)
+
+
+@case
+def page_decode_json():
+    raw = json.dumps(_run_query_response()).encode()
+    return lambda: json.loads(raw)
+
+
+@grpc_case
+def page_decode_grpc():
+    response_type, raw = _run_query_bytes()
+    to_dict = grpctransport.to_dict
+    return lambda: to_dict(response_type.FromString(raw))
+
+
+@grpc_case
+def page_decode_grpc_json_format():
+    from google.protobuf import json_format
+    response_type, raw = _run_query_bytes()
+    return lambda: json_format.MessageToDict(response_type.FromString(raw))
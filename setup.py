@@ -25,6 +25,13 @@ install_requires = [
     'asyncio_extras>=1'
 ]
 
+extras_require = {
+    # Columns.to_numpy()
+    'numpy': ['numpy'],
+    # GrpcTransport and FakeDatastore.start_grpc()
+    'grpc': ['grpcio', 'google-cloud-datastore'],
+}
+
 setup(
     name='aiogcd',
     packages=[
@@ -42,6 +49,7 @@ setup(
         'aiogcd/tarball/{}'.format(VERSION),
     keywords=['gcd', 'datastore', 'connector'],
     install_requires=install_requires,
+    extras_require=extras_require,
     classifiers=[
         'Development Status :: 4 - Beta',
         'Environment :: Other Environment',
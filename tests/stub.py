@@ -0,0 +1,166 @@
+"""stub.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import itertools
+import json
+import os
+import tempfile
+import time
+from typing import Any
+from unittest import mock
+from aiohttp import web
+from aiogcd.connector import GcdConnector
+from aiogcd.connector.connector import DEFAULT_SCOPES
+from aiogcd.connector.entity import Entity
+
+
+def _path(key: dict) -> tuple:
+    return tuple(
+        (pe['kind'], pe.get('id') or pe.get('name'))
+        for pe in key['path'])
+
+
+class StubDatastore:
+
+    def __init__(self, page_size: int = 300):
+        """Minimal Datastore REST server for the tests. A query returns all
+        entities of the kind in insertion order, filters are ignored. Each
+        request is recorded as a (method, data) tuple in `requests`.
+
+        :param page_size: maximum number of entities in a query batch and
+                          number of found entities in a lookup response,
+                          additional lookup keys are deferred
+        """
+        self.page_size = page_size
+        self.fail = False
+        self.requests: list[tuple[str, Any]] = []
+        self._entities: dict[tuple, dict] = {}
+        self._ids = itertools.count(1000)
+        self._runner: web.AppRunner | None = None
+        self._tmp = tempfile.TemporaryDirectory()
+        self.host: str | None = None
+
+    def count(self, method: str) -> int:
+        return sum(1 for m, _ in self.requests if m == method)
+
+    def put(self, *entities: Entity | dict):
+        for entity in entities:
+            if isinstance(entity, Entity):
+                entity = entity.get_dict()
+            self._entities[_path(entity['key'])] = entity
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/v1/projects/{target}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, '127.0.0.1', 0).start()
+        host, port = self._runner.addresses[0][:2]
+        self.host = '{}:{}'.format(host, port)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+        self._tmp.cleanup()
+
+    def connector(
+            self,
+            project_id: str = 'test',
+            namespace_id: str | None = None) -> GcdConnector:
+        token_file = os.path.join(self._tmp.name, 'token.json')
+        with open(token_file, 'w') as f:
+            json.dump({
+                'refresh_token': 'refresh',
+                'access_token': 'access',
+                'scopes': list(DEFAULT_SCOPES),
+                'token_type': 'Bearer',
+                'expires_in': 3600,
+                'timestamp': int(time.time()),
+            }, f)
+
+        assert self.host is not None
+        with mock.patch.dict(
+                os.environ, {'DATASTORE_EMULATOR_HOST': self.host}):
+            return GcdConnector(
+                project_id, 'id', 'secret', token_file,
+                namespace_id=namespace_id)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info['target'].partition(':')[2]
+        data = await request.json()
+        self.requests.append((method, data))
+        if self.fail:
+            return web.json_response({'error': {
+                'code': 503,
+                'message': 'Stub error',
+                'status': 'UNAVAILABLE',
+            }}, status=503)
+        return web.json_response(getattr(self, '_{}'.format(method))(data))
+
+    def _runQuery(self, data: dict) -> dict:
+        query = data['query']
+        kind = query['kind'][0]['name']
+        results = [
+            entity for path, entity in self._entities.items()
+            if path[-1][0] == kind]
+
+        start = int(query.get('startCursor') or 0) + query.get('offset', 0)
+        end = min(len(results), start + self.page_size)
+        limit = query.get('limit')
+        if limit is not None:
+            end = min(end, start + limit)
+
+        if end >= len(results):
+            more = 'NO_MORE_RESULTS'
+        elif limit is not None and end == start + limit:
+            more = 'MORE_RESULTS_AFTER_LIMIT'
+        else:
+            more = 'NOT_FINISHED'
+
+        return {'batch': {
+            'entityResultType': 'FULL',
+            'entityResults': [
+                {'entity': results[idx], 'cursor': str(idx + 1)}
+                for idx in range(start, end)],
+            'endCursor': str(end),
+            'moreResults': more,
+        }}
+
+    def _lookup(self, data: dict) -> dict:
+        found, missing, deferred = [], [], []
+        for key in data['keys']:
+            entity = self._entities.get(_path(key))
+            if len(found) == self.page_size:
+                deferred.append(key)
+            elif entity is None:
+                missing.append({'entity': {'key': key}})
+            else:
+                found.append({'entity': entity})
+
+        result: dict[str, Any] = {'found': found}
+        if missing:
+            result['missing'] = missing
+        if deferred:
+            result['deferred'] = deferred
+        return result
+
+    def _commit(self, data: dict) -> dict:
+        results = []
+        for mutation in data['mutations']:
+            op, value = next(iter(mutation.items()))
+            if op == 'delete':
+                self._entities.pop(_path(value), None)
+                results.append({'version': '1'})
+                continue
+
+            result = {'version': '1'}
+            last = value['key']['path'][-1]
+            if 'id' not in last and 'name' not in last:
+                last['id'] = str(next(self._ids))
+                result['key'] = value['key']
+            self._entities[_path(value['key'])] = value
+            results.append(result)
+
+        return {'mutationResults': results, 'indexUpdates': 0}
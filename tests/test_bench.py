@@ -0,0 +1,60 @@
+"""test_bench.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.bench import Bench, parse_mix, percentile
+from aiogcd.fakeserver import FakeDatastore
+
+
+class TestHelpers(unittest.TestCase):
+
+    def test_parse_mix(self):
+        self.assertEqual(
+            parse_mix('lookup=5, query, commit=0'),
+            {'lookup': 5.0, 'query': 1.0, 'commit': 0.0})
+        with self.assertRaises(ValueError):
+            parse_mix('delete=1')
+        with self.assertRaises(ValueError):
+            parse_mix('lookup=0')
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+class TestBench(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fake = FakeDatastore(seed=1)
+        await self.fake.start()
+        self.gcd = self.fake.connector('bench')
+        self.bench = Bench(self.gcd, entities=20, batch_size=5, seed=1)
+        await self.bench.setup()
+
+    async def asyncTearDown(self):
+        await self.gcd.close()
+        await self.fake.stop()
+
+    async def test_run(self):
+        weights = parse_mix('lookup=1,query=1,commit=1')
+        elapsed = await self.bench.run(weights, duration=0.2, concurrency=4)
+        report = self.bench.report(elapsed)
+        self.assertGreater(report['total']['count'], 0)
+        self.assertEqual(report['total']['errors'], 0)
+
+    async def test_errors(self):
+        self.fake.error_rate = 1.0
+        for name in ('lookup', 'query', 'commit'):
+            elapsed = await self.bench.run(
+                {name: 1.0}, duration=0.1, concurrency=2)
+            report = self.bench.report(elapsed)
+            self.assertEqual(report[name]['count'], 0)
+            self.assertGreater(report[name]['errors'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""test_changes.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import IntegerValue
+from .stub import StubDatastore
+
+
+class Counter(GcdModel):
+    ALLOW_NEW_PROPERTIES = True
+    count = IntegerValue(default=0)
+
+
+def _entity(idx, **properties):
+    return Entity({
+        'key': Key('Counter', idx, project_id='test').get_dict(),
+        'properties': properties,
+    })
+
+
+class TestEntityChanges(unittest.TestCase):
+
+    def test_new_entity_is_changed(self):
+        self.assertTrue(_entity(1).has_changes())
+
+    def test_set_property(self):
+        entity = Entity._from_entity_res(
+            _entity(1, count={'integerValue': '1'}).get_dict())
+        self.assertFalse(entity.has_changes())
+        entity.count = 2
+        self.assertTrue(entity.has_changes())
+
+    def test_non_property_attribute(self):
+        entity = Entity._from_entity_res(_entity(1).get_dict())
+        entity.other = 2
+        self.assertFalse(entity.has_changes())
+
+
+class TestModelChanges(unittest.TestCase):
+
+    def _model(self):
+        return Counter._from_entity_res(_entity(
+            1,
+            count={'integerValue': '1'},
+            extra={'integerValue': '2'}).get_dict())
+
+    def test_model_property(self):
+        model = self._model()
+        self.assertFalse(model.has_changes())
+        model.count = 2
+        self.assertTrue(model.has_changes())
+
+    def test_new_property(self):
+        model = self._model()
+        model.extra = 5
+        self.assertTrue(model.has_changes())
+        self.assertEqual(
+            model.get_dict()['properties']['extra'], {'integerValue': '5'})
+
+
+class TestUpsertChanged(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.stub = StubDatastore()
+        await self.stub.start()
+        self.gcd = self.stub.connector()
+        self.stub.put(*(
+            _entity(idx, count={'integerValue': '0'},
+                    extra={'integerValue': '0'})
+            for idx in (1, 2)))
+
+    async def asyncTearDown(self):
+        await self.stub.stop()
+
+    async def test_upsert_changed(self):
+        models = await Counter.get_many(
+            self.gcd, [Key('Counter', idx, project_id='test')
+                       for idx in (1, 2)])
+        first, second = models
+        second.extra = 5
+
+        self.assertEqual(
+            await self.gcd.upsert_changed(models), (True, True))
+        self.assertEqual(self.stub.count('commit'), 1)
+
+        first, second = await Counter.get_many(
+            self.gcd, [first.key, second.key])
+        self.assertEqual(first.extra, 0)
+        self.assertEqual(second.extra, 5)
+        self.assertFalse(second.has_changes())
+
+    async def test_upsert_unchanged(self):
+        models = await Counter.get_many(
+            self.gcd, [Key('Counter', 1, project_id='test')])
+        self.assertEqual(await self.gcd.upsert_changed(models), (True,))
+        self.assertEqual(self.stub.count('commit'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
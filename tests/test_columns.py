@@ -0,0 +1,51 @@
+"""test_columns.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector.columns import Columns
+
+try:
+    import numpy  # pyright: ignore[reportMissingImports]
+except ImportError:
+    numpy = None
+
+
+def _result(idx, **properties):
+    return {'entity': {
+        'key': {
+            'partitionId': {'projectId': 'test'},
+            'path': [{'kind': 'User', 'id': str(idx)}],
+        },
+        'properties': properties,
+    }}
+
+
+class TestColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.columns = Columns()
+        self.columns.extend([
+            _result(1, age={'integerValue': '3'}, name={'stringValue': 'a'}),
+            _result(2, age={'nullValue': None}),
+            _result(3, name={'stringValue': 'c'}),
+        ])
+
+    def test_columns(self):
+        self.assertEqual(len(self.columns), 3)
+        self.assertEqual(sorted(self.columns.names), ['age', 'name'])
+        self.assertEqual(list(self.columns.mask('age')), [0, 1, 1])
+        self.assertEqual(self.columns['name'], ['a', None, 'c'])
+        self.assertEqual(
+            [key.id for key in self.columns.keys], [1, 2, 3])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_to_numpy(self):
+        arrays = self.columns.to_numpy()
+        self.assertEqual(arrays['age'].tolist(), [3, None, None])
+        self.assertEqual(arrays['name'].tolist(), ['a', None, 'c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""test_compressed.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import json
+import unittest
+import zlib
+from aiogcd.connector.key import Key
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import BytesValue
+from aiogcd.orm.properties import CompressedBytesValue
+from aiogcd.orm.properties import CompressedJsonValue
+from aiogcd.orm.properties import JsonValue
+
+
+class Doc(GcdModel):
+    data = CompressedJsonValue(required=False)
+    blob = CompressedBytesValue(required=False)
+
+
+class SmallDoc(GcdModel):
+    __kind__ = 'Doc'
+    data = CompressedJsonValue(required=False, threshold=100)
+    blob = CompressedBytesValue(required=False, threshold=100)
+
+
+class LegacyDoc(GcdModel):
+    __kind__ = 'Doc'
+    data = JsonValue(required=False)
+    blob = BytesValue(required=False)
+
+
+DATA = {'items': [{'name': 'item', 'idx': i} for i in range(100)]}
+BLOB = b'aiogcd' * 100
+
+
+def _reload(model, other):
+    return other._from_entity_res(model.get_dict())
+
+
+class TestCompressed(unittest.TestCase):
+
+    def test_round_trip(self):
+        doc = Doc(key=Key('Doc', 1, project_id='test'), data=DATA, blob=BLOB)
+        doc = _reload(doc, Doc)
+        self.assertEqual(doc.data, DATA)
+        self.assertEqual(doc.blob, BLOB)
+
+    def test_compressed_blob(self):
+        doc = Doc(key=Key('Doc', 1, project_id='test'), data=DATA, blob=BLOB)
+        props = doc.get_dict()['properties']
+        for name in ('data', 'blob'):
+            self.assertIn('blobValue', props[name])
+            self.assertTrue(props[name]['excludeFromIndexes'])
+        self.assertEqual(
+            json.loads(zlib.decompress(doc.__dict__['data'])), DATA)
+        self.assertLess(len(doc.__dict__['blob']), len(BLOB))
+
+    def test_threshold(self):
+        doc = SmallDoc(
+            key=Key('Doc', 1, project_id='test'), data=[1, 2], blob=b'ab')
+        props = doc.get_dict()['properties']
+        self.assertEqual(props['data']['stringValue'], '[1, 2]')
+        self.assertTrue(props['data']['excludeFromIndexes'])
+        self.assertEqual(doc.__dict__['blob'], b'ab')
+        self.assertTrue(props['blob']['excludeFromIndexes'])
+
+        doc = _reload(doc, SmallDoc)
+        self.assertEqual(doc.data, [1, 2])
+        self.assertEqual(doc.blob, b'ab')
+
+        doc = SmallDoc(
+            key=Key('Doc', 1, project_id='test'), data=DATA, blob=BLOB)
+        self.assertIsInstance(doc.__dict__['data'], bytes)
+        self.assertLess(len(doc.__dict__['blob']), len(BLOB))
+        doc = _reload(doc, SmallDoc)
+        self.assertEqual(doc.data, DATA)
+        self.assertEqual(doc.blob, BLOB)
+
+    def test_legacy(self):
+        doc = LegacyDoc(
+            key=Key('Doc', 1, project_id='test'), data=DATA, blob=BLOB)
+        doc = _reload(doc, Doc)
+        self.assertEqual(doc.data, DATA)
+        self.assertEqual(doc.blob, BLOB)
+
+    def test_lazy(self):
+        doc = Doc(key=Key('Doc', 1, project_id='test'), data=DATA)
+        doc = _reload(doc, Doc)
+        self.assertNotIn('__orig__data', doc.__dict__)
+        self.assertIs(doc.data, doc.data)
+        self.assertIn('__orig__data', doc.__dict__)
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            Doc(key=Key('Doc', 1, project_id='test'), blob='text')
+        with self.assertRaises(TypeError):
+            Doc(key=Key('Doc', 1, project_id='test'), data={'a': object()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""test_compression.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import gzip
+import json
+import unittest
+from aiogcd.connector import GcdEmulatorConnector
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.connector.transport import RestTransport
+from aiogcd.fakeserver import COMPRESS_MIN_SIZE, FakeDatastore
+
+
+def _entity(idx):
+    return Entity({
+        'key': Key('Item', idx, project_id='test').get_dict(),
+        'properties': {'text': {'stringValue': 'x' * 100}},
+    })
+
+
+class TestEncode(unittest.TestCase):
+
+    def test_threshold(self):
+        transport = RestTransport('http://localhost', compress_threshold=100)
+        body, headers = transport._encode({'a': 'b'}, {})
+        self.assertEqual(json.loads(body), {'a': 'b'})
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(headers['Accept-Encoding'], 'gzip')
+
+        data = {'a': 'b' * 200}
+        original = {'Authorization': 'Bearer token'}
+        body, headers = transport._encode(data, original)
+        self.assertEqual(json.loads(gzip.decompress(body)), data)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Authorization'], 'Bearer token')
+        self.assertEqual(original, {'Authorization': 'Bearer token'})
+
+    def test_disabled(self):
+        transport = RestTransport('http://localhost', accept_encoding=None)
+        body, headers = transport._encode({'a': 'b' * 2000}, {})
+        self.assertEqual(json.loads(body), {'a': 'b' * 2000})
+        self.assertEqual(headers, {})
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RestTransport('http://localhost', compress_threshold=-1)
+        with self.assertRaises(ValueError):
+            RestTransport('http://localhost', compress_level=0)
+        with self.assertRaises(ValueError):
+            GcdEmulatorConnector(
+                'test',
+                transport=RestTransport('http://localhost'),
+                compress_threshold=0)
+
+
+class TestCompression(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fake = FakeDatastore()
+        self.endpoint = await self.fake.start()
+
+    async def asyncTearDown(self):
+        await self.fake.stop()
+
+    async def test_request(self):
+        gcd = GcdEmulatorConnector(
+            'test', api_endpoint=self.endpoint, compress_threshold=0)
+        entities = [_entity(idx) for idx in range(1, 21)]
+        await gcd.upsert_entities(entities)
+        found = await gcd.get_entities_by_keys([e.key for e in entities])
+        self.assertEqual(len(found), 20)
+        await gcd.close()
+
+    async def test_response(self):
+        self.fake.put(*(_entity(idx) for idx in range(1, 21)))
+        transport = RestTransport(self.endpoint)
+        data = {'query': {'kind': [{'name': 'Item'}]}}
+
+        response = await transport.request('runQuery', 'test', data, {})
+        size = len(json.dumps(response.content))
+        self.assertGreaterEqual(size, COMPRESS_MIN_SIZE)
+        self.assertEqual(len(response.content['batch']['entityResults']), 20)
+        self.assertLess(response.response_bytes, size)
+
+        # small responses are not compressed
+        data['query']['limit'] = 1
+        response = await transport.request('runQuery', 'test', data, {})
+        self.assertEqual(
+            response.response_bytes, len(json.dumps(response.content)))
+        await transport.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
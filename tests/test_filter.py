@@ -0,0 +1,109 @@
+"""test_filter.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import copy
+import unittest
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import IntegerValue
+from .stub import StubDatastore
+
+
+class Item(GcdModel):
+    number = IntegerValue()
+
+
+class TestIter(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.stub = StubDatastore(page_size=10)
+        await self.stub.start()
+        self.gcd = self.stub.connector()
+        self.stub.put(*(
+            Entity({
+                'key': Key('Item', idx, project_id='test').get_dict(),
+                'properties': {'number': {'integerValue': str(idx)}},
+            })
+            for idx in range(1, 21)))
+
+    async def asyncTearDown(self):
+        await self.stub.stop()
+
+    async def test_iter(self):
+        numbers = [
+            item.number
+            async for item in Item.filter().iter(self.gcd, batch_size=6)]
+        self.assertEqual(numbers, list(range(1, 21)))
+        self.assertEqual(self.stub.count('runQuery'), 4)
+
+    async def test_iter_limit(self):
+        numbers = [
+            item.number
+            async for item in Item.filter().limit(8).iter(
+                self.gcd, batch_size=6)]
+        self.assertEqual(numbers, list(range(1, 9)))
+        self.assertEqual(
+            [data['query']['limit'] for _, data in self.stub.requests],
+            [6, 2])
+
+    async def test_resume_after_break(self):
+        query = Item.filter()
+        async for item in query.iter(self.gcd, batch_size=6):
+            if item.number == 8:
+                break
+
+        numbers = [
+            item.number
+            async for item in Item.filter().iter(
+                self.gcd, batch_size=6, start_cursor=query.cursor)]
+        self.assertEqual(numbers, list(range(9, 21)))
+
+    async def test_resume_after_page(self):
+        query = Item.filter()
+        async for item in query.iter(self.gcd, batch_size=6):
+            if item.number == 6:
+                break
+
+        item = await Item.filter().limit(
+            1, start_cursor=query.cursor).get_entity(self.gcd)
+        self.assertEqual(item.number, 7)
+
+    async def test_reuse(self):
+        query = Item.filter()
+        orig = copy.deepcopy(dict(query))
+        async for item in query.iter(
+                self.gcd, batch_size=6, start_cursor='2'):
+            pass
+        self.assertEqual(query, orig)
+
+        # the query is not finished in one page, so a second request uses
+        # the cursor but the filter is not changed
+        items = await query.get_entities(self.gcd)
+        self.assertEqual(len(items), 20)
+        self.assertEqual(query, orig)
+
+    async def test_namespace(self):
+        gcd = self.stub.connector(namespace_id='other')
+        data = {
+            'partitionId': {'projectId': 'test'},
+            'query': {'kind': [{'name': 'Item'}], 'limit': 15},
+        }
+        orig = copy.deepcopy(data)
+        entities = await gcd.get_entities(data)
+        self.assertEqual(len(entities), 15)
+        self.assertEqual(data, orig)
+
+        _, first = self.stub.requests[0]
+        self.assertEqual(
+            first['partitionId'],
+            {'projectId': 'test', 'namespaceId': 'other'})
+        _, second = self.stub.requests[1]
+        self.assertEqual(second['query']['limit'], 5)
+        self.assertEqual(second['query']['startCursor'], '10')
+
+
+if __name__ == '__main__':
+    unittest.main()
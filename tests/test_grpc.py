@@ -0,0 +1,145 @@
+"""test_grpc.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import sys
+import unittest
+from unittest import mock
+from aiogcd.connector import GrpcTransport
+from aiogcd.connector import grpctransport
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.fakeserver import FakeDatastore
+
+try:
+    grpctransport.require_grpc()
+    from google.protobuf import json_format
+except ImportError:
+    HAS_GRPC = False
+else:
+    HAS_GRPC = True
+
+KEY = {
+    'partitionId': {'projectId': 'test', 'namespaceId': 'ns'},
+    'path': [{'kind': 'Parent', 'name': 'a'}, {'kind': 'Child', 'id': '5'}],
+}
+
+ENTITY = {
+    'key': KEY,
+    'properties': {
+        'null': {'nullValue': None},
+        'bool': {'booleanValue': True},
+        'int': {'integerValue': '-12'},
+        'double': {'doubleValue': 1.5},
+        'nan': {'doubleValue': 'NaN'},
+        'inf': {'doubleValue': '-Infinity'},
+        'time': {'timestampValue': '2026-10-19T12:34:56.123Z'},
+        'key': {'keyValue': KEY},
+        'str': {'stringValue': 'x', 'excludeFromIndexes': True},
+        'blob': {'blobValue': 'AAEC'},
+        'geo': {'geoPointValue': {'latitude': 1.5, 'longitude': -2.5}},
+        'entity': {'entityValue': {
+            'properties': {'a': {'stringValue': 'b'}}}},
+        'array': {'arrayValue': {'values': [
+            {'integerValue': '1'},
+            {'stringValue': 'y', 'meaning': 15}]}},
+        'empty': {'arrayValue': {}},
+    },
+}
+
+
+@unittest.skipUnless(HAS_GRPC, 'requires grpcio and google-cloud-datastore')
+class TestToDict(unittest.TestCase):
+
+    def _check(self, method, content):
+        _, _, response_type = grpctransport.get_message_types(method)
+        message = grpctransport.to_message(content, response_type)
+        expected = json_format.MessageToDict(message)
+        self.assertEqual(grpctransport.to_dict(message), expected)
+
+    def test_run_query(self):
+        self._check('runQuery', {
+            'batch': {
+                'entityResultType': 'FULL',
+                'entityResults': [{
+                    'entity': ENTITY,
+                    'version': '7',
+                    'updateTime': '2026-10-19T12:00:00Z',
+                    'cursor': 'Y3Vyc29y',
+                }],
+                'skippedResults': 2,
+                'endCursor': 'ZW5k',
+                'moreResults': 'NO_MORE_RESULTS',
+                'readTime': '2026-10-19T12:00:00.000000001Z',
+            },
+            'transaction': 'dHg=',
+        })
+
+    def test_end_cursor(self):
+        _, _, response_type = grpctransport.get_message_types('runQuery')
+        content = grpctransport.to_dict(response_type())
+        self.assertEqual(content, {'batch': {'endCursor': ''}})
+
+    def test_lookup(self):
+        self._check('lookup', {
+            'found': [{'entity': ENTITY, 'version': '1'}],
+            'missing': [{'entity': {'key': KEY}, 'version': '2'}],
+            'deferred': [KEY],
+            'readTime': '2026-10-19T12:00:00Z',
+        })
+
+    def test_commit(self):
+        self._check('commit', {
+            'mutationResults': [{'key': KEY, 'version': '3'}],
+            'indexUpdates': 4,
+        })
+
+
+@unittest.skipUnless(HAS_GRPC, 'requires grpcio and google-cloud-datastore')
+class TestGrpcTransport(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fake = FakeDatastore()
+        await self.fake.start_grpc()
+        self.gcd = self.fake.grpc_connector('test')
+
+    async def asyncTearDown(self):
+        await self.gcd.close()
+        await self.fake.stop()
+
+    async def test_requests(self):
+        entities = [
+            Entity({
+                'key': Key('Item', idx, project_id='test').get_dict(),
+                'properties': {'n': {'integerValue': str(idx)}},
+            })
+            for idx in range(1, 4)]
+        await self.gcd.upsert_entities(entities)
+
+        found = await self.gcd.get_entities(
+            {'query': {'kind': [{'name': 'Item'}]}})
+        self.assertEqual(
+            [entity.get_dict() for entity in found],
+            [entity.get_dict() for entity in entities])
+
+        entity = await self.gcd.get_entity_by_key(entities[1].key)
+        assert entity is not None
+        self.assertEqual(entity.get_dict(), entities[1].get_dict())
+
+    async def test_error(self):
+        self.fake.error_rate = 1.0
+        with self.assertRaises(ValueError):
+            await self.gcd.get_entity_by_key(Key('Item', 1, project_id='test'))
+
+
+class TestImport(unittest.TestCase):
+
+    def test_missing(self):
+        with mock.patch.dict(sys.modules, {'grpc': None}):
+            with self.assertRaises(ImportError):
+                GrpcTransport()
+
+
+if __name__ == '__main__':
+    unittest.main()
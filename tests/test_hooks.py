@@ -0,0 +1,134 @@
+"""test_hooks.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from unittest import mock
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.hooks import ConnectorHook
+from aiogcd.connector.key import Key
+from aiogcd.fakeserver import FakeDatastore
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import IntegerValue
+
+
+class Item(GcdModel):
+    number = IntegerValue()
+
+
+class RecordHook(ConnectorHook):
+
+    def __init__(self):
+        self.requests = []
+        self.operations = []
+
+    def on_request(self, event):
+        self.requests.append(event)
+
+    def on_operation(self, event):
+        self.operations.append(event)
+
+
+class BrokenHook(ConnectorHook):
+
+    def on_request(self, event):
+        raise RuntimeError('broken hook')
+
+    def on_operation(self, event):
+        raise RuntimeError('broken hook')
+
+
+def _entity(idx):
+    return Entity({
+        'key': Key('Item', idx, project_id='test').get_dict(),
+        'properties': {'number': {'integerValue': str(idx)}},
+    })
+
+
+class TestHooks(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fake = FakeDatastore(page_size=5)
+        await self.fake.start()
+        self.gcd = self.fake.connector('test')
+        self.fake.put(*(_entity(idx) for idx in range(1, 11)))
+        self.hook = RecordHook()
+        self.gcd.add_hook(self.hook)
+
+    async def asyncTearDown(self):
+        await self.fake.stop()
+
+    async def test_operations(self):
+        await Item.filter().get_entities(self.gcd)
+        await self.gcd.get_entities_by_keys([
+            Key('Item', 1, project_id='test'),
+            Key('Item', 2, project_id='test')])
+        await self.gcd.upsert_entity(_entity(11))
+        await self.gcd.allocate_ids([Key('Item', None, project_id='test')])
+
+        self.assertEqual(
+            [event.method for event in self.hook.operations],
+            ['runQuery', 'lookup', 'commit', 'allocateIds'])
+        self.assertEqual(
+            [event.method for event in self.hook.requests],
+            ['runQuery'] * 2 + ['lookup', 'commit', 'allocateIds'])
+
+        query, lookup, commit, allocate = self.hook.operations
+        self.assertEqual(query.requests, 2)
+        self.assertEqual(query.entity_count, 10)
+        self.assertEqual(lookup.entity_count, 2)
+        self.assertEqual(commit.entity_count, 1)
+        self.assertEqual(allocate.entity_count, 1)
+        for event in self.hook.operations:
+            self.assertEqual(event.kind, 'Item')
+            self.assertEqual(event.status, 200)
+            self.assertIsNone(event.error)
+            self.assertGreater(event.request_bytes, 0)
+            self.assertGreater(event.response_bytes, 0)
+
+    async def test_error_status(self):
+        self.fake.error_rate = 1.0
+        with self.assertRaises(Exception):
+            await Item.filter().get_entities(self.gcd)
+
+        operation, = self.hook.operations
+        self.assertEqual(operation.status, 503)
+        self.assertEqual(self.hook.requests[-1].status, 503)
+
+    async def test_token_error(self):
+        error = RuntimeError('token error')
+        with mock.patch.object(
+                self.gcd, '_get_headers', side_effect=error):
+            with self.assertRaises(RuntimeError):
+                await self.gcd.get_entity_by_key(
+                    Key('Item', 1, project_id='test'))
+
+        request, = self.hook.requests
+        self.assertIs(request.error, error)
+        operation, = self.hook.operations
+        self.assertEqual(operation.method, 'lookup')
+        self.assertIs(operation.error, error)
+        self.assertEqual(self.fake.requests['lookup'], 0)
+
+    async def test_broken_hook(self):
+        self.gcd.add_hook(BrokenHook())
+        other = RecordHook()
+        self.gcd.add_hook(other)
+
+        with self.assertLogs(level='ERROR') as logs:
+            items = await Item.filter().get_entities(self.gcd)
+
+        self.assertEqual(len(items), 10)
+        self.assertEqual(len(other.requests), 2)
+        self.assertEqual(len(other.operations), 1)
+        self.assertIn('broken hook', logs.output[0])
+
+    async def test_remove_hook(self):
+        self.gcd.remove_hook(self.hook)
+        await Item.filter().get_entities(self.gcd)
+        self.assertEqual(self.hook.operations, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""test_lookup.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import StringValue
+from .stub import StubDatastore
+
+
+class Author(GcdModel):
+    name = StringValue()
+
+
+def _key(kind, idx):
+    return Key(kind, idx, project_id='test')
+
+
+class TestLookup(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # a small page size makes the stub defer keys
+        self.stub = StubDatastore(page_size=3)
+        await self.stub.start()
+        self.gcd = self.stub.connector()
+        self.stub.put(*(
+            Entity({
+                'key': _key('Author', idx).get_dict(),
+                'properties': {'name': {'stringValue': str(idx)}},
+            })
+            for idx in range(1, 11)))
+
+    async def asyncTearDown(self):
+        await self.stub.stop()
+
+    async def test_deferred(self):
+        keys = [_key('Author', idx) for idx in range(1, 11)]
+        entities = await self.gcd.get_entities_by_keys(keys)
+        self.assertEqual(len(entities), 10)
+        self.assertEqual(self.stub.count('lookup'), 4)
+
+    async def test_missing(self):
+        missing = []
+        entities = await self.gcd.get_entities_by_keys(
+            [_key('Author', 1), _key('Author', 99)], missing=missing)
+        self.assertEqual(len(entities), 1)
+        self.assertEqual(len(missing), 1)
+
+    async def test_get_many(self):
+        authors = await Author.get_many(
+            self.gcd, [_key('Author', 1), _key('Author', 99)])
+        self.assertEqual(authors[0].name, '1')
+        self.assertIsNone(authors[1])
+
+    async def test_error(self):
+        self.stub.fail = True
+        with self.assertRaises(ValueError):
+            await self.gcd.get_entities_by_keys([_key('Author', 1)])
+        with self.assertRaises(ValueError):
+            await self.gcd.get_entity_by_key(_key('Author', 1))
+
+    async def test_get_many_error(self):
+        self.stub.fail = True
+        with self.assertRaises(ValueError):
+            await Author.get_many(self.gcd, [_key('Author', 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
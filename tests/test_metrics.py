@@ -0,0 +1,134 @@
+"""test_metrics.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector.hooks import OperationEvent
+from aiogcd.connector.metrics import Metrics
+
+
+def _event(latency, method='runQuery', kind='Item', status=200, error=None,
+           entities=0):
+    event = OperationEvent(method, kind, None)
+    event.status = status
+    event.latency = latency
+    event.requests = 1
+    event.request_bytes = 100
+    event.response_bytes = 1000
+    event.entity_count = entities
+    event.error = error
+    return event
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_bucket_boundaries(self):
+        metrics = Metrics(buckets=(0.1, 0.01, 1.0))
+        for latency in (0.005, 0.01, 0.0101, 0.1, 1.0, 1.5):
+            metrics.on_operation(_event(latency))
+
+        item, = metrics.snapshot()
+        self.assertEqual(item['buckets'], {
+            0.01: 2,
+            0.1: 4,
+            1.0: 5,
+            float('inf'): 6,
+        })
+        self.assertEqual(item['count'], 6)
+        self.assertAlmostEqual(item['sum'], 2.6251)
+
+    def test_snapshot(self):
+        metrics = Metrics(buckets=(1.0,))
+        metrics.on_operation(_event(0.5, entities=3))
+        metrics.on_operation(_event(0.5, entities=2))
+        metrics.on_operation(_event(0.5, status=500))
+        metrics.on_operation(_event(0.5, error=TimeoutError()))
+        metrics.on_operation(_event(0.5, method='lookup', kind='Other'))
+
+        self.assertEqual(metrics.snapshot(), [
+            {
+                'method': 'lookup',
+                'kind': 'Other',
+                'outcome': 'ok',
+                'count': 1,
+                'sum': 0.5,
+                'buckets': {1.0: 1, float('inf'): 1},
+                'requests': 1,
+                'entities': 0,
+                'request_bytes': 100,
+                'response_bytes': 1000,
+            },
+            {
+                'method': 'runQuery',
+                'kind': 'Item',
+                'outcome': 'error',
+                'count': 2,
+                'sum': 1.0,
+                'buckets': {1.0: 2, float('inf'): 2},
+                'requests': 2,
+                'entities': 0,
+                'request_bytes': 200,
+                'response_bytes': 2000,
+            },
+            {
+                'method': 'runQuery',
+                'kind': 'Item',
+                'outcome': 'ok',
+                'count': 2,
+                'sum': 1.0,
+                'buckets': {1.0: 2, float('inf'): 2},
+                'requests': 2,
+                'entities': 5,
+                'request_bytes': 200,
+                'response_bytes': 2000,
+            },
+        ])
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), [])
+
+    def test_by_kind(self):
+        metrics = Metrics(by_kind=False)
+        metrics.on_operation(_event(0.5, kind='A'))
+        metrics.on_operation(_event(0.5, kind='B'))
+        item, = metrics.snapshot()
+        self.assertEqual(item['kind'], '')
+        self.assertEqual(item['count'], 2)
+
+    def test_render(self):
+        metrics = Metrics(buckets=(0.5,), prefix='test')
+        metrics.on_operation(_event(0.25, kind='It"em', entities=4))
+
+        labels = 'method="runQuery",kind="It\\"em",outcome="ok"'
+        self.assertEqual(metrics.render().splitlines(), [
+            '# HELP test_operation_latency_seconds '
+            'Datastore operation latency in seconds.',
+            '# TYPE test_operation_latency_seconds histogram',
+            'test_operation_latency_seconds_bucket{%s,le="0.5"} 1' % labels,
+            'test_operation_latency_seconds_bucket{%s,le="+Inf"} 1' % labels,
+            'test_operation_latency_seconds_sum{%s} 0.25' % labels,
+            'test_operation_latency_seconds_count{%s} 1' % labels,
+            '# HELP test_requests_total Number of HTTP requests.',
+            '# TYPE test_requests_total counter',
+            'test_requests_total{%s} 1' % labels,
+            '# HELP test_entities_total '
+            'Number of returned or written entities.',
+            '# TYPE test_entities_total counter',
+            'test_entities_total{%s} 4' % labels,
+            '# HELP test_request_bytes_total Number of bytes sent.',
+            '# TYPE test_request_bytes_total counter',
+            'test_request_bytes_total{%s} 100' % labels,
+            '# HELP test_response_bytes_total Number of bytes received.',
+            '# TYPE test_response_bytes_total counter',
+            'test_response_bytes_total{%s} 1000' % labels,
+        ])
+
+    def test_render_empty(self):
+        lines = Metrics().render().splitlines()
+        self.assertEqual(len(lines), 10)
+        self.assertTrue(all(line.startswith('# ') for line in lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""test_model.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import IntegerValue, StringValue
+
+
+class Person(GcdModel):
+    name = StringValue()
+    age = IntegerValue(default=0)
+
+
+class Note(GcdModel):
+    __indexed__ = False
+    title = StringValue(indexed=True)
+    body = StringValue()
+
+
+def _entity_res(**properties):
+    return {
+        'key': Key('Person', 1, project_id='test').get_dict(),
+        'properties': properties,
+    }
+
+
+class TestModel(unittest.TestCase):
+
+    def test_decoders(self):
+        self.assertEqual(set(Person._decoders), {'name', 'age'})
+        self.assertEqual(set(Person._encoders), {'name', 'age'})
+
+    def test_from_entity_res(self):
+        person = Person._from_entity_res(_entity_res(
+            name={'stringValue': 'Iris'},
+            age={'integerValue': '42'}))
+        self.assertEqual(person.name, 'Iris')
+        self.assertEqual(person.age, 42)
+        self.assertFalse(person.has_changes())
+
+    def test_from_entity_res_default(self):
+        person = Person._from_entity_res(_entity_res(
+            name={'stringValue': 'Iris'}))
+        self.assertEqual(person.age, 0)
+
+    def test_from_entity_res_equals_init(self):
+        entity_res = _entity_res(
+            name={'stringValue': 'Iris'},
+            age={'integerValue': '42'})
+        self.assertEqual(
+            Person._from_entity_res(entity_res).get_dict(),
+            Person(Entity(entity_res)).get_dict())
+
+    def test_get_dict(self):
+        person = Person(key=Key('Person', 1, project_id='test'), name='Iris')
+        self.assertEqual(person.get_dict()['properties'], {
+            'name': {'stringValue': 'Iris'},
+            'age': {'integerValue': '0'},
+        })
+
+    def test_set_uses_descriptor(self):
+        person = Person(key=Key('Person', 1, project_id='test'), name='Iris')
+        person.age = True
+        self.assertIs(type(person.age), int)
+        with self.assertRaises(TypeError):
+            person.name = 42
+
+    def test_unindexed(self):
+        self.assertEqual(Person._unindexed, frozenset())
+        self.assertEqual(Note._unindexed, {'body'})
+        note = Note(key=Key('Note', 1, project_id='test'), title='a', body='b')
+        self.assertEqual(note.get_dict()['properties'], {
+            'title': {'stringValue': 'a'},
+            'body': {'stringValue': 'b', 'excludeFromIndexes': True},
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
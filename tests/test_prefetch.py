@@ -0,0 +1,134 @@
+"""test_prefetch.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.orm import GcdModel, prefetch_related
+from aiogcd.orm.prefetch import _models
+from aiogcd.orm.properties import ArrayValue, KeyValue, StringValue
+from .stub import StubDatastore
+
+
+class Author(GcdModel):
+    name = StringValue()
+
+
+class Book(GcdModel):
+    title = StringValue()
+    author = KeyValue(required=False)
+    editors = ArrayValue(accept=(Key,), default=[], required=False)
+
+
+def _key(kind, idx):
+    return Key(kind, idx, project_id='test')
+
+
+def _book(idx, author, editors=()):
+    return Book(
+        key=_key('Book', idx),
+        title=str(idx),
+        author=_key('Author', author),
+        editors=[_key('Author', editor) for editor in editors])
+
+
+class TestPrefetch(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.stub = StubDatastore(page_size=3)
+        await self.stub.start()
+        self.gcd = self.stub.connector()
+        self.stub.put(*(
+            Entity({
+                'key': _key('Author', idx).get_dict(),
+                'properties': {'name': {'stringValue': str(idx)}},
+            })
+            for idx in range(1, 6)))
+
+    async def asyncTearDown(self):
+        await self.stub.stop()
+
+    async def test_prefetch_related(self):
+        books = [
+            _book(1, 1, editors=(2, 3)),
+            _book(2, 1, editors=(99, 1)),
+            _book(3, 4),
+        ]
+        await prefetch_related(self.gcd, books, Book.author, 'editors')
+
+        # the unique keys (1, 2, 3, 4 and 99) are fetched in one request,
+        # the key above the page size is deferred
+        self.assertEqual(self.stub.count('lookup'), 2)
+        _, data = self.stub.requests[0]
+        self.assertEqual(len(data['keys']), 5)
+
+        first, second, third = books
+        author = first.get_related(Book.author)
+        self.assertIsInstance(author, Author)
+        self.assertEqual(author.name, '1')
+        self.assertIs(second.get_related(Book.author), author)
+        self.assertEqual(third.get_related(Book.author).name, '4')
+        self.assertEqual(
+            [a.name for a in first.get_related(Book.editors)], ['2', '3'])
+        missing, editor = second.get_related(Book.editors)
+        self.assertIsNone(missing)
+        self.assertIs(editor, author)
+        self.assertEqual(third.get_related(Book.editors), [])
+
+    async def test_filter_prefetch(self):
+        self.stub.put(_book(1, 2), _book(2, 99))
+        books = await Book.filter().prefetch(Book.author) \
+            .get_entities(self.gcd)
+        self.assertEqual(self.stub.count('lookup'), 1)
+        self.assertEqual(books[0].get_related(Book.author).name, '2')
+        self.assertIsNone(books[1].get_related(Book.author))
+
+    async def test_model(self):
+        class Writer(GcdModel):
+            __kind__ = 'Author'
+            name = StringValue()
+
+        self.addCleanup(_models.__setitem__, 'Author', Author)
+        self.assertIs(_models['Author'], Writer)
+
+        book = _book(1, 1)
+        await prefetch_related(self.gcd, [book], Book.author, model=Author)
+        self.assertIsInstance(book.get_related(Book.author), Author)
+
+    def test_not_registered(self):
+        self.assertNotIn('GcdModel', _models)
+
+    async def test_clear_related(self):
+        book = _book(1, 1, editors=(2,))
+        await prefetch_related(self.gcd, [book], Book.author, Book.editors)
+
+        book.author = _key('Author', 2)
+        with self.assertRaises(ValueError):
+            book.get_related(Book.author)
+
+        self.assertEqual(len(book.get_related(Book.editors)), 1)
+        book.editors.append(_key('Author', 3))
+        with self.assertRaises(ValueError):
+            book.get_related(Book.editors)
+
+    async def test_clear_related_read(self):
+        self.stub.put(_book(1, 1, editors=(2,)))
+        book, = await Book.filter().prefetch(Book.editors) \
+            .get_entities(self.gcd)
+        self.assertEqual(len(book.get_related(Book.editors)), 1)
+        book.editors.pop()
+        with self.assertRaises(ValueError):
+            book.get_related(Book.editors)
+        self.assertTrue(book.has_changes())
+
+    async def test_error(self):
+        book = _book(1, 1)
+        self.stub.fail = True
+        with self.assertRaises(ValueError):
+            await prefetch_related(self.gcd, [book], Book.author)
+
+
+if __name__ == '__main__':
+    unittest.main()
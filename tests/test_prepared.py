@@ -0,0 +1,87 @@
+"""test_prepared.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector.key import Key
+from aiogcd.orm import GcdModel
+from aiogcd.orm import Param
+from aiogcd.orm.properties import IntegerValue, StringValue
+
+
+class User(GcdModel):
+    __namespace__ = 'test'
+    name = StringValue()
+    age = IntegerValue()
+
+
+class TestPrepared(unittest.TestCase):
+
+    def test_bind(self):
+        query = User.prepare(User.name == Param('name'))
+        self.assertEqual(query.params, {'name'})
+        self.assertEqual(
+            query.bind(name='Alice'),
+            User.filter(User.name == 'Alice'))
+
+    def test_bind_composite(self):
+        query = User.prepare(
+            User.name == Param('name'),
+            User.age > Param('age')).order_by(User.age.ascending)
+        self.assertEqual(
+            query.bind(name='Alice', age=3),
+            User.filter(
+                User.name == 'Alice',
+                User.age > 3).order_by(User.age.ascending))
+
+    def test_bind_constant(self):
+        key = Key('User', 1, project_id='test')
+        query = User.prepare(User.age > 3, User.name == Param('name'),
+                             has_ancestor=key)
+        self.assertEqual(
+            query.bind(name='Alice'),
+            User.filter(User.age > 3, User.name == 'Alice',
+                        has_ancestor=key))
+
+    def test_no_params(self):
+        query = User.prepare(User.age > 3)
+        self.assertEqual(query.params, frozenset())
+        self.assertEqual(query.bind(), User.filter(User.age > 3))
+
+    def test_missing_param(self):
+        query = User.prepare(
+            User.name == Param('name'),
+            User.age > Param('age'))
+        with self.assertRaises(TypeError):
+            query.bind(name='Alice')
+
+    def test_extra_param(self):
+        query = User.prepare(User.name == Param('name'))
+        with self.assertRaises(TypeError):
+            query.bind(name='Alice', age=3)
+
+    def test_check_type(self):
+        query = User.prepare(User.age > Param('age'))
+        with self.assertRaises(TypeError):
+            query.bind(age='3')
+
+    def test_reuse(self):
+        query = User.prepare(User.name == Param('name')).limit(10)
+        alice = query.bind(name='Alice')
+        alice.limit(5, start_cursor='abc')
+        alice['partitionId']['namespaceId'] = 'other'
+
+        bob = query.bind(name='Bob')
+        self.assertEqual(bob, User.filter(User.name == 'Bob').limit(10))
+        self.assertEqual(
+            alice['query']['filter'],
+            User.filter(User.name == 'Alice')['query']['filter'])
+
+    def test_unbound_param(self):
+        with self.assertRaises(TypeError):
+            User.filter(User.name == Param('name'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""test_profiling.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector import profiling
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.connector.profiling import Profile, get_profile, profile, timed
+from aiogcd.fakeserver import FakeDatastore
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import StringValue
+
+
+class Person(GcdModel):
+    name = StringValue()
+
+
+class TestProfile(unittest.TestCase):
+
+    def test_init(self):
+        p = Profile()
+        self.assertEqual(p.total, 0.0)
+        self.assertEqual(set(p.get_dict()), set(profiling._PHASES) | {
+            'requests', 'response_bytes'})
+
+    def test_timed(self):
+        self.assertEqual(timed(profiling.PARSE, int, '1'), 1)
+        with profile() as p:
+            self.assertIs(get_profile(), p)
+            self.assertEqual(timed(profiling.PARSE, int, '2'), 2)
+        self.assertIsNone(get_profile())
+        self.assertGreater(p.parse, 0.0)
+        self.assertEqual(p.total, p.parse)
+
+
+class TestProfileRequests(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fake = FakeDatastore()
+        await self.fake.start()
+        self.gcd = self.fake.connector('test')
+        self.fake.put(Entity({
+            'key': Key('Person', 1, project_id='test').get_dict(),
+            'properties': {'name': {'stringValue': 'Alice'}},
+        }))
+
+    async def asyncTearDown(self):
+        await self.fake.stop()
+
+    async def test_query(self):
+        with profile() as p:
+            people = await Person.filter().get_entities(self.gcd)
+        self.assertEqual(len(people), 1)
+        self.assertEqual(p.requests, 1)
+        self.assertGreater(p.response_bytes, 0)
+        self.assertGreater(p.network, 0.0)
+        self.assertGreater(p.models, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
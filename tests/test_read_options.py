@@ -0,0 +1,85 @@
+"""test_read_options.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import unittest
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.connector.utils import make_read_options
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import StringValue
+from .stub import StubDatastore
+
+
+class Person(GcdModel):
+    name = StringValue()
+
+
+class TestMakeReadOptions(unittest.TestCase):
+
+    def test_consistency(self):
+        self.assertEqual(
+            make_read_options(eventual=True),
+            {'readConsistency': 'EVENTUAL'})
+        self.assertEqual(
+            make_read_options(eventual=False, transaction='tx'),
+            {'readConsistency': 'STRONG', 'transaction': 'tx'})
+
+    def test_read_time(self):
+        self.assertEqual(
+            make_read_options(read_time='2026-10-19T12:00:00Z'),
+            {'readTime': '2026-10-19T12:00:00Z'})
+
+    def test_invalid_read_time(self):
+        with self.assertRaises(ValueError):
+            make_read_options(read_time='yesterday')
+
+    def test_read_time_transaction(self):
+        with self.assertRaises(ValueError):
+            make_read_options(
+                transaction='tx', read_time='2026-10-19T12:00:00Z')
+
+
+class TestQueryReadOptions(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.stub = StubDatastore()
+        await self.stub.start()
+        self.gcd = self.stub.connector()
+        self.stub.put(Entity({
+            'key': Key('Person', 1, project_id='test').get_dict(),
+            'properties': {'name': {'stringValue': 'Alice'}},
+        }))
+
+    async def asyncTearDown(self):
+        await self.stub.stop()
+
+    def _read_options(self):
+        return [
+            data.get('readOptions')
+            for method, data in self.stub.requests
+            if method == 'runQuery']
+
+    async def test_filter_reuse(self):
+        f = Person.filter()
+        await f.get_entities(self.gcd, eventual=True)
+        await f.get_entities(self.gcd)
+        self.assertNotIn('readOptions', f)
+        self.assertEqual(self._read_options(), [
+            {'readConsistency': 'EVENTUAL'}, None])
+
+    async def test_read_time(self):
+        f = Person.filter()
+        await f.get_entities(self.gcd, read_time='2026-10-19T12:00:00Z')
+        self.assertEqual(self._read_options(), [
+            {'readTime': '2026-10-19T12:00:00Z'}])
+
+    async def test_invalid_read_time(self):
+        with self.assertRaises(ValueError):
+            await Person.filter().get_entities(
+                self.gcd, read_time='yesterday')
+
+
+if __name__ == '__main__':
+    unittest.main()
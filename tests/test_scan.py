@@ -0,0 +1,132 @@
+"""test_scan.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import os
+import tempfile
+import unittest
+from aiogcd.connector import FileCheckpointStore, ScanRunner
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from .stub import StubDatastore
+
+READ_TIME = '2026-10-19T12:00:00Z'
+
+
+class Stop(Exception):
+    pass
+
+
+class TestScan(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.stub = StubDatastore()
+        await self.stub.start()
+        self.gcd = self.stub.connector()
+        self.stub.put(*(
+            Entity({
+                'key': Key('Item', idx, project_id='test').get_dict(),
+                'properties': {'n': {'integerValue': str(idx)}},
+            })
+            for idx in range(1, 11)))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = FileCheckpointStore(
+            os.path.join(self.tmp.name, 'scan.json'))
+
+    async def asyncTearDown(self):
+        await self.stub.stop()
+        self.tmp.cleanup()
+
+    def _read_options(self):
+        return [
+            data.get('readOptions')
+            for method, data in self.stub.requests
+            if method == 'runQuery']
+
+    def _runner(self, callback, **kwargs):
+        return ScanRunner(
+            self.gcd,
+            {'query': {'kind': [{'name': 'Item'}]}},
+            callback,
+            self.store,
+            'items',
+            batch_size=4,
+            **kwargs)
+
+    async def test_resume(self):
+        seen = []
+
+        def fail_second(entities):
+            if len(seen) >= 4:
+                raise Stop
+            seen.extend(entities)
+
+        with self.assertRaises(Stop):
+            await self._runner(fail_second, read_time=READ_TIME).run()
+
+        state = await self.store.load('items')
+        assert state is not None
+        self.assertEqual(state['entities'], 4)
+        self.assertEqual(state['read_time'], READ_TIME)
+
+        # the resumed scan is started without a read time
+        total = await self._runner(seen.extend).run()
+        self.assertEqual(total, 10)
+        self.assertEqual(len(seen), 10)
+        self.assertEqual(len({e.key.id for e in seen}), 10)
+        self.assertTrue(all(
+            options == {'readTime': READ_TIME}
+            for options in self._read_options()))
+        self.assertIsNone(await self.store.load('items'))
+
+    async def test_resume_read_time(self):
+        await self.store.save('items', {
+            'cursor': '4',
+            'pages': 1,
+            'entities': 4,
+            'read_time': None,
+        })
+        seen = []
+        total = await self._runner(seen.extend, read_time=READ_TIME).run()
+        self.assertEqual(total, 10)
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(
+            self._read_options(),
+            [{'readTime': READ_TIME}] * 2)
+
+    async def test_resume_other_read_time(self):
+        await self.store.save('items', {
+            'cursor': '4',
+            'pages': 1,
+            'entities': 4,
+            'read_time': READ_TIME,
+        })
+        seen = []
+        with self.assertRaises(ValueError):
+            await self._runner(
+                seen.extend, read_time='2026-10-19T13:00:00Z').run()
+        self.assertEqual(self.stub.requests, [])
+
+        # an equal read time in another format is accepted
+        total = await self._runner(
+            seen.extend, read_time='2026-10-19T12:00:00.000Z').run()
+        self.assertEqual(total, 10)
+        self.assertEqual(len(seen), 6)
+
+    async def test_store(self):
+        self.assertIsNone(await self.store.load('other'))
+        await self.store.save('other', {'cursor': 'abc'})
+        await self.store.save('items', {'cursor': 'def'})
+        self.assertEqual(await self.store.load('other'), {'cursor': 'abc'})
+        await self.store.clear('other')
+        self.assertIsNone(await self.store.load('other'))
+        self.assertEqual(await self.store.load('items'), {'cursor': 'def'})
+
+    def test_invalid_path(self):
+        with self.assertRaises(ValueError):
+            FileCheckpointStore('scan.txt')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""test_serialize.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import io
+import json
+import unittest
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.connector.serialize import JsonArrayEncoder
+from aiogcd.connector.serialize import dump_json, iter_json, write_json
+
+
+def _entity(idx, name):
+    return Entity({
+        'key': Key('User', idx, project_id='test').get_dict(),
+        'properties': {'name': {'stringValue': name}},
+    })
+
+
+class _Writer:
+
+    def __init__(self):
+        self.chunks = []
+
+    async def write(self, chunk):
+        self.chunks.append(chunk)
+
+
+class TestSerialize(unittest.TestCase):
+
+    def setUp(self):
+        self.entities = [_entity(idx, 'é' * 100) for idx in range(1, 51)]
+
+    def test_dump_json(self):
+        fp = io.BytesIO()
+        dump_json(self.entities, fp, key_as='key')
+        data = json.loads(fp.getvalue())
+        self.assertEqual(len(data), 50)
+        self.assertEqual(data[0]['name'], 'é' * 100)
+        self.assertEqual(data[0]['key'], self.entities[0].key.ks)
+
+    def test_empty(self):
+        self.assertEqual(b''.join(iter_json([])), b'[]')
+
+    def test_chunk_size(self):
+        chunks = list(iter_json(self.entities, chunk_size=1000))
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks[:-1]:
+            self.assertGreaterEqual(len(chunk), 1000)
+        self.assertEqual(len(json.loads(b''.join(chunks))), 50)
+
+    def test_size_in_bytes(self):
+        encoder = JsonArrayEncoder(chunk_size=10 ** 9)
+        for entity in self.entities:
+            encoder.add(entity)
+        pending = encoder._size
+        self.assertEqual(pending + 1, len(encoder.finish()))
+
+
+class TestWriteJson(unittest.IsolatedAsyncioTestCase):
+
+    async def test_write_json(self):
+        writer = _Writer()
+
+        async def entities():
+            for idx in range(1, 4):
+                yield _entity(idx, 'name')
+
+        await write_json(writer, entities(), chunk_size=10)
+        self.assertEqual(len(writer.chunks), 4)
+        self.assertEqual(len(json.loads(b''.join(writer.chunks))), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
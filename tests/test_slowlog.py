@@ -0,0 +1,138 @@
+"""test_slowlog.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import logging
+import unittest
+from aiogcd.connector.hooks import OperationEvent
+from aiogcd.connector.slowlog import SlowQueryLog, query_shape
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import IntegerValue, StringValue
+
+
+class User(GcdModel):
+    name = StringValue()
+    age = IntegerValue()
+
+
+def _event(data, latency=0.0, requests=1, entities=0, method='runQuery'):
+    event = OperationEvent(method, 'User', data)
+    event.latency = latency
+    event.requests = requests
+    event.entity_count = entities
+    return event
+
+
+class TestQueryShape(unittest.TestCase):
+
+    def test_values_removed(self):
+        query = User.filter(User.name == 'Alice', User.age > 3) \
+            .order_by(User.age.descending)
+        query.set_offset_limit(10, 20)
+        query['query']['startCursor'] = 'abc'
+        shape = query_shape(query)
+        self.assertEqual(
+            shape,
+            'User filter=(name EQUAL AND age GREATER_THAN) order=age DESC')
+        for value in ('Alice', '3', '10', '20', 'abc'):
+            self.assertNotIn(value, shape)
+
+    def test_equal_shapes(self):
+        self.assertEqual(
+            query_shape(User.filter(User.name == 'Alice')),
+            query_shape(User.filter(User.name == 'Bob').limit(5)))
+        self.assertNotEqual(
+            query_shape(User.filter(User.name == 'Alice')),
+            query_shape(User.filter(User.age == 3)))
+
+    def test_no_filter(self):
+        self.assertEqual(query_shape(User.filter()), 'User')
+        self.assertEqual(query_shape({'gqlQuery': {}}), 'gqlQuery')
+        self.assertEqual(query_shape(None), '?')
+
+
+class TestSlowQueryLog(unittest.TestCase):
+
+    def test_threshold(self):
+        slow_log = SlowQueryLog(latency=0.5, requests=10, entities=100)
+        query = User.filter()
+        slow_log.on_operation(_event(query, latency=0.49, requests=9,
+                                     entities=99))
+        self.assertEqual(len(slow_log.entries), 0)
+
+        slow_log.on_operation(_event(query, latency=0.5))
+        slow_log.on_operation(_event(query, requests=10))
+        slow_log.on_operation(_event(query, entities=100))
+        self.assertEqual(
+            [entry.reasons for entry in slow_log.entries],
+            [['latency'], ['requests'], ['entities']])
+
+    def test_threshold_none(self):
+        slow_log = SlowQueryLog(latency=None)
+        slow_log.on_operation(_event(User.filter(), latency=100.0))
+        self.assertEqual(len(slow_log.entries), 0)
+
+    def test_token(self):
+        slow_log = SlowQueryLog(latency=0.0)
+        slow_log.on_operation(_event(None, method='token'))
+        self.assertEqual(len(slow_log.entries), 0)
+
+    def test_maxlen(self):
+        slow_log = SlowQueryLog(latency=0.0, maxlen=2)
+        for idx in range(3):
+            slow_log.on_operation(_event(User.filter(), latency=idx))
+        self.assertEqual(
+            [entry.latency for entry in slow_log.entries], [1, 2])
+
+    def test_summary(self):
+        slow_log = SlowQueryLog(latency=1.0)
+        slow_log.on_operation(_event(
+            User.filter(User.name == 'Alice'), latency=1.0, entities=1))
+        slow_log.on_operation(_event(
+            User.filter(User.name == 'Bob'), latency=3.0, entities=2,
+            requests=2))
+        slow_log.on_operation(_event(
+            User.filter(User.age == 3), latency=2.0))
+        slow_log.on_operation(_event(None, latency=1.5, method='lookup'))
+
+        self.assertEqual(slow_log.summary(), [
+            ('runQuery User filter=name EQUAL', {
+                'count': 2,
+                'latency': 4.0,
+                'max_latency': 3.0,
+                'requests': 3,
+                'entities': 3,
+            }),
+            ('runQuery User filter=age EQUAL', {
+                'count': 1,
+                'latency': 2.0,
+                'max_latency': 2.0,
+                'requests': 1,
+                'entities': 0,
+            }),
+            ('lookup User', {
+                'count': 1,
+                'latency': 1.5,
+                'max_latency': 1.5,
+                'requests': 1,
+                'entities': 0,
+            }),
+        ])
+
+        slow_log.clear()
+        self.assertEqual(slow_log.summary(), [])
+
+    def test_logger(self):
+        logger = logging.getLogger('aiogcd.test.slowlog')
+        slow_log = SlowQueryLog(latency=1.0, logger=logger)
+        with self.assertLogs(logger, logging.WARNING) as logs:
+            slow_log.on_operation(_event(
+                User.filter(User.name == 'Alice'), latency=2.0))
+        output, = logs.output
+        self.assertIn('runQuery User filter=name EQUAL (latency)', output)
+        self.assertNotIn('Alice', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""test_timestampvalue.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import datetime
+import unittest
+from aiogcd.connector.key import Key
+from aiogcd.connector.timestampvalue import TimestampValue
+from aiogcd.connector.timestampvalue import format_timestamp
+from aiogcd.connector.timestampvalue import parse_timestamp
+from aiogcd.connector.utils import value_from_dict
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import DatetimeValue
+
+_UTC = datetime.timezone.utc
+
+
+class Event(GcdModel):
+    start = DatetimeValue()
+
+
+class TestTimestampValue(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(
+            parse_timestamp('2017-05-19T12:34:56.123456789Z'),
+            datetime.datetime(2017, 5, 19, 12, 34, 56, 123456, _UTC))
+        self.assertEqual(
+            parse_timestamp('2017-05-19T14:34:56+02:00'),
+            datetime.datetime(2017, 5, 19, 12, 34, 56, tzinfo=_UTC))
+
+    def test_format(self):
+        self.assertEqual(
+            format_timestamp(datetime.datetime(2017, 5, 19, 12, 34, 56)),
+            '2017-05-19T12:34:56Z')
+
+    def test_str_and_datetime(self):
+        value = TimestampValue('2017-05-19T12:34:56Z')
+        self.assertEqual(str(value), '2017-05-19T12:34:56Z')
+        self.assertEqual(
+            value, datetime.datetime(2017, 5, 19, 12, 34, 56, tzinfo=_UTC))
+        self.assertEqual(
+            str(TimestampValue(value.datetime)), '2017-05-19T12:34:56Z')
+
+    def test_compare_and_hash(self):
+        first = TimestampValue('2017-05-19T12:34:56Z')
+        second = TimestampValue('2017-05-19T14:34:56+02:00')
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertLess(first, TimestampValue('2018-01-01T00:00:00Z'))
+
+    def test_invalid(self):
+        for value in ('', 'now', '2017-05-19', '2017-13-19T12:34:56Z'):
+            with self.assertRaises(ValueError):
+                TimestampValue(value)
+
+    def test_from_datastore(self):
+        value = value_from_dict({'timestampValue': '2017-05-19T12:34:56Z'})
+        self.assertIsInstance(value, TimestampValue)
+        self.assertEqual(value.datetime.year, 2017)
+
+    def test_model(self):
+        key = Key('Event', 1, project_id='test')
+        event = Event(key=key, start='2017-05-19T12:34:56Z')
+        self.assertEqual(event.start.datetime.day, 19)
+        event.start = datetime.datetime(2018, 1, 1)
+        self.assertEqual(
+            event.get_dict()['properties']['start'],
+            {'timestampValue': '2018-01-01T00:00:00Z'})
+        for value in ('now', '2017-13-19T12:34:56Z', 1495197296):
+            with self.assertRaises(TypeError):
+                event.start = value
+
+    def test_model_from_datastore(self):
+        key = Key('Event', 1, project_id='test')
+        event = Event._from_entity_res(Event(
+            key=key, start='2017-05-19T12:34:56.123456789Z').get_dict())
+        other = Event(key=key, start=event.start)
+        self.assertIs(other.start, event.start)
+        self.assertEqual(
+            other.get_dict()['properties']['start'],
+            {'timestampValue': '2017-05-19T12:34:56.123456789Z'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""test_transport.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import os
+import tempfile
+import unittest
+from aiogcd.connector import GcdEmulatorConnector
+from aiogcd.connector.entity import Entity
+from aiogcd.connector.key import Key
+from aiogcd.connector.transport import RecordingTransport
+from aiogcd.connector.transport import ReplayTransport
+from aiogcd.connector.transport import RestTransport
+from aiogcd.connector.transport import read_records
+from aiogcd.fakeserver import FakeDatastore
+from aiogcd.orm import GcdModel
+from aiogcd.orm.properties import StringValue
+
+
+class Person(GcdModel):
+    name = StringValue()
+
+
+def _key(idx):
+    return Key('Person', idx, project_id='test')
+
+
+class TestRecordReplay(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.fake = FakeDatastore()
+        await self.fake.start()
+        self.fake.put(*(
+            Entity({
+                'key': _key(idx).get_dict(),
+                'properties': {'name': {'stringValue': str(idx)}},
+            })
+            for idx in range(1, 6)))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'recording.jsonl.gz')
+
+    async def asyncTearDown(self):
+        await self.fake.stop()
+        self.tmp.cleanup()
+
+    async def _record(self):
+        assert self.fake.endpoint is not None
+        gcd = GcdEmulatorConnector('test', transport=RecordingTransport(
+            RestTransport(self.fake.endpoint), self.path))
+        people = await Person.filter().get_entities(gcd)
+        person = await gcd.get_entity_by_key(_key(1))
+        await gcd.close()
+        return people, person
+
+    async def test_record(self):
+        await self._record()
+        records = read_records(self.path)
+        self.assertEqual(
+            [record['method'] for record in records],
+            ['runQuery', 'lookup'])
+        self.assertTrue(all(record['status'] == 200 for record in records))
+        self.assertNotIn('headers', records[0])
+
+    async def test_replay_request(self):
+        people, person = await self._record()
+        await self.fake.stop()
+
+        transport = ReplayTransport(self.path)
+        gcd = GcdEmulatorConnector('test', transport=transport)
+        # requests are matched by data, so the order is not important
+        replayed_person = await gcd.get_entity_by_key(_key(1))
+        replayed = await Person.filter().get_entities(gcd)
+        self.assertEqual(transport.remaining, 0)
+        self.assertEqual(
+            [p.name for p in replayed], [p.name for p in people])
+        assert replayed_person is not None and person is not None
+        self.assertEqual(
+            replayed_person.get_dict(), person.get_dict())
+
+        with self.assertRaises(ValueError):
+            await gcd.get_entity_by_key(_key(2))
+
+    async def test_replay_order(self):
+        await self._record()
+        gcd = GcdEmulatorConnector('test', transport=ReplayTransport(
+            self.path, match='order'))
+        with self.assertRaises(ValueError):
+            await gcd.get_entity_by_key(_key(1))
+
+    def test_invalid_match(self):
+        with self.assertRaises(ValueError):
+            ReplayTransport(self.path, match='random')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""test_utils.py
+
+Created on: Oct 19, 2026
+    Author: Jeroen van der Heijden <jeroen@cesbit.com>
+"""
+import datetime
+import decimal
+import enum
+import unittest
+from aiogcd.connector import utils
+from aiogcd.connector.key import Key
+from aiogcd.connector.timestampvalue import TimestampValue
+from aiogcd.connector.utils import exclude_from_indexes
+from aiogcd.connector.utils import register_decoder, register_encoder
+from aiogcd.connector.utils import value_from_dict, value_to_dict
+
+
+class Color(enum.IntEnum):
+    RED = 1
+
+
+class TestValues(unittest.TestCase):
+
+    def setUp(self):
+        self._encoders = dict(utils._REGISTERED)
+        self._decoders = dict(utils._DECODERS)
+
+    def tearDown(self):
+        utils._REGISTERED.clear()
+        utils._REGISTERED.update(self._encoders)
+        utils._ENCODERS.clear()
+        utils._ENCODERS.update(self._encoders)
+        utils._DECODERS.clear()
+        utils._DECODERS.update(self._decoders)
+
+    def test_round_trip(self):
+        key = Key('Item', 1, project_id='test')
+        for value in (
+                None, True, 12, 1.5, 'text', key, b'\x00\xff',
+                [1, 'a', [None]], {'a': {'b': 2}}):
+            self.assertEqual(value_from_dict(value_to_dict(value)), value)
+
+    def test_encode(self):
+        self.assertEqual(value_to_dict(False), {'booleanValue': False})
+        self.assertEqual(value_to_dict(3), {'integerValue': '3'})
+        self.assertEqual(
+            value_to_dict(datetime.datetime(2026, 10, 19, 12)),
+            {'timestampValue': '2026-10-19T12:00:00Z'})
+        self.assertEqual(
+            value_to_dict(TimestampValue('2026-10-19T12:00:00Z')),
+            {'timestampValue': '2026-10-19T12:00:00Z'})
+
+        long_text = 'x' * (utils._MAX_STRING_LENGTH + 1)
+        val = value_to_dict(long_text)
+        self.assertIn('blobValue', val)
+        self.assertEqual(value_from_dict(val), long_text)
+
+    def test_sub_class(self):
+        self.assertEqual(value_to_dict(Color.RED), {'integerValue': '1'})
+        self.assertIn(Color, utils._ENCODERS)
+
+    def test_unsupported(self):
+        with self.assertRaises(TypeError):
+            value_to_dict(object())
+        with self.assertRaises(TypeError):
+            value_from_dict({'unknownValue': 1})
+
+    def test_register(self):
+        register_encoder(
+            decimal.Decimal, lambda val: {'stringValue': str(val)})
+        self.assertEqual(
+            value_to_dict(decimal.Decimal('1.5')), {'stringValue': '1.5'})
+        # cached sub-classes still resolve to their registered base
+        self.assertEqual(value_to_dict(Color.RED), {'integerValue': '1'})
+
+        register_decoder('keyValue', lambda val: val['path'][-1]['id'])
+        self.assertEqual(
+            value_from_dict(value_to_dict(Key('Item', 1, project_id='t'))),
+            '1')
+        with self.assertRaises(ValueError):
+            register_decoder('stringValue', str.upper)
+
+    def test_exclude_from_indexes(self):
+        self.assertEqual(
+            exclude_from_indexes({'stringValue': 'a'}),
+            {'stringValue': 'a', 'excludeFromIndexes': True})
+        val = exclude_from_indexes(value_to_dict(['a', 'b']))
+        self.assertNotIn('excludeFromIndexes', val)
+        self.assertTrue(all(
+            v['excludeFromIndexes'] for v in val['arrayValue']['values']))
+
+
+if __name__ == '__main__':
+    unittest.main()